@@ -2,4 +2,4 @@
 Módulo que contiene las funciones de cálculo para integrales triples y teoremas vectoriales.
 """
 
-__all__ = ['integrales', 'teoremas', 'visualizacion']
+__all__ = ['integrales', 'teoremas', 'visualizacion', 'procedimientos', 'trabajos', 'cubatura', 'montecarlo', 'cache', 'normalizacion', 'primitivas', 'separable', 'polinomios', 'simetria', 'portafolio', 'limites', 'simplificacion', 'instrumentacion', 'motor', 'grafo', 'barrido', 'nucleos', 'nativo', 'precision', 'verificacion', 'particion', 'coordenadas']
@@ -0,0 +1,125 @@
+"""
+Módulo de barridos paramétricos de los teoremas.
+
+Calcular teorema_divergencia o teorema_green para cientos de radios, alturas
+o semiejes repite la misma integral simbólica cientos de veces. El barrido
+la calcula una sola vez con los parámetros como símbolos, compila la forma
+cerrada con lambdify y evalúa toda la rejilla de parámetros en una sola
+llamada de NumPy.
+
+Si la forma cerrada tiene condiciones de rama (Piecewise), cada punto se
+evalúa sustituyendo sus valores en la forma cerrada y, si la condición no se
+resuelve, repitiendo el cálculo simbólico del teorema en ese punto.
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+import sympy as sp
+
+from calculadora_calculo.calculos.cubatura import ResultadoNumerico, compilar_integrando
+from calculadora_calculo.calculos.trabajos import reportar_etapa
+
+# Parámetros de región que son longitudes: se declaran positivos para que
+# sp.integrate no abra ramas por su signo
+PARAMETROS_POSITIVOS = ('radio', 'altura', 'lado', 'semi_eje_x', 'semi_eje_y', 'semi_eje_z')
+
+
+class ResultadoBarrido(NamedTuple):
+    """Resultados de un teorema sobre una rejilla de parámetros."""
+    parametros: Tuple[str, ...]
+    valores: Tuple[np.ndarray, ...]
+    resultados: np.ndarray
+    forma_cerrada: sp.Expr
+    puntos_simbolicos: int
+
+    def tabla(self) -> List[Dict[str, Any]]:
+        """Una fila por punto de la rejilla: valores de los parámetros y 'resultado'."""
+        filas = []
+        for indice in np.ndindex(self.resultados.shape):
+            fila = {nombre: valores[i] for nombre, valores, i in zip(self.parametros, self.valores, indice)}
+            fila['resultado'] = self.resultados[indice]
+            filas.append(fila)
+        return filas
+
+
+def simbolo_parametro(nombre: str) -> sp.Symbol:
+    """Símbolo de un parámetro de región (positivo si es una longitud)."""
+    if nombre in PARAMETROS_POSITIVOS:
+        return sp.Symbol(nombre, positive=True)
+    return sp.Symbol(nombre, real=True)
+
+
+def _a_numero(valor: Any) -> complex:
+    """Convierte el resultado de un punto en número (ValueError si no se puede)."""
+    if isinstance(valor, ResultadoNumerico):
+        return valor.valor
+    valor = sp.sympify(valor)
+    if not valor.is_number or valor.has(sp.Integral, sp.Piecewise, sp.nan, sp.zoo):
+        raise ValueError(f"El resultado no es numérico: {valor}")
+    return complex(sp.N(valor))
+
+
+def barrido_parametrico(
+    teorema: Callable,
+    *args: Any,
+    rejilla: Dict[str, Sequence[float]],
+    parametros: Dict[str, Any] = None,
+    **kwargs: Any
+) -> ResultadoBarrido:
+    """
+    Evalúa un teorema sobre una rejilla de parámetros de la región.
+
+    Args:
+        teorema: teorema_divergencia, teorema_green o teorema_stokes
+        *args: Argumentos posicionales del teorema (el campo o P y Q)
+        rejilla: Valores de cada parámetro barrido, p. ej. {'radio': [1, 2, 3]}
+        parametros: Parámetros fijos de la región
+        **kwargs: Resto de argumentos del teorema (region, sistema_coordenadas...)
+
+    Returns:
+        ResultadoBarrido con un arreglo de resultados de forma
+        (len(valores del primer parámetro), len(valores del segundo), ...)
+
+    Raises:
+        ValueError: Si la rejilla está vacía o el teorema no da forma cerrada
+    """
+    if not rejilla:
+        raise ValueError("Debe indicar al menos un parámetro a barrer")
+    nombres = tuple(rejilla)
+    valores = tuple(np.asarray(rejilla[nombre], dtype=float) for nombre in nombres)
+    simbolos = [simbolo_parametro(nombre) for nombre in nombres]
+    fijos = dict(parametros or {})
+
+    reportar_etapa("integración con parámetros simbólicos")
+    forma = teorema(*args, parametros={**fijos, **dict(zip(nombres, simbolos))}, **kwargs)
+    if isinstance(forma, ResultadoNumerico) or sp.sympify(forma).has(sp.Integral):
+        raise ValueError("El teorema no tiene forma cerrada en función de los parámetros")
+    forma = sp.sympify(forma)
+
+    rejillas = np.meshgrid(*valores, indexing='ij')
+    puntos_simbolicos = 0
+    if not forma.has(sp.Piecewise):
+        # Toda la rejilla en una sola llamada vectorizada
+        reportar_etapa("evaluación de la rejilla")
+        resultados = np.array(compilar_integrando(forma, simbolos)(*rejillas), dtype=complex)
+    else:
+        reportar_etapa("evaluación punto a punto (forma cerrada con ramas)")
+        resultados = np.empty(rejillas[0].shape, dtype=complex)
+        for indice in np.ndindex(resultados.shape):
+            punto = {nombre: sp.nsimplify(float(r[indice])) for nombre, r in zip(nombres, rejillas)}
+            try:
+                resultados[indice] = _a_numero(
+                    forma.subs({s: punto[nombre] for s, nombre in zip(simbolos, nombres)})
+                )
+            except (ValueError, TypeError):
+                # La condición de la rama no se resuelve: cálculo simbólico en el punto
+                puntos_simbolicos += 1
+                resultados[indice] = _a_numero(teorema(*args, parametros={**fijos, **punto}, **kwargs))
+
+    return ResultadoBarrido(
+        parametros=nombres,
+        valores=valores,
+        resultados=np.real_if_close(resultados),
+        forma_cerrada=forma,
+        puntos_simbolicos=puntos_simbolicos,
+    )
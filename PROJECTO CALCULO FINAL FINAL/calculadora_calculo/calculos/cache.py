@@ -0,0 +1,287 @@
+"""
+Módulo de caché persistente para resultados de integrales y teoremas.
+
+Los resultados se indexan por una clave derivada del contenido: la forma
+canónica de las expresiones (ver normalizacion.py), el sistema de
+coordenadas, los límites y los parámetros de la región. Hay dos niveles:
+uno en memoria con política LRU y otro en disco (SQLite) que sobrevive a los
+reinicios y se recorta por tamaño.
+"""
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+import sympy as sp
+
+from calculadora_calculo.calculos.normalizacion import (
+    forma_canonica, normalizar_cadena, normalizar_expresion, normalizar_numero
+)
+
+# Cambiar al modificar el formato de las claves o de los resultados
+VERSION_CACHE = 5
+# Directorio y archivo de la caché en disco
+DIRECTORIO_CACHE = os.path.join(os.path.expanduser('~'), '.calculadora_calculo')
+ARCHIVO_CACHE = 'resultados.sqlite3'
+# Entradas del nivel en memoria
+CAPACIDAD_MEMORIA = 256
+# Tamaño máximo del nivel en disco (bytes)
+MAX_BYTES_DISCO = 64 * 2**20
+
+
+def _canonica(obj: Any) -> str:
+    """Representación textual determinista de un argumento; TypeError si no se admite."""
+    if isinstance(obj, (sp.Basic, sp.MatrixBase)):
+        return f"S{forma_canonica(normalizar_expresion(obj))}"
+    if obj is None or isinstance(obj, bool):
+        return repr(obj)
+    if isinstance(obj, (np.integer, np.floating)):
+        obj = obj.item()
+    if isinstance(obj, (int, float)):
+        # Los números se comparan por valor exacto: 1, 1.0 y sp.Integer(1) coinciden
+        return f"S{forma_canonica(normalizar_numero(obj))}"
+    if isinstance(obj, (complex, str)):
+        return f"{type(obj).__name__}:{obj!r}"
+    if isinstance(obj, (list, tuple)):
+        return f"{type(obj).__name__}[{','.join(_canonica(v) for v in obj)}]"
+    if isinstance(obj, dict):
+        elementos = sorted(f"{_canonica(k)}={_canonica(v)}" for k, v in obj.items())
+        return f"dict{{{','.join(elementos)}}}"
+    raise TypeError(f"Argumento no admitido en la clave de caché: {type(obj).__name__}")
+
+
+def clave_canonica(nombre: str, *partes: Any) -> str:
+    """
+    Calcula la clave de caché de una llamada.
+
+    Args:
+        nombre: Identificador de la función
+        *partes: Argumentos de la llamada (expresiones, límites, parámetros...)
+
+    Returns:
+        Resumen SHA-256 en hexadecimal
+
+    Raises:
+        TypeError: Si algún argumento no tiene forma canónica
+    """
+    texto = f"{VERSION_CACHE}|{nombre}|{_canonica(partes)}"
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+class CacheResultados:
+    """
+    Caché de dos niveles: LRU en memoria y SQLite en disco.
+
+    Los errores de disco nunca interrumpen un cálculo: si la base de datos no
+    está disponible, la caché sigue funcionando solo en memoria.
+    """
+
+    def __init__(
+        self,
+        ruta: Optional[str] = None,
+        capacidad_memoria: int = CAPACIDAD_MEMORIA,
+        max_bytes_disco: int = MAX_BYTES_DISCO
+    ):
+        """
+        Args:
+            ruta: Archivo SQLite (None para usar solo memoria)
+            capacidad_memoria: Número de entradas del nivel en memoria
+            max_bytes_disco: Tamaño máximo del nivel en disco
+        """
+        self.ruta = ruta
+        self.capacidad_memoria = capacidad_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+        self._conexion = None
+        self._disco_disponible = ruta is not None
+
+    def obtener(self, clave: str) -> Tuple[bool, Any]:
+        """
+        Busca un resultado.
+
+        Returns:
+            Tupla (encontrado, valor)
+        """
+        with self._lock:
+            if clave in self._memoria:
+                self._memoria.move_to_end(clave)
+                return True, self._memoria[clave]
+
+            datos = self._leer_disco(clave)
+            if datos is None:
+                return False, None
+            try:
+                valor = pickle.loads(datos)
+            except Exception:
+                return False, None
+            self._guardar_memoria(clave, valor)
+            return True, valor
+
+    def guardar(self, clave: str, valor: Any) -> None:
+        """Guarda un resultado en ambos niveles."""
+        with self._lock:
+            self._guardar_memoria(clave, valor)
+            try:
+                datos = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                return
+            self._escribir_disco(clave, datos)
+
+    def limpiar(self) -> None:
+        """Elimina todos los resultados guardados."""
+        with self._lock:
+            self._memoria.clear()
+            conexion = self._obtener_conexion()
+            if conexion is not None:
+                try:
+                    with conexion:
+                        conexion.execute("DELETE FROM resultados")
+                except sqlite3.Error:
+                    pass
+
+    # Métodos internos (se llaman con el candado tomado)
+    def _guardar_memoria(self, clave: str, valor: Any) -> None:
+        self._memoria[clave] = valor
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.capacidad_memoria:
+            self._memoria.popitem(last=False)
+
+    def _obtener_conexion(self) -> Optional[sqlite3.Connection]:
+        """Abre la base de datos de forma perezosa (cada proceso abre la suya)."""
+        if not self._disco_disponible:
+            return None
+        if self._conexion is None:
+            try:
+                os.makedirs(os.path.dirname(self.ruta) or '.', exist_ok=True)
+                conexion = sqlite3.connect(self.ruta, timeout=5, check_same_thread=False)
+                conexion.execute("PRAGMA journal_mode=WAL")
+                conexion.execute(
+                    "CREATE TABLE IF NOT EXISTS resultados ("
+                    " clave TEXT PRIMARY KEY,"
+                    " valor BLOB NOT NULL,"
+                    " tamano INTEGER NOT NULL,"
+                    " ultimo_uso REAL NOT NULL)"
+                )
+                conexion.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_ultimo_uso ON resultados(ultimo_uso)"
+                )
+                conexion.commit()
+                self._conexion = conexion
+            except (OSError, sqlite3.Error):
+                self._disco_disponible = False
+                return None
+        return self._conexion
+
+    def _leer_disco(self, clave: str) -> Optional[bytes]:
+        conexion = self._obtener_conexion()
+        if conexion is None:
+            return None
+        try:
+            fila = conexion.execute(
+                "SELECT valor FROM resultados WHERE clave = ?", (clave,)
+            ).fetchone()
+            if fila is None:
+                return None
+            with conexion:
+                conexion.execute(
+                    "UPDATE resultados SET ultimo_uso = ? WHERE clave = ?", (time.time(), clave)
+                )
+            return fila[0]
+        except sqlite3.Error:
+            return None
+
+    def _escribir_disco(self, clave: str, datos: bytes) -> None:
+        conexion = self._obtener_conexion()
+        if conexion is None or len(datos) > self.max_bytes_disco:
+            return
+        try:
+            with conexion:
+                conexion.execute(
+                    "INSERT OR REPLACE INTO resultados (clave, valor, tamano, ultimo_uso)"
+                    " VALUES (?, ?, ?, ?)",
+                    (clave, sqlite3.Binary(datos), len(datos), time.time())
+                )
+            self._recortar_disco(conexion)
+        except sqlite3.Error:
+            pass
+
+    def _recortar_disco(self, conexion: sqlite3.Connection) -> None:
+        """Elimina los resultados usados hace más tiempo hasta bajar del tamaño máximo."""
+        total = conexion.execute("SELECT COALESCE(SUM(tamano), 0) FROM resultados").fetchone()[0]
+        if total <= self.max_bytes_disco:
+            return
+        # Dejar margen para no recortar en cada inserción
+        exceso = total - int(self.max_bytes_disco * 0.9)
+        eliminar = []
+        for clave, tamano in conexion.execute(
+            "SELECT clave, tamano FROM resultados ORDER BY ultimo_uso"
+        ):
+            if exceso <= 0:
+                break
+            eliminar.append((clave,))
+            exceso -= tamano
+        with conexion:
+            conexion.executemany("DELETE FROM resultados WHERE clave = ?", eliminar)
+
+
+_cache_global = None
+
+
+def obtener_cache() -> CacheResultados:
+    """Devuelve la caché compartida por el proceso actual."""
+    global _cache_global
+    if _cache_global is None:
+        _cache_global = CacheResultados(os.path.join(DIRECTORIO_CACHE, ARCHIVO_CACHE))
+    return _cache_global
+
+
+def cacheado(funcion: Optional[Callable] = None, *, expresiones: Tuple[str, ...] = ()) -> Callable:
+    """
+    Decorador que guarda en caché el resultado de una función de cálculo.
+
+    La clave se calcula a partir del nombre de la función y de todos sus
+    argumentos ya asociados a sus parámetros, por lo que da igual pasarlos por
+    posición o por nombre. Los parámetros listados en 'expresiones' que
+    lleguen como texto se analizan y normalizan antes de calcular la clave.
+    Si algún argumento no tiene forma canónica, la llamada se ejecuta sin
+    caché. Los errores no se guardan. La función original queda disponible
+    como atributo 'sin_cache'.
+
+    Se usa como @cacheado o @cacheado(expresiones=('func_str',)).
+    """
+    if funcion is None:
+        return lambda f: cacheado(f, expresiones=expresiones)
+
+    nombre = f"{funcion.__module__}.{funcion.__qualname__}"
+    firma = inspect.signature(funcion)
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        try:
+            ligados = firma.bind(*args, **kwargs)
+            ligados.apply_defaults()
+            argumentos = dict(ligados.arguments)
+            for parametro in expresiones:
+                if isinstance(argumentos.get(parametro), str):
+                    argumentos[parametro] = normalizar_cadena(argumentos[parametro])
+            clave = clave_canonica(nombre, argumentos)
+        except (TypeError, ValueError):
+            return funcion(*args, **kwargs)
+        cache = obtener_cache()
+        encontrado, valor = cache.obtener(clave)
+        if encontrado:
+            return valor
+        valor = funcion(*args, **kwargs)
+        cache.guardar(clave, valor)
+        return valor
+
+    envoltura.sin_cache = funcion
+    return envoltura
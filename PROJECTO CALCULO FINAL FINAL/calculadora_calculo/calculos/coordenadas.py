@@ -0,0 +1,360 @@
+"""
+Módulo de sistemas de coordenadas curvilíneas y sus operadores diferenciales.
+
+Un sistema se define solo por la transformación (x, y, z) = r(q1, q2, q3).
+De ella se deducen la matriz jacobiana J, el tensor métrico g = JᵀJ, su
+inversa, el jacobiano √g = det J y los factores de escala h_i = √g_ii, y con
+ellos los coeficientes de los operadores:
+
+- Gradiente:   (∇f)_i = h_i Σ_j g^ij ∂_j f
+- Divergencia: ∇·F = (1/√g) Σ_i ∂_i(√g F_i / h_i)
+- Rotacional:  (∇×F)_i = (h_i/√g) (∂_j F̃_k - ∂_k F̃_j), con F̃_k = Σ_l g_kl F_l / h_l
+  e (i, j, k) permutación cíclica
+- Laplaciano:  ∇²f = (1/√g) Σ_ij ∂_i(√g g^ij ∂_j f)
+
+Los campos se dan y se devuelven en componentes físicas (sobre los vectores
+unitarios e_i / h_i), como en las fórmulas clásicas de cilíndricas y
+esféricas, a las que se reducen en los sistemas ortogonales.
+
+Los coeficientes se deducen una sola vez por sistema y se guardan en él; las
+variantes con otros símbolos o con valores de los parámetros (los semiejes
+de las elipsoidales, el radio mayor de las toroidales) los obtienen
+sustituyendo en los del sistema registrado. Aplicar un operador cuesta una
+búsqueda en el registro más las derivadas.
+"""
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import sympy as sp
+
+# Variantes (otros símbolos o parámetros) que se conservan en memoria
+CAPACIDAD_VARIANTES = 128
+
+Campo = Tuple[sp.Expr, sp.Expr, sp.Expr]
+
+# Símbolos de los sistemas registrados (los mismos que teoremas.py)
+x, y, z = sp.symbols('x y z', real=True)
+r, theta = sp.symbols('r theta', real=True, nonnegative=True)
+rho, phi = sp.symbols('rho phi', real=True, nonnegative=True)
+# Parámetros: semiejes de las elipsoidales y radio mayor de las toroidales
+a, b, c = sp.symbols('a b c', positive=True)
+R = sp.symbols('R', positive=True)
+
+
+def _simplificar(expr: sp.Expr) -> sp.Expr:
+    return sp.trigsimp(sp.cancel(sp.sympify(expr)))
+
+
+def _raiz(expr: sp.Expr) -> sp.Expr:
+    """Factor de escala √g_ii, positivo en el interior del dominio habitual (ρ > 0, 0 < φ < π...)."""
+    return sp.sqrt(sp.factor(_simplificar(expr))).replace(sp.Abs, lambda arg: arg)
+
+
+def _sustituir(valor: Any, cambio: Dict[sp.Basic, Any]) -> Any:
+    """Aplica xreplace dentro de expresiones, matrices y tuplas anidadas."""
+    if isinstance(valor, (list, tuple)):
+        return tuple(_sustituir(v, cambio) for v in valor)
+    return valor.xreplace(cambio)
+
+
+def _sin_acentos(nombre: str) -> str:
+    descompuesto = unicodedata.normalize('NFKD', nombre.strip().lower())
+    return ''.join(ch for ch in descompuesto if not unicodedata.combining(ch))
+
+
+class SistemaCoordenadas:
+    """
+    Sistema de coordenadas definido por su transformación a cartesianas.
+
+    Las plantillas (métrica, factores de escala, coeficientes de cada
+    operador) se deducen la primera vez que se piden y se guardan.
+    """
+
+    def __init__(
+        self,
+        nombre: str,
+        variables: Sequence[sp.Symbol],
+        mapa: Sequence[Any],
+        parametros: Sequence[sp.Symbol] = ()
+    ):
+        """
+        Args:
+            nombre: Nombre del sistema
+            variables: Coordenadas (q1, q2, q3), en el orden de las componentes
+            mapa: Expresiones de x, y, z en función de las coordenadas
+            parametros: Símbolos del mapa que no son coordenadas (p. ej. semiejes)
+
+        Raises:
+            ValueError: Si no hay tres variables y tres expresiones
+        """
+        if len(variables) != 3 or len(mapa) != 3:
+            raise ValueError("Un sistema de coordenadas necesita tres variables y tres expresiones cartesianas")
+        self.nombre = nombre
+        self.variables = tuple(variables)
+        self.mapa = tuple(sp.sympify(e) for e in mapa)
+        self.parametros = tuple(parametros)
+        self._plantillas = {}
+        # Sistema del que se obtienen las plantillas por sustitución (variantes)
+        self._base = None
+        self._cambio = {}
+
+    def __repr__(self) -> str:
+        return f"SistemaCoordenadas({self.nombre!r}, {self.variables})"
+
+    def _variante(self, cambio: Dict[sp.Symbol, Any]) -> 'SistemaCoordenadas':
+        """
+        Mismo sistema con otros símbolos o con valores de los parámetros.
+
+        Sus plantillas se obtienen sustituyendo en las de este sistema, que
+        solo se deducen una vez.
+
+        Args:
+            cambio: Símbolo de este sistema -> nuevo símbolo o valor
+        """
+        cambio = {k: sp.sympify(v) for k, v in cambio.items()}
+        variables = tuple(v.xreplace(cambio) for v in self.variables)
+        if not all(isinstance(v, sp.Symbol) for v in variables):
+            raise ValueError("Las coordenadas solo se pueden sustituir por símbolos")
+        otro = SistemaCoordenadas(
+            self.nombre, variables, _sustituir(self.mapa, cambio),
+            [p for p in self.parametros if p not in cambio]
+        )
+        otro._base, otro._cambio = self, cambio
+        return otro
+
+    def _plantilla(self, clave: str, deducir: Callable[[], Any]) -> Any:
+        """Plantilla memorizada: deducida aquí o sustituida en la del sistema base."""
+        if clave not in self._plantillas:
+            if self._base is not None:
+                self._plantillas[clave] = _sustituir(getattr(self._base, clave), self._cambio)
+            else:
+                self._plantillas[clave] = deducir()
+        return self._plantillas[clave]
+
+    @property
+    def matriz_jacobiana(self) -> sp.Matrix:
+        """∂(x, y, z)/∂(q1, q2, q3)."""
+        return self._plantilla('matriz_jacobiana', lambda: sp.Matrix(self.mapa).jacobian(self.variables))
+
+    @property
+    def metrica(self) -> sp.Matrix:
+        """Tensor métrico g_ij = ∂r/∂q_i · ∂r/∂q_j."""
+        def deducir():
+            jacobiana = self.matriz_jacobiana
+            return (jacobiana.T * jacobiana).applyfunc(_simplificar)
+        return self._plantilla('metrica', deducir)
+
+    @property
+    def metrica_inversa(self) -> sp.Matrix:
+        """g^ij = (J⁻¹ J⁻ᵀ)_ij, con J⁻¹ = adj(J) / det J (invertir g y simplificar es mucho más lento)."""
+        def deducir():
+            inversa = self.matriz_jacobiana.adjugate() / self.jacobiano
+            return (inversa * inversa.T).applyfunc(_simplificar)
+        return self._plantilla('metrica_inversa', deducir)
+
+    @property
+    def jacobiano(self) -> sp.Expr:
+        """√g = det J, el factor del elemento de volumen dV = √g dq1 dq2 dq3."""
+        return self._plantilla('jacobiano', lambda: _simplificar(self.matriz_jacobiana.det()))
+
+    @property
+    def factores_escala(self) -> Tuple[sp.Expr, ...]:
+        """h_i = |∂r/∂q_i|."""
+        return self._plantilla('factores_escala', lambda: tuple(_raiz(self.metrica[i, i]) for i in range(3)))
+
+    @property
+    def ortogonal(self) -> bool:
+        return all(self.metrica[i, j] == 0 for i in range(3) for j in range(3) if i != j)
+
+    @property
+    def _coeficientes_gradiente(self) -> Tuple[Tuple[sp.Expr, ...], ...]:
+        def deducir():
+            g_inv, h = self.metrica_inversa, self.factores_escala
+            return tuple(tuple(_simplificar(h[i] * g_inv[i, j]) for j in range(3)) for i in range(3))
+        return self._plantilla('_coeficientes_gradiente', deducir)
+
+    @property
+    def _coeficientes_divergencia(self) -> Tuple[Tuple[sp.Expr, ...], sp.Expr]:
+        def deducir():
+            h = self.factores_escala
+            return tuple(_simplificar(self.jacobiano / h[i]) for i in range(3)), _simplificar(1 / self.jacobiano)
+        return self._plantilla('_coeficientes_divergencia', deducir)
+
+    @property
+    def _coeficientes_rotacional(self) -> Tuple[Tuple[Tuple[sp.Expr, ...], ...], Tuple[sp.Expr, ...]]:
+        def deducir():
+            g, h = self.metrica, self.factores_escala
+            covariantes = tuple(tuple(_simplificar(g[k, l] / h[l]) for l in range(3)) for k in range(3))
+            return covariantes, tuple(_simplificar(h[i] / self.jacobiano) for i in range(3))
+        return self._plantilla('_coeficientes_rotacional', deducir)
+
+    @property
+    def _coeficientes_laplaciano(self) -> Tuple[Tuple[Tuple[sp.Expr, ...], ...], sp.Expr]:
+        def deducir():
+            g_inv = self.metrica_inversa
+            flujos = tuple(tuple(_simplificar(self.jacobiano * g_inv[i, j]) for j in range(3)) for i in range(3))
+            return flujos, _simplificar(1 / self.jacobiano)
+        return self._plantilla('_coeficientes_laplaciano', deducir)
+
+    def gradiente(self, f: sp.Expr) -> Campo:
+        """Gradiente de un campo escalar, en componentes físicas."""
+        derivadas = [sp.diff(f, q) for q in self.variables]
+        return tuple(
+            sp.Add(*(coef * d for coef, d in zip(fila, derivadas) if coef != 0))
+            for fila in self._coeficientes_gradiente
+        )
+
+    def divergencia(self, F: Sequence[sp.Expr]) -> sp.Expr:
+        """Divergencia de un campo dado en componentes físicas."""
+        coeficientes, inverso = self._coeficientes_divergencia
+        return inverso * sp.Add(*(
+            sp.diff(coef * Fi, q) for coef, Fi, q in zip(coeficientes, F, self.variables)
+        ))
+
+    def rotacional(self, F: Sequence[sp.Expr]) -> Campo:
+        """Rotacional de un campo dado en componentes físicas."""
+        covariantes, factores = self._coeficientes_rotacional
+        Fc = [sp.Add(*(coef * Fl for coef, Fl in zip(fila, F) if coef != 0)) for fila in covariantes]
+        q = self.variables
+        return tuple(
+            factores[i] * (sp.diff(Fc[k], q[j]) - sp.diff(Fc[j], q[k]))
+            for i, j, k in ((0, 1, 2), (1, 2, 0), (2, 0, 1))
+        )
+
+    def laplaciano(self, f: sp.Expr) -> sp.Expr:
+        """Laplaciano de un campo escalar."""
+        flujos, inverso = self._coeficientes_laplaciano
+        derivadas = [sp.diff(f, q) for q in self.variables]
+        return inverso * sp.Add(*(
+            sp.diff(sp.Add(*(coef * d for coef, d in zip(fila, derivadas) if coef != 0)), q)
+            for fila, q in zip(flujos, self.variables)
+        ))
+
+    def transformar(
+        self,
+        expr: sp.Expr,
+        cartesianas: Sequence[sp.Symbol] = (x, y, z),
+        origen: Sequence[Any] = (0, 0, 0)
+    ) -> sp.Expr:
+        """
+        Expresa en este sistema una función de x, y, z.
+
+        Args:
+            expr: Expresión en coordenadas cartesianas
+            cartesianas: Símbolos de x, y, z que usa la expresión
+            origen: Punto que corresponde al origen del sistema
+        """
+        return sp.sympify(expr).subs(
+            {v: o + e for v, o, e in zip(cartesianas, origen, self.mapa)}, simultaneous=True
+        )
+
+
+_sistemas: Dict[str, SistemaCoordenadas] = {}
+_variantes = OrderedDict()
+_lock_sistemas = threading.Lock()
+
+
+def registrar_sistema(
+    nombre: str,
+    variables: Sequence[sp.Symbol],
+    mapa: Sequence[Any],
+    parametros: Sequence[sp.Symbol] = ()
+) -> SistemaCoordenadas:
+    """
+    Registra un sistema de coordenadas a partir de su transformación a cartesianas.
+
+    No hace falta ninguna fórmula más: los operadores se deducen del mapa.
+
+    Args:
+        nombre: Nombre con el que se pedirá (sin distinguir mayúsculas ni acentos)
+        variables: Coordenadas (q1, q2, q3)
+        mapa: Expresiones de x, y, z en función de las coordenadas
+        parametros: Símbolos del mapa que no son coordenadas
+
+    Returns:
+        El sistema registrado
+    """
+    sistema = SistemaCoordenadas(nombre, variables, mapa, parametros)
+    with _lock_sistemas:
+        _sistemas[_sin_acentos(nombre)] = sistema
+        # Las variantes del sistema anterior con el mismo nombre ya no valen
+        for clave in [k for k in _variantes if k[0] == _sin_acentos(nombre)]:
+            del _variantes[clave]
+    return sistema
+
+
+def obtener_sistema(
+    nombre: str,
+    variables: Optional[Sequence[sp.Symbol]] = None,
+    **parametros: Any
+) -> SistemaCoordenadas:
+    """
+    Sistema de coordenadas registrado, compartido por el proceso.
+
+    Args:
+        nombre: 'cartesianas', 'cilindricas', 'esfericas', 'elipsoidales',
+            'toroidales' o cualquier otro registrado (se admiten acentos)
+        variables: Símbolos que usan los campos, si no son los del registro
+        **parametros: Valores de los parámetros por nombre (a=2, R=3...)
+
+    Returns:
+        SistemaCoordenadas con las plantillas memorizadas
+
+    Raises:
+        ValueError: Si el sistema no está registrado o algún parámetro no existe
+    """
+    clave_nombre = _sin_acentos(nombre)
+    with _lock_sistemas:
+        sistema = _sistemas.get(clave_nombre)
+    if sistema is None:
+        raise ValueError(
+            f"Sistema de coordenadas no soportado: {nombre}. Use {', '.join(repr(n) for n in _sistemas)}"
+        )
+    if variables is None and not parametros:
+        return sistema
+
+    cambio = {}
+    if variables is not None:
+        if len(variables) != 3:
+            raise ValueError("Se necesitan tres variables")
+        cambio.update({v: n for v, n in zip(sistema.variables, variables) if v != n})
+    por_nombre = {str(p): p for p in sistema.parametros}
+    for clave, valor in parametros.items():
+        if clave not in por_nombre:
+            raise ValueError(f"El sistema {sistema.nombre} no tiene el parámetro {clave}")
+        cambio[por_nombre[clave]] = valor
+    if not cambio:
+        return sistema
+
+    clave = (clave_nombre,) + tuple(sorted((sp.srepr(k), sp.srepr(sp.sympify(v))) for k, v in cambio.items()))
+    with _lock_sistemas:
+        variante = _variantes.get(clave)
+        if variante is None:
+            variante = sistema._variante(cambio)
+            _variantes[clave] = variante
+        _variantes.move_to_end(clave)
+        while len(_variantes) > CAPACIDAD_VARIANTES:
+            _variantes.popitem(last=False)
+    return variante
+
+
+registrar_sistema('cartesianas', (x, y, z), (x, y, z))
+registrar_sistema('cilindricas', (r, theta, z), (r * sp.cos(theta), r * sp.sin(theta), z))
+registrar_sistema(
+    'esfericas', (rho, phi, theta),
+    (rho * sp.sin(phi) * sp.cos(theta), rho * sp.sin(phi) * sp.sin(theta), rho * sp.cos(phi))
+)
+# Esféricas escaladas por los semiejes: r = 1 es el elipsoide (x/a)² + (y/b)² + (z/c)² = 1
+registrar_sistema(
+    'elipsoidales', (r, phi, theta),
+    (a * r * sp.sin(phi) * sp.cos(theta), b * r * sp.sin(phi) * sp.sin(theta), c * r * sp.cos(phi)),
+    parametros=(a, b, c)
+)
+# θ: ángulo alrededor del eje z; φ: ángulo alrededor del tubo de radio r a distancia R del eje
+registrar_sistema(
+    'toroidales', (r, theta, phi),
+    ((R + r * sp.cos(phi)) * sp.cos(theta), (R + r * sp.cos(phi)) * sp.sin(theta), r * sp.sin(phi)),
+    parametros=(R,)
+)
@@ -0,0 +1,117 @@
+"""
+Módulo de evaluación incremental de integrales iteradas.
+
+Una integral iterada es una cadena de etapas: la integral respecto a z
+depende del integrando y de los límites de z; la integral respecto a y
+depende de la anterior y de los límites de y, y así sucesivamente. El grafo
+guarda el resultado de cada etapa en la caché con una clave que encadena la
+de la etapa anterior con la variable y los límites propios. Así, al cambiar
+solo los límites exteriores (los de x, por ejemplo) las integrales
+interiores se reutilizan y solo se recalculan las etapas cuyas entradas
+cambiaron.
+
+Encadenar claves evita además calcular la forma canónica de las expresiones
+intermedias, que pueden ser mucho más grandes que el integrando.
+"""
+import logging
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+import sympy as sp
+
+from calculadora_calculo.calculos.cache import CacheResultados, clave_canonica, obtener_cache
+from calculadora_calculo.calculos.trabajos import reportar_etapa
+
+logger = logging.getLogger(__name__)
+
+
+class Etapa(NamedTuple):
+    """Una integración parcial del grafo."""
+    variable: sp.Symbol
+    lim_inf: Any
+    lim_sup: Any
+    entrada: sp.Expr
+    resultado: sp.Expr
+    reutilizada: bool
+
+
+class GrafoIntegral:
+    """
+    Cadena de integraciones parciales con dependencias explícitas.
+
+    Uso: crear el grafo con el integrando y llamar a integrar() para cada
+    variable, de la más interna a la más externa. Cada etapa se busca en la
+    caché antes de calcularse; las etapas calculadas quedan en el atributo
+    'etapas' con la marca 'reutilizada'.
+    """
+
+    def __init__(self, func: sp.Expr, cache: Optional[CacheResultados] = None):
+        """
+        Args:
+            func: Integrando (con el jacobiano incluido)
+            cache: Caché donde se guardan las etapas (por defecto, la compartida)
+        """
+        self.func = sp.sympify(func)
+        self.etapas: List[Etapa] = []
+        self._cache = cache if cache is not None else obtener_cache()
+        try:
+            self._clave = clave_canonica('grafo.integrando', self.func)
+        except TypeError:
+            # Sin forma canónica: se integra sin reutilizar etapas
+            self._clave = None
+
+    @property
+    def resultado(self) -> sp.Expr:
+        """Resultado de la última etapa (el integrando si aún no hay ninguna)."""
+        return self.etapas[-1].resultado if self.etapas else self.func
+
+    def integrar(self, var: sp.Symbol, lim_inf: Any, lim_sup: Any) -> Etapa:
+        """
+        Integra el resultado actual respecto a una variable.
+
+        Args:
+            var: Variable de integración
+            lim_inf: Límite inferior (puede depender de las variables exteriores)
+            lim_sup: Límite superior
+
+        Returns:
+            La etapa añadida al grafo
+        """
+        entrada = self.resultado
+        clave = None
+        if self._clave is not None:
+            try:
+                clave = clave_canonica('grafo.etapa', self._clave, var, lim_inf, lim_sup)
+            except TypeError:
+                clave = None
+
+        encontrado, resultado = self._cache.obtener(clave) if clave is not None else (False, None)
+        if encontrado:
+            logger.info("Integración respecto a %s reutilizada de un cálculo anterior", var)
+        else:
+            reportar_etapa(f"integración respecto a {var}")
+            resultado = sp.integrate(entrada, (var, lim_inf, lim_sup))
+            if clave is not None:
+                self._cache.guardar(clave, resultado)
+
+        # Las etapas siguientes dependen de esta (clave None: ya no se reutiliza nada)
+        self._clave = clave
+        etapa = Etapa(var, lim_inf, lim_sup, entrada, resultado, encontrado)
+        self.etapas.append(etapa)
+        return etapa
+
+
+def integrar_por_etapas(func: sp.Expr, *limites: Tuple[sp.Symbol, Any, Any]) -> sp.Expr:
+    """
+    Integral iterada que reutiliza las integrales parciales ya calculadas.
+
+    Args:
+        func: Expresión simbólica a integrar
+        *limites: Tuplas (variable, mínimo, máximo), la primera es la más interna
+
+    Returns:
+        Resultado simbólico de la integral
+    """
+    grafo = GrafoIntegral(func)
+    for var, lim_inf, lim_sup in limites:
+        grafo.integrar(var, lim_inf, lim_sup)
+    return grafo.resultado
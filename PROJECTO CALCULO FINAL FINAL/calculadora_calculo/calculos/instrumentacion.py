@@ -0,0 +1,108 @@
+"""
+Módulo de instrumentación del tamaño de las expresiones intermedias.
+
+En la integración paso a paso, los resultados intermedios (la integral
+respecto a z, luego respecto a y...) pueden crecer hasta decenas de miles de
+nodos y agotar la memoria antes de que sp.integrate termine. El monitor
+registra, tras cada etapa, el número de operaciones (count_ops), la
+profundidad del árbol y el tiempo, y lo escribe en el registro (logging). Si
+el crecimiento respecto al integrando supera el umbral, avisa y lanza
+CrecimientoExcesivo para que el cálculo pase al motor numérico.
+"""
+import logging
+import time
+from typing import List, NamedTuple
+
+import sympy as sp
+
+logger = logging.getLogger(__name__)
+
+# Factor de crecimiento respecto al integrando a partir del cual se abandona la vía simbólica
+UMBRAL_CRECIMIENTO = 50
+# Por debajo de este tamaño no se considera que la expresión se haya desbordado
+MIN_OPERACIONES_DESBORDE = 1000
+# Tamaño a partir del cual siempre se abandona la vía simbólica
+MAX_OPERACIONES = 20000
+
+
+class MetricaEtapa(NamedTuple):
+    """Tamaño de la expresión obtenida al terminar una etapa."""
+    etapa: str
+    operaciones: int
+    profundidad: int
+    segundos: float
+
+    def describir(self) -> str:
+        return (f"{self.etapa}: {self.operaciones} operaciones, "
+                f"profundidad {self.profundidad}, {self.segundos:.3f} s")
+
+
+class CrecimientoExcesivo(RuntimeError):
+    """Una expresión intermedia creció por encima del umbral permitido."""
+
+    def __init__(self, metrica: MetricaEtapa, operaciones_iniciales: int):
+        self.metrica = metrica
+        self.operaciones_iniciales = operaciones_iniciales
+        super().__init__(
+            f"La expresión intermedia creció de {operaciones_iniciales} a "
+            f"{metrica.operaciones} operaciones en la etapa: {metrica.etapa}"
+        )
+
+
+def profundidad(expr: sp.Basic) -> int:
+    """Profundidad del árbol de una expresión (recorrido iterativo, sin límite de recursión)."""
+    maxima = 0
+    pendientes = [(sp.sympify(expr), 1)]
+    while pendientes:
+        nodo, nivel = pendientes.pop()
+        maxima = max(maxima, nivel)
+        pendientes.extend((arg, nivel + 1) for arg in nodo.args)
+    return maxima
+
+
+class MonitorCrecimiento:
+    """
+    Registra el tamaño de las expresiones intermedias de un cálculo por etapas.
+
+    Uso: crear el monitor con el integrando y llamar a registrar() tras cada
+    etapa. Las métricas quedan en el atributo 'metricas' y en el registro.
+    """
+
+    def __init__(
+        self,
+        inicial: sp.Expr,
+        umbral: float = UMBRAL_CRECIMIENTO,
+        max_operaciones: int = MAX_OPERACIONES
+    ):
+        self.operaciones_iniciales = sp.count_ops(inicial)
+        self.umbral = umbral
+        self.max_operaciones = max_operaciones
+        self.metricas: List[MetricaEtapa] = []
+        self._inicio = time.perf_counter()
+
+    def registrar(self, etapa: str, expr: sp.Expr) -> MetricaEtapa:
+        """
+        Mide la expresión obtenida en una etapa.
+
+        Raises:
+            CrecimientoExcesivo: Si la expresión superó el umbral de crecimiento
+        """
+        ahora = time.perf_counter()
+        metrica = MetricaEtapa(etapa, sp.count_ops(expr), profundidad(expr), ahora - self._inicio)
+        self._inicio = ahora
+        self.metricas.append(metrica)
+        logger.info(metrica.describir())
+
+        if self._excede(metrica.operaciones):
+            logger.warning(
+                "Crecimiento excesivo de la expresión (%d -> %d operaciones) en la etapa: %s",
+                self.operaciones_iniciales, metrica.operaciones, etapa
+            )
+            raise CrecimientoExcesivo(metrica, self.operaciones_iniciales)
+        return metrica
+
+    def _excede(self, operaciones: int) -> bool:
+        if operaciones > self.max_operaciones:
+            return True
+        base = max(self.operaciones_iniciales, 1)
+        return operaciones > MIN_OPERACIONES_DESBORDE and operaciones > self.umbral * base
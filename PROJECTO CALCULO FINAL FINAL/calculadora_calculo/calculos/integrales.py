@@ -4,11 +4,96 @@ Módulo para el cálculo de integrales triples en diferentes sistemas de coorden
 import sympy as sp
 import numpy as np
 from typing import Tuple, Union, Callable, Dict, Any
+from calculadora_calculo.calculos.trabajos import reportar_etapa
+from calculadora_calculo.calculos.cache import cacheado
+from calculadora_calculo.calculos.cubatura import (
+    ORDEN_POR_DEFECTO, TOLERANCIA_ABSOLUTA, TOLERANCIA_RELATIVA,
+    ResultadoNumerico, integrar_gauss_legendre, integrar_adaptativa, integrar_doble_exponencial
+)
+from calculadora_calculo.calculos.montecarlo import integrar_qmc
+from calculadora_calculo.calculos.separable import integrar_separable
+from calculadora_calculo.calculos.polinomios import como_polinomio, integrar_polinomio_caja
+from calculadora_calculo.calculos.simetria import reducir_por_simetria
+from calculadora_calculo.calculos.grafo import integrar_por_etapas
+from calculadora_calculo.calculos.particion import particionar
 
 # Símbolos comunes
 x, y, z = sp.symbols('x y z', real=True)
 r, theta, rho, phi = sp.symbols('r theta rho phi', real=True, positive=True)
 
+# Jacobianos de los cambios de coordenadas
+JACOBIANO_CILINDRICO = r
+JACOBIANO_ESFERICO = rho**2 * sp.sin(phi)
+
+
+def a_expresion(func: Union[str, sp.Expr]) -> sp.Expr:
+    """
+    Convierte una cadena o expresión en una expresión sobre los símbolos del módulo.
+
+    Los símbolos sin supuestos con el mismo nombre (p. ej. los que crea la interfaz)
+    se reemplazan por los del módulo para que las transformaciones los reconozcan.
+    """
+    simbolos = {s.name: s for s in (x, y, z, r, theta, rho, phi)}
+    if isinstance(func, sp.Basic):
+        return func.xreplace({sp.Symbol(nombre): s for nombre, s in simbolos.items()})
+    return sp.sympify(func, locals=simbolos)
+
+
+def integrar_iterada(func: sp.Expr, *limites: Tuple[sp.Symbol, Any, Any]) -> sp.Expr:
+    """
+    Calcula una integral iterada, de la variable más interna a la más externa.
+
+    Cada pasada se anuncia como una etapa ('integración respecto a z', ...) para
+    que el presupuesto de tiempo de un trabajo identifique la pasada que se excede.
+    Antes de integrar se analiza la simetría: un integrando impar en alguna
+    variable da 0 sin integrar y uno par se integra en medio intervalo. Si el
+    integrando tiene Abs, sign, Max, Min o Piecewise, la región se divide en
+    subregiones donde es suave y se suman sus integrales. Si los
+    límites forman una caja y el integrando es un polinomio, se integra
+    monomio a monomio con fórmulas cerradas; si es separable, se calcula como
+    producto de integrales de una variable.
+
+    Args:
+        func: Expresión simbólica a integrar
+        *limites: Tuplas (variable, mínimo, máximo), la primera es la más interna
+
+    Returns:
+        Resultado simbólico de la integral
+    """
+    reportar_etapa("análisis de simetría")
+    factor, reducidos = reducir_por_simetria(func, *limites)
+    if factor == 0:
+        return sp.S.Zero
+    return factor * _integrar_iterada(func, *reducidos)
+
+
+def _integrar_iterada(func: sp.Expr, *limites: Tuple[sp.Symbol, Any, Any]) -> sp.Expr:
+    """Integral iterada sin análisis de simetría (ver integrar_iterada)."""
+    # Integrando no suave: suma de integrales suaves sobre subregiones
+    piezas = particionar(func, *limites)
+    if len(piezas) > 1 or piezas[0].integrando != func:
+        reportar_etapa(f"integración por subregiones ({len(piezas)})")
+        return sp.Add(*(integrar_iterada(pieza.integrando, *pieza.limites) for pieza in piezas))
+
+    if len(limites) > 1:
+        # Camino rápido: polinomio sobre una caja
+        if como_polinomio(func, [lim[0] for lim in limites]) is not None:
+            reportar_etapa("integración polinómica")
+            try:
+                return integrar_polinomio_caja(func, *limites)
+            except ValueError:
+                pass
+
+        # Camino rápido: producto de integrales de una variable
+        reportar_etapa("integración separable")
+        separado = integrar_separable(func, *limites)
+        if separado is not None:
+            return separado
+
+    # Las integrales parciales ya calculadas (p. ej. al cambiar solo los
+    # límites exteriores) se reutilizan
+    return integrar_por_etapas(func, *limites)
+
 
 def calcular_integral_rectangular(
     func: sp.Expr, 
@@ -34,12 +119,8 @@ def calcular_integral_rectangular(
     z_min, z_max = z_lim
     
     # Orden de integración: z, y, x (de adentro hacia afuera)
-    integral = sp.integrate(
-        sp.integrate(
-            sp.integrate(func, (z, z_min, z_max)),
-            (y, y_min, y_max)
-        ),
-        (x, x_min, x_max)
+    integral = integrar_iterada(
+        func, (z, z_min, z_max), (y, y_min, y_max), (x, x_min, x_max)
     )
     
     return integral
@@ -69,16 +150,12 @@ def calcular_integral_cilindrica(
     z_min, z_max = z_lim
     
     # Jacobiano: r (para coordenadas cilíndricas)
-    jacobian = r
+    jacobian = JACOBIANO_CILINDRICO
     integrando = func * jacobian
     
     # Orden de integración: z, r, theta
-    integral = sp.integrate(
-        sp.integrate(
-            sp.integrate(integrando, (z, z_min, z_max)),
-            (r, r_min, r_max)
-        ),
-        (theta, theta_min, theta_max)
+    integral = integrar_iterada(
+        integrando, (z, z_min, z_max), (r, r_min, r_max), (theta, theta_min, theta_max)
     )
     
     return integral
@@ -108,16 +185,12 @@ def calcular_integral_esferica(
     theta_min, theta_max = theta_lim
     
     # Jacobiano: rho² * sin(phi) (para coordenadas esféricas)
-    jacobian = rho**2 * sp.sin(phi)
+    jacobian = JACOBIANO_ESFERICO
     integrando = func * jacobian
     
     # Orden de integración: rho, phi, theta
-    integral = sp.integrate(
-        sp.integrate(
-            sp.integrate(integrando, (rho, rho_min, rho_max)),
-            (phi, phi_min, phi_max)
-        ),
-        (theta, theta_min, theta_max)
+    integral = integrar_iterada(
+        integrando, (rho, rho_min, rho_max), (phi, phi_min, phi_max), (theta, theta_min, theta_max)
     )
     
     return integral
@@ -163,16 +236,194 @@ def transformar_a_esfericas(func: sp.Expr) -> sp.Expr:
     return func_esf
 
 
+def integrando_con_jacobiano(
+    func_str: Union[str, sp.Expr],
+    coord_type: str,
+    x_lim: Tuple[float, float],
+    y_lim: Tuple[float, float],
+    z_lim: Tuple[float, float]
+):
+    """
+    Prepara el integrando con su jacobiano y los límites para integrar_iterada.
+
+    Usa las mismas variables, jacobianos y orden de integración que la versión
+    simbólica; lo aprovechan la cubatura y el portafolio de estrategias.
+
+    Returns:
+        Tupla (integrando, limites) con limites en el formato de integrar_iterada
+    """
+    func = a_expresion(func_str)
+    tipo = coord_type.lower()
+
+    if tipo == 'rectangular':
+        return func, [(z, *z_lim), (y, *y_lim), (x, *x_lim)]
+    elif tipo == 'cilindrica':
+        integrando = transformar_a_cilindricas(func) * JACOBIANO_CILINDRICO
+        return integrando, [(z, *z_lim), (r, *x_lim), (theta, *y_lim)]
+    elif tipo == 'esferica':
+        integrando = transformar_a_esfericas(func) * JACOBIANO_ESFERICO
+        return integrando, [(rho, *x_lim), (phi, *y_lim), (theta, *z_lim)]
+    else:
+        raise ValueError(f"Tipo de coordenadas no soportado: {coord_type}")
+
+
+def calcular_integral_triple_adaptativa(
+    func_str: Union[str, sp.Expr],
+    coord_type: str,
+    x_lim: Tuple[float, float],
+    y_lim: Tuple[float, float],
+    z_lim: Tuple[float, float],
+    **kwargs
+) -> ResultadoNumerico:
+    """
+    Calcula numéricamente una integral triple con cubatura adaptativa de Genz-Malik.
+
+    Adecuada para integrandos con picos o casi singularidades (p. ej. términos
+    1/ρ en esféricas), donde una malla fija desperdicia evaluaciones.
+
+    Args:
+        func_str: Función como cadena o expresión en coordenadas rectangulares
+        coord_type: Tipo de coordenadas ('rectangular', 'cilindrica', 'esferica')
+        x_lim: Límites numéricos en x (o r/ρ según el sistema)
+        y_lim: Límites numéricos en y (o θ/φ según el sistema)
+        z_lim: Límites numéricos en z (o z/θ según el sistema)
+        **kwargs: tolerancia_abs, tolerancia_rel y max_evaluaciones de integrar_adaptativa
+
+    Returns:
+        ResultadoNumerico con el valor y su error estimado
+    """
+    integrando, limites = integrando_con_jacobiano(func_str, coord_type, x_lim, y_lim, z_lim)
+    reportar_etapa("integración numérica adaptativa")
+    return integrar_adaptativa(integrando, *limites, **kwargs)
+
+
+def calcular_integral_triple_qmc(
+    func_str: Union[str, sp.Expr],
+    coord_type: str,
+    x_lim: Tuple[float, float],
+    y_lim: Tuple[float, float],
+    z_lim: Tuple[float, float],
+    **kwargs
+) -> ResultadoNumerico:
+    """
+    Calcula una integral triple con cuasi-Monte Carlo (Sobol aleatorizado).
+
+    La estimación parcial y su intervalo de confianza se informan tras cada
+    bloque de muestras (ver montecarlo.integrar_qmc).
+
+    Args:
+        func_str: Función como cadena o expresión en coordenadas rectangulares
+        coord_type: Tipo de coordenadas ('rectangular', 'cilindrica', 'esferica')
+        x_lim: Límites numéricos en x (o r/ρ según el sistema)
+        y_lim: Límites numéricos en y (o θ/φ según el sistema)
+        z_lim: Límites numéricos en z (o z/θ según el sistema)
+        **kwargs: tolerancia, tamano_bloque, replicas, max_muestras y semilla de integrar_qmc
+
+    Returns:
+        ResultadoNumerico con el semiancho del intervalo de confianza como error
+    """
+    integrando, limites = integrando_con_jacobiano(func_str, coord_type, x_lim, y_lim, z_lim)
+    reportar_etapa("integración cuasi-Monte Carlo")
+    return integrar_qmc(integrando, *limites, **kwargs)
+
+
+def calcular_integral_triple_numerica(
+    func_str: Union[str, sp.Expr],
+    coord_type: str,
+    x_lim: Tuple[float, float],
+    y_lim: Tuple[float, float],
+    z_lim: Tuple[float, float],
+    **kwargs
+) -> ResultadoNumerico:
+    """
+    Calcula numéricamente una integral triple.
+
+    Primero se aplica una regla fija de Gauss-Legendre; si su error estimado
+    no cumple la tolerancia, se pasa a la cubatura adaptativa.
+
+    Args:
+        func_str: Función como cadena o expresión en coordenadas rectangulares
+        coord_type: Tipo de coordenadas ('rectangular', 'cilindrica', 'esferica')
+        x_lim: Límites numéricos en x (o r/ρ según el sistema)
+        y_lim: Límites numéricos en y (o θ/φ según el sistema)
+        z_lim: Límites numéricos en z (o z/θ según el sistema)
+        **kwargs: 'orden' de la regla de cuadratura por eje, 'tolerancia_abs' y 'tolerancia_rel'
+
+    Returns:
+        ResultadoNumerico con el valor y su error estimado
+    """
+    integrando, limites = integrando_con_jacobiano(func_str, coord_type, x_lim, y_lim, z_lim)
+    return integrar_numerica(integrando, *limites, **kwargs)
+
+
+def integrar_numerica(integrando: sp.Expr, *limites: Tuple[sp.Symbol, Any, Any], **kwargs) -> ResultadoNumerico:
+    """
+    Calcula numéricamente una integral iterada con límites numéricos.
+
+    Sobre una caja se aplica Gauss-Legendre y, si su error estimado no cumple
+    la tolerancia, la transformación tanh-sinh en los ejes con singularidades
+    en los extremos (si los hay) y después la cubatura adaptativa. Si algún
+    límite depende de otras variables se usa cuasi-Monte Carlo.
+
+    Args:
+        integrando: Expresión a integrar (con el jacobiano incluido)
+        *limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada
+        **kwargs: 'orden' de la regla de cuadratura por eje, 'tolerancia_abs' y 'tolerancia_rel'
+
+    Returns:
+        ResultadoNumerico con el valor y su error estimado
+    """
+    tolerancia_abs = kwargs.get('tolerancia_abs', TOLERANCIA_ABSOLUTA)
+    tolerancia_rel = kwargs.get('tolerancia_rel', TOLERANCIA_RELATIVA)
+    variables = {lim[0] for lim in limites}
+    if any((sp.sympify(lim_inf).free_symbols | sp.sympify(lim_sup).free_symbols) & variables
+           for _, lim_inf, lim_sup in limites):
+        reportar_etapa("integración cuasi-Monte Carlo")
+        return integrar_qmc(integrando, *limites)
+
+    reportar_etapa("integración numérica")
+    resultado = integrar_gauss_legendre(
+        integrando, *limites, orden=kwargs.get('orden', ORDEN_POR_DEFECTO)
+    )
+    if resultado.error_estimado <= max(tolerancia_abs, tolerancia_rel * abs(resultado.valor)):
+        return resultado
+
+    reportar_etapa("integración numérica con transformación tanh-sinh")
+    try:
+        transformado = integrar_doble_exponencial(
+            integrando, *limites, tolerancia_abs=tolerancia_abs, tolerancia_rel=tolerancia_rel
+        )
+    except ValueError:
+        # Ningún eje es singular en sus extremos
+        transformado = None
+    if transformado is not None:
+        resultado = transformado._replace(evaluaciones=transformado.evaluaciones + resultado.evaluaciones)
+        if resultado.error_estimado <= max(tolerancia_abs, tolerancia_rel * abs(resultado.valor)):
+            return resultado
+
+    reportar_etapa("integración numérica adaptativa")
+    adaptativo = integrar_adaptativa(
+        integrando, *limites, tolerancia_abs=tolerancia_abs, tolerancia_rel=tolerancia_rel
+    )
+    return adaptativo._replace(evaluaciones=adaptativo.evaluaciones + resultado.evaluaciones)
+
+
+@cacheado(expresiones=('func_str',))
 def calcular_integral_triple(
     func_str: str, 
     coord_type: str,
     x_lim: Tuple[float, float],
     y_lim: Tuple[float, float],
     z_lim: Tuple[float, float],
+    respaldo_numerico: bool = True,
+    metodo: str = 'simbolico',
     **kwargs
-) -> sp.Expr:
+) -> Union[sp.Expr, ResultadoNumerico]:
     """
     Función principal para calcular integrales triples en diferentes sistemas de coordenadas.
+
+    Si la integral simbólica queda sin evaluar y los límites son numéricos, se
+    devuelve en su lugar una aproximación numérica con su error estimado.
     
     Args:
         func_str: Función como cadena (ej: 'x**2 + y**2 + z**2')
@@ -180,25 +431,45 @@ def calcular_integral_triple(
         x_lim: Límites de integración en x (o r/ρ según el sistema)
         y_lim: Límites de integración en y (o θ/φ según el sistema)
         z_lim: Límites de integración en z (o z/θ según el sistema)
+        respaldo_numerico: Si es False, siempre se devuelve el resultado simbólico
+        metodo: 'simbolico', 'numerico' (cubatura), 'adaptativo' o 'qmc' (cuasi-Monte Carlo)
         
     Returns:
-        Resultado simbólico de la integral
+        Resultado simbólico de la integral, o ResultadoNumerico si no hay forma cerrada
     """
+    metodos_numericos = {
+        'numerico': calcular_integral_triple_numerica,
+        'adaptativo': calcular_integral_triple_adaptativa,
+        'qmc': calcular_integral_triple_qmc,
+    }
+    if metodo in metodos_numericos:
+        return metodos_numericos[metodo](func_str, coord_type, x_lim, y_lim, z_lim, **kwargs)
+    elif metodo != 'simbolico':
+        raise ValueError(f"Método de integración no soportado: {metodo}")
+
     # Convertir la cadena a una expresión simbólica
-    func = sp.sympify(func_str)
+    func = a_expresion(func_str)
     
     if coord_type.lower() == 'rectangular':
-        return calcular_integral_rectangular(func, x_lim, y_lim, z_lim, **kwargs)
+        resultado = calcular_integral_rectangular(func, x_lim, y_lim, z_lim, **kwargs)
     
     elif coord_type.lower() == 'cilindrica':
         # Transformar la función a coordenadas cilíndricas
         func_cil = transformar_a_cilindricas(func)
-        return calcular_integral_cilindrica(func_cil, x_lim, y_lim, z_lim, **kwargs)
+        resultado = calcular_integral_cilindrica(func_cil, x_lim, y_lim, z_lim, **kwargs)
     
     elif coord_type.lower() == 'esferica':
         # Transformar la función a coordenadas esféricas
         func_esf = transformar_a_esfericas(func)
-        return calcular_integral_esferica(func_esf, x_lim, y_lim, z_lim, **kwargs)
+        resultado = calcular_integral_esferica(func_esf, x_lim, y_lim, z_lim, **kwargs)
     
     else:
         raise ValueError(f"Tipo de coordenadas no soportado: {coord_type}")
+
+    if respaldo_numerico and resultado.has(sp.Integral):
+        try:
+            return calcular_integral_triple_numerica(func, coord_type, x_lim, y_lim, z_lim)
+        except (TypeError, ValueError):
+            # Límites simbólicos o integrando no evaluable: conservar la forma simbólica
+            pass
+    return resultado
@@ -0,0 +1,63 @@
+"""
+Módulo para analizar los límites y parámetros numéricos escritos por el usuario.
+
+Los límites se conservan como números exactos de SymPy ('pi/2', 'sqrt(2)',
+'1/3', y también '0.5' -> 1/2) a lo largo de todo el cálculo simbólico:
+sp.integrate es más rápido con límites exactos, los resultados quedan en
+forma cerrada y las claves de caché coinciden. Solo los métodos numéricos
+los convierten a coma flotante.
+"""
+from typing import Optional, Sequence, Tuple
+
+import sympy as sp
+from sympy.parsing.sympy_parser import parse_expr
+
+from calculadora_calculo.calculos.normalizacion import FUNCIONES_ANALISIS, normalizar_expresion
+
+
+def parsear_limite(texto: str, defecto: Optional[str] = None) -> sp.Expr:
+    """
+    Convierte el texto de un límite en un número real exacto.
+
+    Args:
+        texto: Límite escrito por el usuario (p. ej. 'pi/2', 'sqrt(2)', '1/3', '-1.5')
+        defecto: Texto a usar si el campo está vacío
+
+    Returns:
+        Número exacto de SymPy (los decimales se convierten en racionales)
+
+    Raises:
+        ValueError: Si el texto no es un número real finito
+    """
+    texto = texto.strip() or (defecto or "")
+    if not texto:
+        raise ValueError("Falta un límite")
+    try:
+        valor = parse_expr(texto, local_dict=dict(FUNCIONES_ANALISIS))
+    except Exception as e:
+        raise ValueError(f"Límite no válido: {texto!r}") from e
+
+    valor = normalizar_expresion(sp.sympify(valor))
+    if valor.free_symbols or not valor.is_number:
+        raise ValueError(f"El límite {texto!r} no es un número")
+    if not (valor.is_real and valor.is_finite):
+        raise ValueError(f"El límite {texto!r} no es un número real finito")
+    return valor
+
+
+def parsear_intervalo(textos: Sequence[str]) -> Tuple[sp.Expr, sp.Expr]:
+    """
+    Analiza los dos extremos de un intervalo y los devuelve ordenados.
+
+    Raises:
+        ValueError: Si falta algún extremo o alguno no es válido
+    """
+    valores = [parsear_limite(texto) for texto in textos if texto.strip()]
+    if len(valores) != 2:
+        raise ValueError("Debe especificar ambos límites del intervalo")
+    return tuple(sorted(valores, key=lambda v: float(v)))
+
+
+def a_flotante(intervalo: Sequence[sp.Expr]) -> Tuple[float, ...]:
+    """Convierte límites exactos en flotantes (solo para métodos numéricos y gráficas)."""
+    return tuple(float(v) for v in intervalo)
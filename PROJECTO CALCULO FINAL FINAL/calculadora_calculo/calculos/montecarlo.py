@@ -0,0 +1,157 @@
+"""
+Módulo de integración cuasi-Monte Carlo con secuencias de Sobol aleatorizadas.
+
+Las muestras se procesan por bloques de tamaño fijo, de modo que la memoria
+no crece con el número de muestras, y tras cada bloque se informa la
+estimación parcial con su intervalo de confianza. Admite límites que dependen
+de las variables exteriores, por lo que sirve para regiones irregulares
+donde las mallas tensoriales crecen demasiado.
+"""
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+import numpy as np
+import sympy as sp
+from scipy import stats
+from scipy.stats import qmc
+
+from calculadora_calculo.calculos.cubatura import ResultadoNumerico, compilar_integrando
+from calculadora_calculo.calculos.trabajos import reportar_progreso
+
+# Muestras por réplica en cada bloque (potencia de 2 para conservar el balance de Sobol)
+TAMANO_BLOQUE = 2**15
+# Número de aleatorizaciones independientes usadas para el intervalo de confianza
+REPLICAS = 8
+# Tope de muestras por réplica
+MAX_MUESTRAS = 2**20
+# Nivel de confianza del intervalo
+CONFIANZA = 0.95
+
+
+class EstimacionQMC(NamedTuple):
+    """Estimación parcial de una integral cuasi-Monte Carlo."""
+    valor: float
+    semiancho: float
+    muestras: int
+
+
+def _compilar_limites(limites) -> list:
+    """
+    Compila los límites, del más exterior al más interior, como funciones de las variables exteriores.
+
+    Returns:
+        Lista de (inferior, superior) con funciones que reciben los arreglos de
+        las variables exteriores ya muestreadas
+    """
+    compilados = []
+    exteriores = []
+    for var, lim_inf, lim_sup in reversed(limites):
+        funciones = []
+        for lim in (lim_inf, lim_sup):
+            expr = sp.sympify(lim)
+            if expr.free_symbols - set(exteriores):
+                raise ValueError(f"El límite {lim} de {var} depende de variables interiores")
+            funciones.append(compilar_integrando(expr, list(exteriores)))
+        compilados.append(tuple(funciones))
+        exteriores.append(var)
+    return compilados
+
+
+def _evaluar_bloque(funcion: Callable, limites_compilados: list, u: np.ndarray) -> float:
+    """
+    Transforma puntos del cubo unitario a la región y devuelve la media del integrando.
+
+    Cada variable se lleva a su intervalo con una transformación afín cuyos
+    extremos se evalúan sobre las variables exteriores ya transformadas; el
+    producto de los anchos es el jacobiano de la transformación.
+    """
+    puntos = []
+    jacobiano = np.ones(len(u))
+    for k, (inferior, superior) in enumerate(limites_compilados):
+        a = inferior(*puntos) if puntos else np.broadcast_to(inferior(), u[:, k].shape)
+        b = superior(*puntos) if puntos else np.broadcast_to(superior(), u[:, k].shape)
+        ancho = b - a
+        puntos.append(a + ancho * u[:, k])
+        jacobiano = jacobiano * ancho
+    # Los argumentos del integrando siguen el orden de integrar_iterada (interior primero)
+    valores = funcion(*reversed(puntos)) * jacobiano
+    if np.iscomplexobj(valores):
+        valores = np.real_if_close(valores, tol=1e6)
+        if np.iscomplexobj(valores):
+            raise ValueError("El integrando toma valores complejos en la región")
+    return float(np.mean(valores))
+
+
+def integrar_qmc(
+    integrando: sp.Expr,
+    *limites: Tuple[sp.Symbol, Any, Any],
+    tolerancia: Optional[float] = None,
+    tamano_bloque: int = TAMANO_BLOQUE,
+    replicas: int = REPLICAS,
+    max_muestras: int = MAX_MUESTRAS,
+    semilla: Optional[int] = None,
+    al_bloque: Optional[Callable[[EstimacionQMC], None]] = None
+) -> ResultadoNumerico:
+    """
+    Integra numéricamente con cuasi-Monte Carlo sobre secuencias de Sobol aleatorizadas.
+
+    Se usan varias réplicas con distinta aleatorización; la dispersión entre
+    ellas da el intervalo de confianza. Tras cada bloque la estimación parcial
+    se envía con reportar_progreso() (y a al_bloque, si se indica), de modo
+    que la interfaz puede mostrarla y el usuario detener el cálculo.
+
+    Args:
+        integrando: Expresión simbólica a integrar (con el jacobiano incluido)
+        *limites: Tuplas (variable, mínimo, máximo) en el orden de integrar_iterada
+            (la primera es la más interna); cada límite puede depender de las
+            variables más exteriores
+        tolerancia: Semiancho del intervalo de confianza con el que se detiene
+        tamano_bloque: Muestras por réplica en cada bloque (potencia de 2)
+        replicas: Número de secuencias aleatorizadas independientes
+        max_muestras: Tope de muestras por réplica
+        semilla: Semilla de la aleatorización, para resultados reproducibles
+        al_bloque: Callback opcional con cada EstimacionQMC
+
+    Returns:
+        ResultadoNumerico cuyo error estimado es el semiancho del intervalo de confianza
+    """
+    variables = [lim[0] for lim in limites]
+    funcion = compilar_integrando(integrando, variables)
+    limites_compilados = _compilar_limites(limites)
+
+    generador = np.random.default_rng(semilla)
+    secuencias = [
+        qmc.Sobol(d=len(limites), scramble=True, seed=generador)
+        for _ in range(replicas)
+    ]
+    cuantil = stats.t.ppf((1 + CONFIANZA) / 2, replicas - 1)
+
+    # Solo se guardan las sumas por réplica: la memoria no depende de las muestras
+    sumas = np.zeros(replicas)
+    muestras = 0
+    estimacion = None
+    while muestras < max_muestras:
+        for i, secuencia in enumerate(secuencias):
+            u = secuencia.random(tamano_bloque)
+            sumas[i] += _evaluar_bloque(funcion, limites_compilados, u) * tamano_bloque
+        muestras += tamano_bloque
+
+        medias = sumas / muestras
+        estimacion = EstimacionQMC(
+            valor=float(np.mean(medias)),
+            semiancho=float(cuantil * np.std(medias, ddof=1) / np.sqrt(replicas)),
+            muestras=muestras * replicas
+        )
+        if not np.isfinite(estimacion.valor):
+            raise ValueError("El integrando no es finito en los puntos de muestreo")
+        reportar_progreso(estimacion)
+        if al_bloque is not None:
+            al_bloque(estimacion)
+        if tolerancia is not None and estimacion.semiancho <= tolerancia:
+            break
+
+    return ResultadoNumerico(
+        valor=estimacion.valor,
+        error_estimado=estimacion.semiancho,
+        evaluaciones=estimacion.muestras,
+        metodo=f"Cuasi-Monte Carlo (Sobol, {replicas} réplicas)"
+    )
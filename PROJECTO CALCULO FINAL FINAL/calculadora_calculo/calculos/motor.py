@@ -0,0 +1,102 @@
+"""
+Motor de integración común a la pestaña de Integrales y a los teoremas.
+
+Cada cálculo devuelve su resultado junto con una traza perezosa de pasos:
+las expresiones intermedias se guardan tal cual y su representación
+(sp.pretty o sp.latex) solo se genera cuando la interfaz muestra el
+procedimiento. Dibujar expresiones grandes cuesta a menudo más que
+calcularlas, y la mayoría de las veces nadie abre el procedimiento.
+
+integrar() es la entrada única para las integrales de los teoremas: usa
+integrar_iterada (simetría, polinomios, integrandos separables y caché) y,
+si no hay forma cerrada, recurre al motor numérico.
+"""
+from typing import Any, Iterable, List, Tuple, Union
+
+import sympy as sp
+
+from calculadora_calculo.calculos.cubatura import ResultadoNumerico
+from calculadora_calculo.calculos.integrales import integrar_iterada, integrar_numerica
+
+
+class Traza:
+    """
+    Lista de pasos de un procedimiento que se renderizan al mostrarse.
+
+    Cada paso es una secuencia de partes: las cadenas se copian tal cual y
+    las expresiones de SymPy se convierten con sp.pretty (pasos de texto) o
+    sp.latex (pasos en LaTeX) solo al llamar a renderizar(). La traza se
+    puede serializar con pickle, así que viaja desde los procesos
+    trabajadores y se guarda en la caché.
+    """
+
+    def __init__(self, pasos: Iterable[str] = ()):
+        # Cada paso: (formato, partes) con formato 'texto' o 'latex'
+        self._pasos: List[Tuple[str, tuple]] = [('texto', (paso,)) for paso in pasos]
+
+    def texto(self, *partes: Any) -> None:
+        """Añade un paso de texto; las expresiones se dibujan con sp.pretty."""
+        self._pasos.append(('texto', partes))
+
+    def latex(self, *partes: Any) -> None:
+        """Añade un paso en LaTeX; las expresiones se convierten con sp.latex."""
+        self._pasos.append(('latex', partes))
+
+    def append(self, paso: str) -> None:
+        """Añade un paso ya escrito (texto o LaTeX)."""
+        self._pasos.append(('texto', (paso,)))
+
+    def extend(self, pasos: Union['Traza', Iterable[str]]) -> None:
+        """Añade los pasos de otra traza o de una lista de cadenas."""
+        if isinstance(pasos, Traza):
+            self._pasos.extend(pasos._pasos)
+        else:
+            for paso in pasos:
+                self.append(paso)
+
+    def __len__(self) -> int:
+        return len(self._pasos)
+
+    def renderizar(self) -> List[str]:
+        """Genera las líneas del procedimiento."""
+        return [
+            "".join(_renderizar_parte(parte, formato) for parte in partes)
+            for formato, partes in self._pasos
+        ]
+
+
+def _renderizar_parte(parte: Any, formato: str) -> str:
+    if isinstance(parte, str):
+        return parte
+    if isinstance(parte, (sp.Basic, sp.MatrixBase)):
+        return sp.latex(parte) if formato == 'latex' else sp.pretty(parte)
+    return str(parte)
+
+
+def renderizar_pasos(pasos: Union[Traza, List[str]]) -> List[str]:
+    """Líneas de un procedimiento, tanto si es una traza como una lista ya escrita."""
+    return pasos.renderizar() if isinstance(pasos, Traza) else list(pasos)
+
+
+def integrar(func: sp.Expr, *limites: Tuple[sp.Symbol, Any, Any]) -> Union[sp.Expr, ResultadoNumerico]:
+    """
+    Integral iterada con respaldo numérico.
+
+    Args:
+        func: Integrando (con el jacobiano incluido)
+        *limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada
+
+    Returns:
+        Resultado simbólico, o ResultadoNumerico si sp.integrate no encuentra
+        forma cerrada y los límites son numéricos
+    """
+    resultado = integrar_iterada(func, *limites)
+    if not resultado.has(sp.Integral):
+        return resultado
+    variables = {lim[0] for lim in limites}
+    if (sp.sympify(func).free_symbols - variables) or any(
+        sp.sympify(lim).free_symbols - variables for _, lim_inf, lim_sup in limites for lim in (lim_inf, lim_sup)
+    ):
+        # Quedan parámetros libres: no hay valor numérico que calcular
+        return resultado
+    return integrar_numerica(func, *limites)
@@ -0,0 +1,238 @@
+"""
+Módulo de núcleos nativos (C) para los integrandos y campos más costosos.
+
+Las funciones de lambdify evalúan la expresión operación a operación sobre
+arreglos completos de NumPy, y cada operación crea un arreglo temporal. En
+mallas grandes y en cuasi-Monte Carlo esto domina el tiempo. Este módulo
+genera código C con la impresora de SymPy (tras sp.cse), lo compila con el
+compilador del sistema en una biblioteca compartida y recorre los puntos en
+un solo bucle fusionado, sin temporales.
+
+Las bibliotecas se guardan en disco por el resumen de las expresiones, así
+que cada integrando se compila una sola vez. Si no hay compilador, la
+expresión usa funciones que C no tiene o la compilación falla, se usa el
+núcleo de NumPy (nucleos.py). Solo se compila cuando una llamada evalúa al
+menos MIN_PUNTOS_NATIVO puntos o cuando la biblioteca ya está en disco: en
+mallas pequeñas compilar costaría más que evaluar.
+"""
+import ctypes
+import hashlib
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Sequence, Union
+
+import numpy as np
+import sympy as sp
+
+from calculadora_calculo.calculos.cache import DIRECTORIO_CACHE
+from calculadora_calculo.calculos.nucleos import CAPACIDAD_NUCLEOS, nucleo
+from calculadora_calculo.calculos.normalizacion import forma_canonica
+
+logger = logging.getLogger(__name__)
+
+# Directorio de las bibliotecas compiladas
+DIRECTORIO_NATIVO = os.path.join(DIRECTORIO_CACHE, 'nativo')
+# Puntos por llamada a partir de los cuales compensa compilar
+MIN_PUNTOS_NATIVO = 100_000
+# Opciones del compilador. No se usa -ffast-math: con -shared y gcc < 13 enlaza
+# crtfastmath.o, que activa FTZ/DAZ en todo el proceso al cargar la biblioteca
+# y cambia los subnormales de NumPy. -fno-math-errno y -fno-trapping-math bastan
+# para que '#pragma omp simd' vectorice el bucle (no hay reducciones, así que no
+# hace falta -fassociative-math). -march=native: las bibliotecas se guardan por
+# máquina (ver _ruta_biblioteca).
+OPCIONES_COMPILADOR = (
+    '-O3', '-march=native', '-fno-math-errno', '-fno-trapping-math', '-fopenmp-simd', '-shared', '-fPIC'
+)
+# Segundos máximos de compilación
+LIMITE_COMPILACION = 60
+# Desactivar con CALCULADORA_NATIVO=0
+ACTIVADO = os.environ.get('CALCULADORA_NATIVO', '1') != '0'
+
+
+def compilador() -> Optional[str]:
+    """Ruta del compilador de C del sistema, o None si no hay."""
+    for nombre in (os.environ.get('CC'), 'cc', 'gcc', 'clang'):
+        if nombre and shutil.which(nombre):
+            return shutil.which(nombre)
+    return None
+
+
+def generar_c(expresiones: Sequence[sp.Expr], variables: Sequence[sp.Symbol]) -> str:
+    """
+    Código C de un núcleo que evalúa varias expresiones en n puntos.
+
+    La función generada es
+    void nucleo(const double *p0, ..., double *s0, ..., long n).
+
+    Raises:
+        ValueError: Si alguna expresión no se puede escribir en C con valores reales
+    """
+    entradas = [sp.Symbol(f'a{i}', real=True) for i in range(len(variables))]
+    sustitucion = dict(zip(variables, entradas))
+    expresiones = [sp.sympify(e).xreplace(sustitucion) for e in expresiones]
+    libres = set().union(*(e.free_symbols for e in expresiones)) - set(entradas)
+    if libres:
+        raise ValueError(f"Símbolos sin valor: {', '.join(sorted(map(str, libres)))}")
+    if any(e.has(sp.I) for e in expresiones):
+        raise ValueError("El núcleo nativo solo admite valores reales")
+
+    comunes, reducidas = sp.cse(expresiones, symbols=sp.numbered_symbols('c'))
+    try:
+        cuerpo = [f"        const double {sp.ccode(s)} = {sp.ccode(e)};" for s, e in comunes]
+        cuerpo += [f"        s{k}[i] = {sp.ccode(e)};" for k, e in enumerate(reducidas)]
+    except Exception as e:
+        # Funciones sin equivalente en C (besselj, erf complejas...)
+        raise ValueError(f"Expresión no admitida en C: {e}") from e
+
+    argumentos = [f"const double *restrict p{j}" for j in range(len(entradas))]
+    argumentos += [f"double *restrict s{k}" for k in range(len(reducidas))]
+    lecturas = [f"        const double a{j} = p{j}[i];" for j in range(len(entradas))]
+    return "\n".join([
+        "#include <math.h>",
+        "",
+        f"void nucleo({', '.join(argumentos + ['long n'])})",
+        "{",
+        "    #pragma omp simd",
+        "    for (long i = 0; i < n; i++) {",
+        *lecturas,
+        *cuerpo,
+        "    }",
+        "}",
+        "",
+    ])
+
+
+def _ruta_biblioteca(codigo: str) -> str:
+    # El código de máquina depende de las opciones y de la CPU (-march=native)
+    contenido = "|".join([codigo, *OPCIONES_COMPILADOR, platform.machine(), platform.node()])
+    resumen = hashlib.sha256(contenido.encode('utf-8')).hexdigest()[:32]
+    return os.path.join(DIRECTORIO_NATIVO, f"nucleo_{resumen}.so")
+
+
+def _compilar(codigo: str, ruta: str) -> None:
+    """Compila el código en una biblioteca compartida (escritura atómica)."""
+    cc = compilador()
+    if cc is None:
+        raise OSError("No hay compilador de C disponible")
+    os.makedirs(DIRECTORIO_NATIVO, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=DIRECTORIO_NATIVO) as temporal:
+        fuente = os.path.join(temporal, 'nucleo.c')
+        salida = os.path.join(temporal, 'nucleo.so')
+        with open(fuente, 'w', encoding='utf-8') as archivo:
+            archivo.write(codigo)
+        inicio = time.perf_counter()
+        subprocess.run(
+            [cc, *OPCIONES_COMPILADOR, fuente, '-o', salida, '-lm'],
+            check=True, capture_output=True, timeout=LIMITE_COMPILACION
+        )
+        # Otro proceso puede estar compilando el mismo núcleo: os.replace es atómico
+        os.replace(salida, ruta)
+        logger.info("Núcleo nativo compilado en %.2f s: %s", time.perf_counter() - inicio, ruta)
+
+
+class NucleoNativo:
+    """
+    Evaluador de expresiones que usa C en las llamadas grandes y NumPy en las demás.
+
+    Se comporta como la función de nucleos.nucleo: acepta arreglos que se
+    difunden entre sí y devuelve un arreglo (o una lista si se compilaron
+    varias expresiones).
+    """
+
+    def __init__(self, expresiones: Union[sp.Expr, Sequence[sp.Expr]], variables: Sequence[sp.Symbol]):
+        self._varias = isinstance(expresiones, (list, tuple))
+        self._expresiones = list(expresiones) if self._varias else [expresiones]
+        self._variables = tuple(variables)
+        self._numpy = nucleo(expresiones, variables)
+        self._funcion = None
+        self._lock = threading.Lock()
+        # None: aún no se ha intentado; False: no disponible (se usa NumPy)
+        self._disponible = None if ACTIVADO else False
+        try:
+            self._codigo = generar_c(self._expresiones, self._variables)
+        except ValueError:
+            self._disponible = False
+            return
+        if os.path.exists(_ruta_biblioteca(self._codigo)):
+            self._cargar(compilar=False)
+
+    @property
+    def nativo(self) -> bool:
+        """Indica si las llamadas grandes se evalúan en C."""
+        return self._funcion is not None
+
+    def _cargar(self, compilar: bool) -> None:
+        with self._lock:
+            if self._disponible is not None:
+                return
+            ruta = _ruta_biblioteca(self._codigo)
+            try:
+                if not os.path.exists(ruta):
+                    if not compilar:
+                        return
+                    _compilar(self._codigo, ruta)
+                funcion = ctypes.CDLL(ruta).nucleo
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.warning("Núcleo nativo no disponible, se usa NumPy: %s", e)
+                self._disponible = False
+                return
+            puntero = np.ctypeslib.ndpointer(dtype=np.float64, flags='C_CONTIGUOUS')
+            funcion.argtypes = [puntero] * (len(self._variables) + len(self._expresiones)) + [ctypes.c_long]
+            funcion.restype = None
+            self._funcion = funcion
+            self._disponible = True
+
+    def __call__(self, *arreglos):
+        forma = np.broadcast_shapes(*(np.shape(a) for a in arreglos))
+        puntos = int(np.prod(forma))
+        if self._disponible is None and puntos >= MIN_PUNTOS_NATIVO:
+            self._cargar(compilar=True)
+        if self._funcion is None or any(np.iscomplexobj(a) for a in arreglos):
+            return self._numpy(*arreglos)
+
+        entradas = [
+            np.ascontiguousarray(np.broadcast_to(np.asarray(a, dtype=np.float64), forma)).ravel()
+            for a in arreglos
+        ]
+        salidas = [np.empty(puntos) for _ in self._expresiones]
+        self._funcion(*entradas, *salidas, puntos)
+        salidas = [s.reshape(forma) for s in salidas]
+        return salidas if self._varias else salidas[0]
+
+
+_nucleos_nativos = OrderedDict()
+_lock_nativos = threading.Lock()
+
+
+def nucleo_nativo(expresiones: Union[sp.Expr, Sequence[sp.Expr]], variables: Sequence[sp.Symbol]) -> Callable:
+    """
+    Núcleo con respaldo nativo, compartido por el proceso.
+
+    Args:
+        expresiones: Expresión, o secuencia de expresiones que se evalúan juntas
+        variables: Variables en el orden en que se pasarán los argumentos
+
+    Returns:
+        NucleoNativo (que recurre a NumPy si no hay compilador)
+    """
+    if isinstance(expresiones, (list, tuple)):
+        clave = tuple(forma_canonica(sp.sympify(e)) for e in expresiones)
+    else:
+        clave = forma_canonica(sp.sympify(expresiones))
+    clave = (clave, tuple(sp.srepr(v) for v in variables))
+    with _lock_nativos:
+        evaluador = _nucleos_nativos.get(clave)
+        if evaluador is None:
+            evaluador = NucleoNativo(expresiones, variables)
+            _nucleos_nativos[clave] = evaluador
+        _nucleos_nativos.move_to_end(clave)
+        while len(_nucleos_nativos) > CAPACIDAD_NUCLEOS:
+            _nucleos_nativos.popitem(last=False)
+    return evaluador
@@ -0,0 +1,125 @@
+"""
+Módulo de normalización canónica de expresiones y límites.
+
+Convierte entradas equivalentes (p. ej. 'x*y + z', 'z + y*x' y '(x*y)+z', o
+los límites 1 y 1.0) en una misma forma textual estable, para que las claves
+de caché coincidan. Solo se usa para comparar entradas: los cálculos siguen
+recibiendo las expresiones originales.
+"""
+from typing import Any, Dict
+
+import sympy as sp
+from sympy.parsing.sympy_parser import parse_expr
+
+# Nombre canónico de cada símbolo -> alias aceptados en la entrada
+ALIAS_SIMBOLOS = {
+    'phi': ('varphi', 'ϕ', 'φ'),
+    'theta': ('vartheta', 'θ'),
+    'rho': ('ρ',),
+}
+
+# Alias -> nombre canónico
+_CANONICO = {
+    alias: nombre
+    for nombre, aliases in ALIAS_SIMBOLOS.items()
+    for alias in aliases
+}
+
+# Constantes y funciones admitidas al analizar una función escrita por el usuario
+FUNCIONES_ANALISIS = {
+    "pi": sp.pi, "E": sp.E, "e": sp.E,
+    "sin": sp.sin, "cos": sp.cos, "tan": sp.tan,
+    "sqrt": sp.sqrt, "log": sp.log, "exp": sp.exp,
+    "Abs": sp.Abs,
+}
+
+
+def diccionario_analisis(**simbolos: sp.Symbol) -> Dict[str, Any]:
+    """
+    Diccionario local para parse_expr con constantes, funciones y alias de símbolos.
+
+    Args:
+        **simbolos: Símbolos propios del llamador (p. ej. x=x, y=y, z=z)
+
+    Returns:
+        Diccionario en el que cada alias apunta al mismo símbolo que su nombre canónico
+    """
+    local = dict(FUNCIONES_ANALISIS)
+    for nombre, aliases in ALIAS_SIMBOLOS.items():
+        simbolo = simbolos.get(nombre, sp.Symbol(nombre))
+        local[nombre] = simbolo
+        for alias in aliases:
+            local[alias] = simbolo
+    local.update(simbolos)
+    return local
+
+
+def _renombrar_alias(expr: sp.Basic) -> sp.Basic:
+    """Sustituye los símbolos con nombre de alias por su nombre canónico, conservando supuestos."""
+    # Supuestos tal como se declararon (los deducidos alterarían srepr)
+    cambios = {
+        s: sp.Symbol(_CANONICO[s.name], **getattr(s, '_assumptions_orig', s.assumptions0))
+        for s in expr.atoms(sp.Symbol) if s.name in _CANONICO
+    }
+    return expr.xreplace(cambios) if cambios else expr
+
+
+def _racionalizar(expr: sp.Basic) -> sp.Basic:
+    """Convierte los literales decimales en racionales exactos (0.5 -> 1/2)."""
+    decimales = expr.atoms(sp.Float)
+    if not decimales:
+        return expr
+    return expr.xreplace({f: sp.Rational(str(f)) for f in decimales if f.is_finite})
+
+
+def normalizar_expresion(expr: sp.Basic) -> sp.Basic:
+    """
+    Devuelve la forma normalizada de una expresión: alias unificados y literales racionales.
+    """
+    return _racionalizar(_renombrar_alias(sp.sympify(expr)))
+
+
+def normalizar_cadena(texto: str) -> sp.Basic:
+    """
+    Analiza una función escrita como texto y la normaliza.
+
+    Raises:
+        ValueError: Si el texto no es una expresión válida
+    """
+    try:
+        expr = parse_expr(texto, local_dict=diccionario_analisis())
+    except Exception as e:
+        raise ValueError(f"Expresión no válida: {texto!r}") from e
+    return normalizar_expresion(expr)
+
+
+def normalizar_numero(valor) -> sp.Basic:
+    """Convierte un número de Python en un número exacto de sympy (1.0 -> 1, 0.1 -> 1/10)."""
+    if isinstance(valor, float):
+        if valor != valor or valor in (float('inf'), float('-inf')):
+            return sp.Float(valor)
+        return sp.Rational(repr(valor))
+    return sp.sympify(valor)
+
+
+def forma_canonica(expr: sp.Basic) -> str:
+    """
+    Representación textual estable de una expresión ya normalizada.
+
+    Los argumentos de sumas y productos conmutativos se ordenan por su propia
+    forma canónica, de modo que el orden de escritura no afecta al resultado.
+    """
+    if isinstance(expr, sp.MatrixBase):
+        filas = ";".join(
+            ",".join(forma_canonica(expr[i, j]) for j in range(expr.cols))
+            for i in range(expr.rows)
+        )
+        return f"Matrix[{filas}]"
+    if not isinstance(expr, sp.Basic):
+        return repr(expr)
+    if expr.is_Atom:
+        return sp.srepr(expr)
+    argumentos = [forma_canonica(a) for a in expr.args]
+    if isinstance(expr, (sp.Add, sp.Mul)) and expr.is_commutative:
+        argumentos.sort()
+    return f"{type(expr).__name__}({','.join(argumentos)})"
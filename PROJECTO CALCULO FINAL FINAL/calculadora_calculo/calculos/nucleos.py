@@ -0,0 +1,127 @@
+"""
+Módulo de caché de núcleos compilados (funciones de NumPy generadas con lambdify).
+
+Generar y compilar el código de sp.lambdify cuesta milisegundos por
+expresión, y la visualización y los motores numéricos lo repetían en cada
+redibujado o en cada integral. La caché guarda las funciones compiladas en
+memoria con política LRU, indexadas por la forma canónica de las expresiones
+y por la tupla de variables.
+
+Antes de generar el código se aplica eliminación de subexpresiones comunes
+(sp.cse): las componentes de un campo que comparten subtérminos los evalúan
+una sola vez por malla. La caché lleva la cuenta de aciertos y del tiempo de
+compilación.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Sequence, Union
+
+import sympy as sp
+
+from calculadora_calculo.calculos.normalizacion import forma_canonica
+
+logger = logging.getLogger(__name__)
+
+# Núcleos compilados que se conservan en memoria
+CAPACIDAD_NUCLEOS = 128
+
+
+class EstadisticasNucleos(NamedTuple):
+    """Uso de la caché de núcleos desde el inicio del proceso."""
+    aciertos: int
+    fallos: int
+    segundos_compilacion: float
+    nucleos: int
+
+    @property
+    def tasa_aciertos(self) -> float:
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def describir(self) -> str:
+        return (f"{self.aciertos} aciertos, {self.fallos} compilaciones "
+                f"({self.tasa_aciertos:.0%} de aciertos), "
+                f"{self.segundos_compilacion:.3f} s compilando, {self.nucleos} en memoria")
+
+
+class CacheNucleos:
+    """Caché LRU de funciones compiladas con sp.lambdify."""
+
+    def __init__(self, capacidad: int = CAPACIDAD_NUCLEOS):
+        self.capacidad = capacidad
+        self._nucleos = OrderedDict()
+        self._lock = threading.Lock()
+        self._aciertos = 0
+        self._fallos = 0
+        self._segundos = 0.0
+
+    def obtener(self, expresiones: Union[sp.Expr, Sequence[sp.Expr]], variables: Sequence[sp.Symbol]) -> Callable:
+        """
+        Devuelve la función compilada de una expresión o de varias a la vez.
+
+        Args:
+            expresiones: Expresión, o secuencia de expresiones que se evalúan juntas
+            variables: Variables en el orden en que se pasarán los argumentos
+
+        Returns:
+            Función f(*arreglos) que devuelve un valor, o una lista con uno por
+            expresión si se pasó una secuencia
+        """
+        varias = isinstance(expresiones, (list, tuple))
+        if varias:
+            expresiones = [sp.sympify(e) for e in expresiones]
+            clave = ('varias',) + tuple(forma_canonica(e) for e in expresiones)
+        else:
+            expresiones = sp.sympify(expresiones)
+            clave = ('una', forma_canonica(expresiones))
+        variables = tuple(variables)
+        clave += tuple(sp.srepr(v) for v in variables)
+
+        with self._lock:
+            funcion = self._nucleos.get(clave)
+            if funcion is not None:
+                self._nucleos.move_to_end(clave)
+                self._aciertos += 1
+                return funcion
+
+        inicio = time.perf_counter()
+        # cse=True: sp.cse antes de generar el código, los subtérminos comunes se evalúan una vez
+        funcion = sp.lambdify(variables, expresiones, modules='numpy', cse=True)
+        segundos = time.perf_counter() - inicio
+
+        with self._lock:
+            self._fallos += 1
+            self._segundos += segundos
+            self._nucleos[clave] = funcion
+            self._nucleos.move_to_end(clave)
+            while len(self._nucleos) > self.capacidad:
+                self._nucleos.popitem(last=False)
+        logger.debug("Núcleo compilado en %.4f s; %s", segundos, self.estadisticas().describir())
+        return funcion
+
+    def estadisticas(self) -> EstadisticasNucleos:
+        """Aciertos, compilaciones y tiempo de compilación acumulados."""
+        with self._lock:
+            return EstadisticasNucleos(self._aciertos, self._fallos, self._segundos, len(self._nucleos))
+
+    def limpiar(self) -> None:
+        """Elimina los núcleos y reinicia las estadísticas."""
+        with self._lock:
+            self._nucleos.clear()
+            self._aciertos = self._fallos = 0
+            self._segundos = 0.0
+
+
+_cache_nucleos = CacheNucleos()
+
+
+def nucleo(expresiones: Union[sp.Expr, Sequence[sp.Expr]], variables: Sequence[sp.Symbol]) -> Callable:
+    """Función compilada de la caché compartida del proceso (ver CacheNucleos.obtener)."""
+    return _cache_nucleos.obtener(expresiones, variables)
+
+
+def estadisticas_nucleos() -> EstadisticasNucleos:
+    """Estadísticas de la caché compartida del proceso."""
+    return _cache_nucleos.estadisticas()
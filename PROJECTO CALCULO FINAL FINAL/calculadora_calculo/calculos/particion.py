@@ -0,0 +1,261 @@
+"""
+Módulo de partición del dominio de integrandos no suaves.
+
+Con Abs, sign, Heaviside, Max, Min o Piecewise, sp.integrate construye
+árboles de Piecewise enormes o se rinde. Cada una de esas funciones cambia
+de forma solo donde cambia el signo de ciertas expresiones g (el argumento
+de Abs, la diferencia de los argumentos de Max, los lados de una condición
+de Piecewise...). La partición busca las superficies g = 0 dentro de los
+límites, divide la región en subregiones donde ningún g cambia de signo y,
+en cada una, sustituye la función por la rama que le corresponde (Abs(g)
+por g o por -g, etc.). Cada subregión es una integral suave que puede tomar
+los caminos rápidos (polinomio, separable, simetría).
+
+Se admiten superficies de ruptura que dependen de una sola variable (la
+región se corta en planos) y las de dos variables que se pueden despejar de
+forma única en la más interna (p. ej. Abs(x - y): y de 0 a x y de x a 1).
+Las demás funciones no suaves se dejan en el integrando.
+"""
+from itertools import combinations
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import sympy as sp
+
+# Funciones que se sustituyen por una de sus ramas en cada subregión
+NO_SUAVES = (sp.Abs, sp.sign, sp.Heaviside, sp.Max, sp.Min, sp.Piecewise)
+# Subregiones máximas de una partición
+MAX_PIEZAS = 64
+# Pasadas de partición (las funciones anidadas se resuelven de dentro hacia fuera)
+MAX_PASADAS = 4
+
+Limites = Tuple[Tuple[sp.Symbol, Any, Any], ...]
+
+
+class Pieza(NamedTuple):
+    """Subregión de una partición con su integrando suave."""
+    integrando: sp.Expr
+    limites: Limites
+
+
+def _cortes(atomo: sp.Expr) -> Optional[List[sp.Expr]]:
+    """Expresiones g cuyo signo decide la rama de una función no suave (None si no se sabe)."""
+    if isinstance(atomo, (sp.Abs, sp.sign, sp.Heaviside)):
+        return [atomo.args[0]]
+    if isinstance(atomo, (sp.Max, sp.Min)):
+        return [a - b for a, b in combinations(atomo.args, 2)]
+    cortes = []
+    for _, condicion in atomo.args:
+        if condicion in (sp.true, sp.false):
+            continue
+        relaciones = condicion.atoms(sp.core.relational.Relational)
+        if not relaciones:
+            return None
+        cortes += [rel.lhs - rel.rhs for rel in relaciones]
+    return cortes
+
+
+def _es_candidato(atomo: sp.Expr, variables: Sequence[sp.Symbol]) -> bool:
+    """Solo se parten funciones cuyos cortes son suaves, reales y dependen de las variables."""
+    cortes = _cortes(atomo)
+    if not cortes:
+        return False
+    simbolos = set().union(*(sp.sympify(g).free_symbols for g in cortes))
+    return (bool(simbolos & set(variables)) and simbolos <= set(variables)
+            and not any(sp.sympify(g).has(*NO_SUAVES, sp.I) for g in cortes))
+
+
+def _numero(expr: Any) -> float:
+    """Valor en coma flotante de una expresión sin símbolos (ValueError si no es real)."""
+    valor = complex(sp.N(expr))
+    if abs(valor.imag) > 1e-12 * max(1.0, abs(valor.real)):
+        raise ValueError(f"Valor no real: {expr}")
+    return valor.real
+
+
+def _constante(limite: Any) -> bool:
+    return not sp.sympify(limite).free_symbols
+
+
+def _raices(g: sp.Expr, var: sp.Symbol, a: Any, b: Any) -> Optional[List[sp.Expr]]:
+    """Raíces de g en el intervalo abierto (a, b), ordenadas; None si no son un conjunto finito."""
+    try:
+        raices = sp.solveset(g, var, domain=sp.Interval.open(a, b))
+    except (NotImplementedError, ValueError, TypeError):
+        return None
+    if raices is sp.S.EmptySet:
+        return []
+    if not isinstance(raices, sp.FiniteSet):
+        return None
+    try:
+        return sorted(raices, key=_numero)
+    except (TypeError, ValueError):
+        return None
+
+
+def _con_limites(limites: Limites, var: sp.Symbol, lim_inf: Any, lim_sup: Any) -> Limites:
+    return tuple((v, lim_inf, lim_sup) if v == var else (v, i, s) for v, i, s in limites)
+
+
+def _tramos(puntos: List[Any]) -> List[Tuple[Any, Any]]:
+    return list(zip(puntos[:-1], puntos[1:]))
+
+
+def punto_medio(limites: Limites) -> Dict[sp.Symbol, sp.Float]:
+    """Punto interior de una subregión (de la variable más exterior a la más interior)."""
+    punto = {}
+    for var, lim_inf, lim_sup in reversed(limites):
+        a = sp.sympify(lim_inf).xreplace(punto)
+        b = sp.sympify(lim_sup).xreplace(punto)
+        punto[var] = sp.Float((_numero(a) + _numero(b)) / 2)
+    return punto
+
+
+def _dividir(limites: Limites, g: sp.Expr) -> Optional[List[Limites]]:
+    """
+    Divide una región para que g no cambie de signo en ninguna subregión.
+
+    Returns:
+        Lista de subregiones, o None si la superficie g = 0 no es de las admitidas
+    """
+    orden = [lim[0] for lim in limites]
+    dependientes = sorted(g.free_symbols & set(orden), key=orden.index)
+    if not dependientes:
+        return [limites]
+    por_variable = {v: (i, s) for v, i, s in limites}
+    if not all(_constante(lim) for v in dependientes for lim in por_variable[v]):
+        return None
+    if any(_numero(por_variable[v][0]) >= _numero(por_variable[v][1]) for v in dependientes):
+        return None
+
+    if len(dependientes) == 1:
+        # Planos v = raíz
+        v = dependientes[0]
+        a, b = por_variable[v]
+        raices = _raices(g, v, a, b)
+        if raices is None:
+            return None
+        return [_con_limites(limites, v, i, s) for i, s in _tramos([a, *raices, b])]
+
+    if len(dependientes) == 2:
+        # Superficie v = h(u) con v la variable más interna de las dos
+        v, u = dependientes
+        try:
+            soluciones = sp.solve(g, v)
+        except (NotImplementedError, ValueError, TypeError):
+            return None
+        if len(soluciones) != 1 or soluciones[0].has(sp.I):
+            return None
+        h = soluciones[0]
+        (a_v, b_v), (a_u, b_u) = por_variable[v], por_variable[u]
+        try:
+            continua = sp.calculus.util.continuous_domain(h, u, sp.Interval(a_u, b_u))
+        except (NotImplementedError, ValueError, TypeError):
+            return None
+        if continua != sp.Interval(a_u, b_u):
+            return None
+        # La superficie entra o sale de la región donde h cruza los límites de v
+        cruces = []
+        for borde in (a_v, b_v):
+            raices = _raices(h - borde, u, a_u, b_u)
+            if raices is None:
+                return None
+            cruces += raices
+        cruces = sorted(set(cruces), key=_numero)
+
+        regiones = []
+        for i, s in _tramos([a_u, *cruces, b_u]):
+            region = _con_limites(limites, u, i, s)
+            h_medio = _numero(h.xreplace({u: (i + s) / 2}))
+            if _numero(a_v) < h_medio < _numero(b_v):
+                regiones += [_con_limites(region, v, a_v, h), _con_limites(region, v, h, b_v)]
+            else:
+                regiones.append(region)
+        return regiones
+    return None
+
+
+def _rama(atomo: sp.Expr, punto: Dict[sp.Symbol, sp.Float]) -> sp.Expr:
+    """Forma suave de una función no suave en la subregión que contiene el punto."""
+    if isinstance(atomo, sp.Piecewise):
+        for expr, condicion in atomo.args:
+            if condicion == sp.true or condicion.xreplace(punto) == sp.true:
+                return expr
+        return sp.nan
+    if isinstance(atomo, (sp.Max, sp.Min)):
+        valores = [_numero(a.xreplace(punto)) for a in atomo.args]
+        elegido = max(valores) if isinstance(atomo, sp.Max) else min(valores)
+        return atomo.args[valores.index(elegido)]
+    g = atomo.args[0]
+    signo = _numero(g.xreplace(punto))
+    signo = (signo > 0) - (signo < 0)
+    if isinstance(atomo, sp.Abs):
+        return signo * g
+    if isinstance(atomo, sp.sign):
+        return sp.Integer(signo)
+    return sp.Integer(1) if signo > 0 else sp.Integer(0) if signo < 0 else sp.S.Half
+
+
+def _particionar_pieza(pieza: Pieza, variables: Sequence[sp.Symbol]) -> Optional[List[Pieza]]:
+    """Una pasada de partición sobre una pieza; None si no se pudo resolver ninguna función."""
+    atomos = sorted(
+        (a for a in pieza.integrando.atoms(*NO_SUAVES) if _es_candidato(a, variables)),
+        key=sp.default_sort_key
+    )
+    regiones = [pieza.limites]
+    resueltos = []
+    for atomo in atomos:
+        nuevas = regiones
+        try:
+            for g in _cortes(atomo):
+                divididas = [_dividir(region, sp.sympify(g)) for region in nuevas]
+                if any(d is None for d in divididas):
+                    nuevas = None
+                    break
+                nuevas = [r for d in divididas for r in d]
+        except (TypeError, ValueError):
+            nuevas = None
+        if nuevas is None or len(nuevas) > MAX_PIEZAS:
+            continue
+        regiones = nuevas
+        resueltos.append(atomo)
+    if not resueltos:
+        return None
+
+    piezas = []
+    for region in regiones:
+        punto = punto_medio(region)
+        ramas = {atomo: _rama(atomo, punto) for atomo in resueltos}
+        piezas.append(Pieza(pieza.integrando.xreplace(ramas), region))
+    return piezas
+
+
+def particionar(func: sp.Expr, *limites: Tuple[sp.Symbol, Any, Any]) -> List[Pieza]:
+    """
+    Divide la región de integración en subregiones donde el integrando es suave.
+
+    Args:
+        func: Integrando
+        *limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada
+
+    Returns:
+        Lista de piezas cuya suma de integrales es la integral pedida; una
+        sola pieza con el integrando original si no hay nada que partir
+    """
+    func = sp.sympify(func)
+    limites = tuple(tuple(lim) for lim in limites)
+    piezas = [Pieza(func, limites)]
+    if not func.has(*NO_SUAVES):
+        return piezas
+    variables = [lim[0] for lim in limites]
+
+    for _ in range(MAX_PASADAS):
+        nuevas = []
+        for pieza in piezas:
+            divididas = _particionar_pieza(pieza, variables)
+            nuevas.extend(divididas if divididas is not None else [pieza])
+        if nuevas == piezas or len(nuevas) > MAX_PIEZAS:
+            break
+        piezas = nuevas
+    # Las subregiones con integrando nulo no aportan nada
+    no_nulas = [pieza for pieza in piezas if pieza.integrando != 0]
+    return no_nulas or [Pieza(sp.S.Zero, limites)]
@@ -0,0 +1,214 @@
+"""
+Módulo de integración exacta de polinomios sobre cajas y regiones estándar.
+
+El integrando se convierte en un Poly y cada monomio x^a·y^b·z^c se integra
+con su fórmula cerrada, sin pasar por sp.integrate:
+
+- Caja: producto de (b^(k+1) - a^(k+1))/(k+1) por variable.
+- Disco y bola: los momentos son cocientes de funciones Gamma que, para
+  exponentes pares, se reducen a dobles factoriales (los impares se anulan
+  por simetría). Así el resultado es un racional exacto multiplicado por π.
+- Elipsoide: cambio x = a·u, y = b·v, z = c·w sobre la bola unidad, con
+  jacobiano a·b·c (el mismo que usa teorema_divergencia).
+"""
+from math import prod
+from typing import Any, Optional, Sequence, Tuple
+
+import sympy as sp
+
+# Variables cartesianas por defecto (coinciden con las de integrales.py)
+x, y, z = sp.symbols('x y z', real=True)
+
+
+def como_polinomio(expr: sp.Expr, variables: Sequence[sp.Symbol]) -> Optional[sp.Poly]:
+    """
+    Convierte una expresión en un Poly sobre las variables indicadas.
+
+    Returns:
+        El polinomio, o None si la expresión no es polinómica en esas variables
+        (los demás símbolos se admiten como coeficientes)
+    """
+    expr = sp.sympify(expr)
+    if not expr.is_polynomial(*variables):
+        return None
+    try:
+        return sp.Poly(expr, *variables)
+    except sp.PolynomialError:
+        return None
+
+
+def _exigir_polinomio(expr: sp.Expr, variables: Sequence[sp.Symbol]) -> sp.Poly:
+    polinomio = como_polinomio(expr, variables)
+    if polinomio is None:
+        raise ValueError(f"La función no es polinómica en {', '.join(map(str, variables))}")
+    return polinomio
+
+
+def _trasladar(expr: sp.Expr, variables: Sequence[sp.Symbol], centro: Sequence[Any]) -> sp.Expr:
+    """Expresa la función respecto al centro de la región (x -> x + x0, ...)."""
+    cambios = {var: var + c for var, c in zip(variables, centro) if c != 0}
+    return sp.sympify(expr).xreplace(cambios) if cambios else expr
+
+
+def _doble_factorial(k: int) -> int:
+    """k!! con la convención (-1)!! = 0!! = 1."""
+    return prod(range(k, 0, -2))
+
+
+def _potencias_integradas(lim_inf: Any, lim_sup: Any, grado: int) -> list:
+    """Lista de ∫ t^k dt en [lim_inf, lim_sup] para k = 0..grado."""
+    a, b = sp.sympify(lim_inf), sp.sympify(lim_sup)
+    return [(b**(k + 1) - a**(k + 1)) / (k + 1) for k in range(grado + 1)]
+
+
+def _momento_disco(a: int, b: int) -> sp.Rational:
+    """∫ x^a·y^b sobre el disco unidad, dividido entre π."""
+    if a % 2 or b % 2:
+        return sp.S.Zero
+    n = a + b
+    return sp.Rational(
+        2 * _doble_factorial(a - 1) * _doble_factorial(b - 1),
+        (n + 2) * _doble_factorial(n)
+    )
+
+
+def _momento_bola(a: int, b: int, c: int) -> sp.Rational:
+    """∫ x^a·y^b·z^c sobre la bola unidad, dividido entre π."""
+    if a % 2 or b % 2 or c % 2:
+        return sp.S.Zero
+    n = a + b + c
+    return sp.Rational(
+        4 * _doble_factorial(a - 1) * _doble_factorial(b - 1) * _doble_factorial(c - 1),
+        (n + 3) * _doble_factorial(n + 1)
+    )
+
+
+def integrar_polinomio_caja(expr: sp.Expr, *limites: Tuple[sp.Symbol, Any, Any]) -> sp.Expr:
+    """
+    Integra un polinomio sobre una caja, monomio a monomio.
+
+    Args:
+        expr: Polinomio a integrar
+        *limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada;
+            los límites no pueden depender de las variables de integración
+
+    Returns:
+        Resultado exacto de la integral
+
+    Raises:
+        ValueError: Si la función no es polinómica o los límites no forman una caja
+    """
+    variables = [lim[0] for lim in limites]
+    for _, lim_inf, lim_sup in limites:
+        if (sp.sympify(lim_inf).free_symbols | sp.sympify(lim_sup).free_symbols) & set(variables):
+            raise ValueError("Los límites no forman una caja")
+    polinomio = _exigir_polinomio(expr, variables)
+    # El polinomio nulo tiene grado -oo: no hay tablas de potencias que construir
+    if polinomio.is_zero:
+        return sp.S.Zero
+
+    grados = polinomio.degree_list()
+    tablas = [
+        _potencias_integradas(lim_inf, lim_sup, grado)
+        for (_, lim_inf, lim_sup), grado in zip(limites, grados)
+    ]
+    total = sp.S.Zero
+    for exponentes, coeficiente in polinomio.terms():
+        total += coeficiente * prod((tabla[k] for tabla, k in zip(tablas, exponentes)), start=sp.S.One)
+    return total
+
+
+def integrar_polinomio_cilindro(
+    expr: sp.Expr,
+    radio: Any,
+    z_lim: Tuple[Any, Any],
+    centro: Tuple[Any, Any] = (0, 0),
+    variables: Tuple[sp.Symbol, sp.Symbol, sp.Symbol] = (x, y, z)
+) -> sp.Expr:
+    """
+    Integra un polinomio sobre un cilindro de eje paralelo a z.
+
+    Args:
+        expr: Polinomio en coordenadas cartesianas
+        radio: Radio del cilindro
+        z_lim: Límites (z_min, z_max) de la altura
+        centro: Centro (x0, y0) de la base
+        variables: Símbolos (x, y, z) del polinomio
+
+    Returns:
+        Resultado exacto de la integral
+
+    Raises:
+        ValueError: Si la función no es polinómica
+    """
+    polinomio = _exigir_polinomio(_trasladar(expr, variables[:2], centro), variables)
+    if polinomio.is_zero:
+        return sp.S.Zero
+    radio = sp.sympify(radio)
+    alturas = _potencias_integradas(*z_lim, polinomio.degree(variables[2]))
+
+    total = sp.S.Zero
+    for (a, b, c), coeficiente in polinomio.terms():
+        momento = _momento_disco(a, b)
+        if momento:
+            total += coeficiente * momento * radio**(a + b + 2) * alturas[c]
+    return sp.pi * total
+
+
+def integrar_polinomio_elipsoide(
+    expr: sp.Expr,
+    semiejes: Tuple[Any, Any, Any],
+    centro: Tuple[Any, Any, Any] = (0, 0, 0),
+    variables: Tuple[sp.Symbol, sp.Symbol, sp.Symbol] = (x, y, z)
+) -> sp.Expr:
+    """
+    Integra un polinomio sobre el elipsoide ((x-x0)/a)² + ((y-y0)/b)² + ((z-z0)/c)² ≤ 1.
+
+    Args:
+        expr: Polinomio en coordenadas cartesianas
+        semiejes: Semiejes (a, b, c)
+        centro: Centro (x0, y0, z0)
+        variables: Símbolos (x, y, z) del polinomio
+
+    Returns:
+        Resultado exacto de la integral
+
+    Raises:
+        ValueError: Si la función no es polinómica
+    """
+    polinomio = _exigir_polinomio(_trasladar(expr, variables, centro), variables)
+    if polinomio.is_zero:
+        return sp.S.Zero
+    a_eje, b_eje, c_eje = (sp.sympify(s) for s in semiejes)
+
+    total = sp.S.Zero
+    for (a, b, c), coeficiente in polinomio.terms():
+        momento = _momento_bola(a, b, c)
+        if momento:
+            # x^a·y^b·z^c = a^a·b^b·c^c·u^a·v^b·w^c y dV = a·b·c·dU
+            total += coeficiente * momento * a_eje**(a + 1) * b_eje**(b + 1) * c_eje**(c + 1)
+    return sp.pi * total
+
+
+def integrar_polinomio_esfera(
+    expr: sp.Expr,
+    radio: Any,
+    centro: Tuple[Any, Any, Any] = (0, 0, 0),
+    variables: Tuple[sp.Symbol, sp.Symbol, sp.Symbol] = (x, y, z)
+) -> sp.Expr:
+    """
+    Integra un polinomio sobre una bola (el elipsoide con los tres semiejes iguales).
+
+    Args:
+        expr: Polinomio en coordenadas cartesianas
+        radio: Radio de la bola
+        centro: Centro (x0, y0, z0)
+        variables: Símbolos (x, y, z) del polinomio
+
+    Returns:
+        Resultado exacto de la integral
+
+    Raises:
+        ValueError: Si la función no es polinómica
+    """
+    return integrar_polinomio_elipsoide(expr, (radio, radio, radio), centro, variables)
@@ -0,0 +1,336 @@
+"""
+Módulo de portafolio de estrategias de integración simbólica.
+
+El orden de integración y el algoritmo de sp.integrate influyen mucho en el
+tiempo que tarda SymPy: una misma integral puede resolverse en milisegundos
+en un orden y no terminar en otro. El portafolio lanza varias estrategias
+(órdenes permutados y los métodos 'meijerg', 'risch' y 'manual') en procesos
+trabajadores distintos, se queda con la primera respuesta válida y cancela
+las demás. Las victorias de cada estrategia se guardan en la caché para que
+las ejecuciones siguientes empiecen por las que mejor funcionan.
+
+Si el integrando no es suave (Abs, Max, Piecewise...), se usa la partición
+del dominio: cada subregión se integra en su propio trabajador y el
+resultado es la suma. Si la partición elimina todas las funciones no
+suaves, no se lanza ninguna otra estrategia: sp.integrate sobre Abs o Max
+con símbolos sin supuestos da a veces resultados erróneos que la
+verificación numérica, imprecisa en integrandos no suaves, no detecta.
+"""
+import threading
+from concurrent.futures import CancelledError
+from itertools import permutations
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import sympy as sp
+
+from calculadora_calculo.calculos.cache import clave_canonica, obtener_cache
+from calculadora_calculo.calculos.cubatura import integrar_gauss_legendre
+from calculadora_calculo.calculos.integrales import integrar_iterada
+from calculadora_calculo.calculos.particion import NO_SUAVES, Pieza, particionar
+from calculadora_calculo.calculos.trabajos import FuturoTrabajo, PoolTrabajos, reportar_etapa
+
+# Algoritmos de sp.integrate (None es el comportamiento por defecto)
+METODOS = (None, 'meijerg', 'risch', 'manual')
+# Estrategias que se lanzan a la vez
+MAX_ESTRATEGIAS = 6
+# Clave de la caché con el recuento de victorias de cada estrategia
+CLAVE_VICTORIAS = clave_canonica('portafolio.victorias')
+# Tolerancia relativa al contrastar la forma cerrada con la estimación numérica
+TOLERANCIA_VERIFICACION = 1e-6
+
+
+class Estrategia(NamedTuple):
+    """Orden de integración (de la variable más interna a la más externa) y método de sp.integrate."""
+    orden: Tuple[str, ...]
+    metodo: Optional[str] = None
+
+    def describir(self) -> str:
+        """Descripción legible, p. ej. 'dz dy dx (meijerg)'."""
+        diferenciales = " ".join(f"d{var}" for var in self.orden)
+        return f"{diferenciales} ({self.metodo or 'predeterminado'})"
+
+
+def _es_caja(limites: Sequence[Tuple[sp.Symbol, Any, Any]]) -> bool:
+    """Indica si ningún límite depende de las variables de integración (el orden es libre)."""
+    variables = {lim[0] for lim in limites}
+    return not any(
+        (sp.sympify(lim_inf).free_symbols | sp.sympify(lim_sup).free_symbols) & variables
+        for _, lim_inf, lim_sup in limites
+    )
+
+
+def estrategias_posibles(limites: Sequence[Tuple[sp.Symbol, Any, Any]]) -> List[Estrategia]:
+    """
+    Enumera las estrategias aplicables a una integral iterada.
+
+    Solo se permutan los órdenes si los límites forman una caja. La lista
+    empieza por el orden dado con cada método y sigue con los demás órdenes.
+
+    Args:
+        limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada
+
+    Returns:
+        Lista de estrategias en orden de preferencia por defecto
+    """
+    original = tuple(str(lim[0]) for lim in limites)
+    ordenes = [original]
+    if _es_caja(limites):
+        ordenes += [orden for orden in permutations(original) if orden != original]
+    return (
+        [Estrategia(original, metodo) for metodo in METODOS]
+        + [Estrategia(orden, None) for orden in ordenes[1:]]
+        + [Estrategia(orden, metodo) for orden in ordenes[1:] for metodo in METODOS[1:]]
+    )
+
+
+def victorias() -> Dict[Estrategia, int]:
+    """Recuento de victorias de cada estrategia guardado en la caché."""
+    encontrado, valor = obtener_cache().obtener(CLAVE_VICTORIAS)
+    return dict(valor) if encontrado else {}
+
+
+def registrar_victoria(estrategia: Estrategia) -> None:
+    """Suma una victoria a una estrategia."""
+    recuento = victorias()
+    recuento[estrategia] = recuento.get(estrategia, 0) + 1
+    obtener_cache().guardar(CLAVE_VICTORIAS, recuento)
+
+
+def ordenar_estrategias(estrategias: List[Estrategia]) -> List[Estrategia]:
+    """Ordena las estrategias por victorias registradas, conservando el orden por defecto en los empates."""
+    recuento = victorias()
+    return sorted(estrategias, key=lambda e: -recuento.get(e, 0))
+
+
+def _verificar(func: sp.Expr, limites: List[Tuple[sp.Symbol, Any, Any]], resultado: sp.Expr) -> None:
+    """
+    Contrasta un resultado numérico con una estimación de Gauss-Legendre.
+
+    Solo se aplica sobre cajas con límites numéricos y si la estimación es
+    fiable; un desacuerdo indica un resultado incorrecto de sp.integrate.
+
+    Raises:
+        ValueError: Si la forma cerrada no coincide con la estimación
+    """
+    if resultado.free_symbols or not _es_caja(limites):
+        return
+    if any(sp.sympify(lim).free_symbols for _, lim_inf, lim_sup in limites for lim in (lim_inf, lim_sup)):
+        return
+    try:
+        estimacion = integrar_gauss_legendre(func, *limites)
+    except (TypeError, ValueError):
+        return
+    escala = max(1.0, abs(estimacion.valor))
+    if estimacion.error_estimado > TOLERANCIA_VERIFICACION * escala:
+        return
+    if abs(complex(sp.N(resultado)) - estimacion.valor) > 10 * TOLERANCIA_VERIFICACION * escala:
+        raise ValueError("La forma cerrada no coincide con la estimación numérica")
+
+
+def integrar_con_estrategia(
+    func: sp.Expr,
+    limites: List[Tuple[sp.Symbol, Any, Any]],
+    estrategia: Estrategia
+) -> sp.Expr:
+    """
+    Calcula una integral iterada con un orden y un método concretos.
+
+    Se ejecuta en un proceso trabajador del portafolio.
+
+    Args:
+        func: Integrando
+        limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada
+        estrategia: Orden y método a usar
+
+    Returns:
+        Resultado en forma cerrada
+
+    Raises:
+        ValueError: Si el resultado conserva integrales sin evaluar, no es
+            finito o no coincide con la estimación numérica
+    """
+    por_nombre = {str(lim[0]): lim for lim in limites}
+    opciones = {estrategia.metodo: True} if estrategia.metodo else {}
+
+    resultado = func
+    for nombre in estrategia.orden:
+        var, lim_inf, lim_sup = por_nombre[nombre]
+        reportar_etapa(f"integración respecto a {var} ({estrategia.metodo or 'predeterminado'})")
+        if estrategia.metodo == 'risch':
+            # Risch solo calcula primitivas: se evalúa la primitiva en los extremos
+            primitiva = sp.integrate(resultado, var, **opciones)
+            if primitiva.has(sp.Integral):
+                raise ValueError(f"Sin primitiva elemental respecto a {var}")
+            resultado = primitiva.subs(var, lim_sup) - primitiva.subs(var, lim_inf)
+        else:
+            resultado = sp.integrate(resultado, (var, lim_inf, lim_sup), **opciones)
+
+    if resultado.has(sp.Integral) or resultado.has(sp.nan, sp.zoo, sp.oo, -sp.oo):
+        raise ValueError(f"Sin forma cerrada con {estrategia.describir()}")
+    reportar_etapa("verificación numérica")
+    _verificar(func, list(limites), resultado)
+    return resultado
+
+
+class FuturoPortafolio(FuturoTrabajo):
+    """
+    Futuro de un portafolio: se resuelve con la primera respuesta válida.
+
+    Cancelarlo cancela todas las estrategias en curso. El atributo 'estrategia'
+    indica la estrategia ganadora (None si el resultado vino de la caché).
+    """
+
+    def __init__(self, id_trabajo: int):
+        super().__init__(id_trabajo)
+        self.estrategia = None
+        self.trabajos = []
+
+    def cancel(self) -> bool:
+        cancelado = super().cancel()
+        for trabajo in self.trabajos:
+            trabajo.cancel()
+        return cancelado
+
+
+def enviar_piezas(
+    pool: PoolTrabajos,
+    piezas: Sequence[Pieza],
+    limite_tiempo: Optional[float] = None
+) -> FuturoPortafolio:
+    """
+    Integra las subregiones de una partición en paralelo, cada una en un trabajo.
+
+    Debe llamarse desde el proceso principal.
+
+    Args:
+        pool: Pool de procesos trabajadores
+        piezas: Subregiones de particion.particionar
+        limite_tiempo: Segundos máximos por etapa de cada subregión
+
+    Returns:
+        Futuro que se resuelve con la suma de las integrales, o con un
+        ValueError si alguna subregión falla o no tiene forma cerrada
+    """
+    total = FuturoPortafolio(pool.reservar_id())
+    candado = threading.Lock()
+    resultados = {}
+
+    def al_terminar(trabajo: FuturoTrabajo, indice: int) -> None:
+        with candado:
+            if total.done():
+                return
+            if trabajo.cancelled() or isinstance(trabajo.exception(), CancelledError):
+                error = "cancelada"
+            else:
+                error = trabajo.exception()
+            if error is None and trabajo.result().has(sp.Integral):
+                error = "sin forma cerrada"
+            if error is None:
+                resultados[indice] = trabajo.result()
+                if len(resultados) == len(piezas):
+                    total.set_result(sp.Add(*(resultados[i] for i in range(len(piezas)))))
+                return
+            total.set_exception(ValueError(f"Subregión {indice + 1}: {error}"))
+        # Fuera del candado: sin esta subregión la suma no sirve
+        for otro in total.trabajos:
+            otro.cancel()
+
+    for indice, pieza in enumerate(piezas):
+        trabajo = pool.enviar(integrar_iterada, pieza.integrando, *pieza.limites, limite_tiempo=limite_tiempo)
+        total.trabajos.append(trabajo)
+        trabajo.add_done_callback(lambda t, i=indice: al_terminar(t, i))
+    return total
+
+
+def ejecutar_portafolio(
+    pool: PoolTrabajos,
+    func: sp.Expr,
+    *limites: Tuple[sp.Symbol, Any, Any],
+    max_estrategias: int = MAX_ESTRATEGIAS,
+    limite_tiempo: Optional[float] = None
+) -> FuturoPortafolio:
+    """
+    Lanza varias estrategias de integración en paralelo y se queda con la primera válida.
+
+    Primero se consulta la caché; si la integral ya se resolvió, el futuro se
+    devuelve resuelto. Si no, se envían al pool las estrategias con más
+    victorias registradas y, si el integrando no es suave, las subregiones de
+    su partición (ver enviar_piezas; solo ellas si la partición deja todas
+    las subregiones suaves). Cuando una termina con una respuesta válida, el
+    resultado se guarda en la caché, se registra su victoria y se cancelan las
+    demás. Si todas fallan, el futuro recibe un ValueError.
+
+    Debe llamarse desde el proceso principal (los trabajadores no pueden crear
+    procesos).
+
+    Args:
+        pool: Pool de procesos trabajadores
+        func: Integrando (con el jacobiano incluido)
+        *limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada
+        max_estrategias: Número de estrategias lanzadas
+        limite_tiempo: Segundos máximos por etapa de cada estrategia
+
+    Returns:
+        FuturoPortafolio con el resultado simbólico
+    """
+    portafolio = FuturoPortafolio(pool.reservar_id())
+    limites = [tuple(lim) for lim in limites]
+    cache = obtener_cache()
+    try:
+        clave = clave_canonica('portafolio', func, limites)
+    except TypeError:
+        clave = None
+    if clave is not None:
+        encontrado, valor = cache.obtener(clave)
+        if encontrado:
+            portafolio.set_result(valor)
+            return portafolio
+
+    estrategias = ordenar_estrategias(estrategias_posibles(limites))[:max_estrategias]
+    piezas = particionar(func, *limites)
+    particion = Estrategia(estrategias[0].orden, 'partición') if len(piezas) > 1 else None
+    if particion is not None and not any(pieza.integrando.has(*NO_SUAVES) for pieza in piezas):
+        estrategias = []
+    competidores = len(estrategias) + (particion is not None)
+    candado = threading.Lock()
+    fallos = []
+
+    def al_terminar(trabajo: FuturoTrabajo, estrategia: Estrategia) -> None:
+        with candado:
+            if portafolio.done():
+                return
+            if trabajo.cancelled() or isinstance(trabajo.exception(), CancelledError):
+                error = "cancelada"
+            else:
+                error = trabajo.exception()
+            if error is not None:
+                fallos.append(f"{estrategia.describir()}: {error}")
+                if len(fallos) == competidores:
+                    portafolio.set_exception(ValueError(
+                        "Ninguna estrategia obtuvo una forma cerrada válida:\n" + "\n".join(fallos)
+                    ))
+                return
+            resultado = trabajo.result()
+            portafolio.estrategia = estrategia
+            portafolio.set_result(resultado)
+
+        # Fuera del candado: cancelar las demás y recordar la ganadora
+        for otro in portafolio.trabajos:
+            if otro is not trabajo:
+                otro.cancel()
+        if estrategia is not particion:
+            registrar_victoria(estrategia)
+        if clave is not None:
+            cache.guardar(clave, resultado)
+
+    for estrategia in estrategias:
+        trabajo = pool.enviar(
+            integrar_con_estrategia, func, limites, estrategia, limite_tiempo=limite_tiempo
+        )
+        portafolio.trabajos.append(trabajo)
+        trabajo.add_done_callback(lambda t, e=estrategia: al_terminar(t, e))
+    if particion is not None:
+        trabajo = enviar_piezas(pool, piezas, limite_tiempo=limite_tiempo)
+        portafolio.trabajos.append(trabajo)
+        trabajo.add_done_callback(lambda t: al_terminar(t, particion))
+    return portafolio
@@ -0,0 +1,285 @@
+"""
+Módulo de evaluación numérica de alta precisión con mpmath.
+
+Para contrastar las formas cerradas de calcular_integral_triple o
+teorema_divergencia hacen falta 30-50 cifras correctas, muy por encima de la
+doble precisión de los motores de cubatura. Aquí la integral iterada se
+calcula con cuadratura tanh-sinh de mpmath a la precisión pedida:
+
+- La variable exterior usa los nodos de tanh-sinh por niveles (cada nivel
+  reutiliza la suma del anterior) y el error se estima como en mp.quad.
+- En cada nodo exterior, las variables interiores se integran con mp.quad
+  anidado. La cuadratura de mpmath usa un solo hilo, así que los nodos de
+  cada nivel se reparten entre los procesos de un PoolTrabajos.
+"""
+import math
+import time
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+import mpmath
+import sympy as sp
+from mpmath.calculus.quadrature import TanhSinh
+
+from calculadora_calculo.calculos.trabajos import PoolTrabajos, reportar_etapa
+
+# Cifras adicionales con las que se trabaja para que las pedidas sean correctas
+DIGITOS_GUARDA = 10
+# Bits adicionales de las sumas de la cuadratura (como en mp.quad)
+BITS_EXTRA = 20
+# Precisión por defecto (cifras decimales)
+DIGITOS_POR_DEFECTO = 30
+
+
+class ResultadoPrecision(NamedTuple):
+    """Resultado de una integral de alta precisión."""
+    valor: mpmath.mpf
+    error_estimado: mpmath.mpf
+    digitos: int
+    evaluaciones: int
+    metodo: str
+
+    @property
+    def digitos_correctos(self) -> int:
+        """Cifras significativas garantizadas por la estimación de error (como mucho las pedidas)."""
+        if self.error_estimado == 0:
+            return self.digitos
+        escala = max(abs(self.valor), mpmath.mpf(1))
+        return max(0, min(self.digitos, int(-mpmath.log10(self.error_estimado / escala))))
+
+
+class FilaComparacion(NamedTuple):
+    """Tiempo hasta d cifras por la vía de alta precisión y por la simbólica."""
+    digitos: int
+    segundos_precision: float
+    segundos_simbolico: float
+    digitos_coincidentes: int
+    digitos_estimados: int
+
+    def describir(self) -> str:
+        return (f"{self.digitos} cifras: mpmath {self.segundos_precision:.2f} s "
+                f"({self.digitos_estimados} cifras según el error estimado), "
+                f"simbólico {self.segundos_simbolico:.2f} s, "
+                f"{self.digitos_coincidentes} cifras coincidentes")
+
+
+def _compilar(func: sp.Expr, limites: Sequence[Tuple[sp.Symbol, Any, Any]]):
+    """
+    Compila el integrando y los límites para mpmath.
+
+    Returns:
+        (f, limites) con f(*valores) de la variable más exterior a la más
+        interior y, para cada variable en ese orden, (inferior, superior)
+        como funciones de las variables exteriores
+    """
+    exteriores = [lim[0] for lim in reversed(limites)]
+    f = sp.lambdify(exteriores, func, modules='mpmath')
+    compilados = []
+    for j, (_, lim_inf, lim_sup) in enumerate(reversed(limites)):
+        compilados.append(tuple(
+            sp.lambdify(exteriores[:j], sp.sympify(lim), modules='mpmath') for lim in (lim_inf, lim_sup)
+        ))
+    return f, compilados
+
+
+def _integral_interior(f, limites, valores: list) -> Tuple[mpmath.mpf, mpmath.mpf]:
+    """Integra respecto a las variables que faltan (mp.quad anidado); devuelve (valor, error)."""
+    j = len(valores)
+    if j == len(limites):
+        return f(*valores), mpmath.mpf(0)
+    lim_inf, lim_sup = limites[j]
+    a, b = lim_inf(*valores), lim_sup(*valores)
+    if j == len(limites) - 1:
+        return mpmath.quad(lambda t: f(*valores, t), [a, b], error=True)
+    return mpmath.quad(lambda t: _integral_interior(f, limites, valores + [t])[0], [a, b], error=True)
+
+
+def evaluar_nodos(
+    func: sp.Expr,
+    limites: List[Tuple[sp.Symbol, Any, Any]],
+    nodos: List[mpmath.mpf],
+    bits: int
+) -> List[Tuple[mpmath.mpf, mpmath.mpf]]:
+    """
+    Integral respecto a todas las variables salvo la exterior, en varios valores de esta.
+
+    Se ejecuta en un proceso trabajador.
+
+    Args:
+        func: Integrando
+        limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada; la
+            última es la variable exterior, cuyos valores son los nodos
+        nodos: Valores de la variable exterior
+        bits: Precisión de trabajo en bits
+
+    Returns:
+        Lista de (valor, error estimado) por nodo
+    """
+    with mpmath.workprec(bits):
+        f, compilados = _compilar(func, limites)
+        return [_integral_interior(f, compilados, [x]) for x in nodos]
+
+
+def _evaluar(func, limites, nodos, bits, pool: Optional[PoolTrabajos]) -> list:
+    """Reparte los nodos exteriores entre los procesos del pool (o los evalúa aquí)."""
+    if pool is None:
+        return evaluar_nodos(func, limites, nodos, bits)
+    tamano = math.ceil(len(nodos) / pool.max_trabajadores)
+    futuros = [
+        pool.enviar(evaluar_nodos, func, limites, nodos[i:i + tamano], bits)
+        for i in range(0, len(nodos), tamano)
+    ]
+    return [valor for futuro in futuros for valor in futuro.result()]
+
+
+def integrar_precision(
+    func: sp.Expr,
+    *limites: Tuple[sp.Symbol, Any, Any],
+    digitos: int = DIGITOS_POR_DEFECTO,
+    pool: Optional[PoolTrabajos] = None,
+    max_grado: Optional[int] = None
+) -> ResultadoPrecision:
+    """
+    Integral iterada con precisión arbitraria (tanh-sinh de mpmath).
+
+    Con un pool, debe llamarse desde el proceso principal (los trabajadores
+    no pueden crear procesos); sin él, los nodos se evalúan en el proceso
+    actual.
+
+    Args:
+        func: Integrando (con el jacobiano incluido)
+        *limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada;
+            los límites interiores pueden depender de las variables exteriores
+        digitos: Cifras significativas pedidas
+        pool: Pool de procesos entre los que se reparten los nodos exteriores
+        max_grado: Niveles máximos de tanh-sinh (por defecto, el de mp.quad)
+
+    Returns:
+        ResultadoPrecision con el valor y su error estimado
+
+    Raises:
+        ValueError: Si los límites exteriores no son numéricos o el
+            integrando tiene símbolos sin límites
+    """
+    variables = {lim[0] for lim in limites}
+    libres = sp.sympify(func).free_symbols - variables
+    if libres:
+        raise ValueError(f"El integrando tiene símbolos sin límites: {', '.join(sorted(map(str, libres)))}")
+    var, lim_inf, lim_sup = limites[-1]
+    if sp.sympify(lim_inf).free_symbols or sp.sympify(lim_sup).free_symbols:
+        raise ValueError(f"Los límites de {var} (variable exterior) deben ser numéricos")
+
+    trabajo = digitos + DIGITOS_GUARDA
+    interiores = list(limites)
+    with mpmath.workdps(trabajo), mpmath.extraprec(BITS_EXTRA):
+        # Como en mp.quad: los nodos se calculan a la precisión de trabajo y las
+        # sumas con bits adicionales (los nodos junto a los extremos no se
+        # confunden con ellos, ni siquiera con singularidades en los extremos)
+        regla = TanhSinh(mpmath.mp)
+        prec = mpmath.mp.prec - BITS_EXTRA
+        a = mpmath.mpf(str(sp.N(lim_inf, trabajo)))
+        b = mpmath.mpf(str(sp.N(lim_sup, trabajo)))
+        tolerancia = mpmath.mpf(10) ** (-digitos)
+        max_grado = max_grado or regla.guess_degree(prec)
+
+        resultados = []
+        error = mpmath.mpf(1)
+        error_interior = mpmath.mpf(0)
+        evaluaciones = 0
+        for grado in range(1, max_grado + 1):
+            reportar_etapa(f"cuadratura tanh-sinh de grado {grado}")
+            nodos = regla.get_nodes(a, b, grado, prec)
+            valores = _evaluar(func, interiores, [x for x, _ in nodos], mpmath.mp.prec, pool)
+            evaluaciones += len(nodos)
+
+            # Igual que TanhSinh.sum_next: los nodos del nivel anterior se reutilizan
+            h = mpmath.ldexp(1, -grado)
+            suma = resultados[-1] / (2 * h) if resultados else mpmath.mpf(0)
+            suma += mpmath.fdot((w, v) for (_, w), (v, _) in zip(nodos, valores))
+            error_interior += mpmath.fsum(abs(w) * e for (_, w), (_, e) in zip(nodos, valores))
+            resultados.append(h * suma)
+
+            if len(resultados) >= 2:
+                error = regla.estimate_error(resultados, prec, mpmath.eps)
+                if error <= tolerancia * max(abs(resultados[-1]), 1):
+                    break
+
+        return ResultadoPrecision(
+            valor=resultados[-1],
+            error_estimado=error + h * error_interior,
+            digitos=digitos,
+            evaluaciones=evaluaciones,
+            metodo=f"tanh-sinh de mpmath ({digitos} cifras, grado {grado})",
+        )
+
+
+def digitos_coincidentes(forma_cerrada: sp.Expr, resultado: ResultadoPrecision) -> int:
+    """
+    Cifras significativas en que una forma cerrada coincide con un resultado de alta precisión.
+
+    Args:
+        forma_cerrada: Resultado simbólico (p. ej. de calcular_integral_triple)
+        resultado: Resultado de integrar_precision
+
+    Returns:
+        Número de cifras coincidentes (como mucho las pedidas en el resultado)
+    """
+    trabajo = resultado.digitos + DIGITOS_GUARDA
+    with mpmath.workdps(trabajo):
+        exacto = mpmath.mpmathify(str(sp.N(forma_cerrada, trabajo)))
+        diferencia = abs(exacto - resultado.valor)
+        if diferencia == 0:
+            return resultado.digitos
+        escala = max(abs(exacto), mpmath.mpf(1))
+        return max(0, min(resultado.digitos, int(-mpmath.log10(diferencia / escala))))
+
+
+def comparar_tiempo_digitos(
+    func: sp.Expr,
+    *limites: Tuple[sp.Symbol, Any, Any],
+    digitos: Sequence[int] = (15, 30, 50),
+    pool: Optional[PoolTrabajos] = None
+) -> List[FilaComparacion]:
+    """
+    Compara el tiempo hasta d cifras de la vía de alta precisión y de la simbólica.
+
+    La vía simbólica integra con sp.integrate (sin cachés) y evalúa la forma
+    cerrada con sp.N a cada precisión; su tiempo incluye la integración.
+
+    Args:
+        func: Integrando
+        *limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada
+        digitos: Precisiones a comparar
+        pool: Pool de procesos para integrar_precision
+
+    Returns:
+        Una fila por precisión
+
+    Raises:
+        ValueError: Si la vía simbólica no llega a una forma cerrada
+    """
+    inicio = time.perf_counter()
+    forma = func
+    for var, lim_inf, lim_sup in limites:
+        forma = sp.integrate(forma, (var, lim_inf, lim_sup))
+    if forma.has(sp.Integral):
+        raise ValueError("La integral no tiene forma cerrada: no hay vía simbólica con la que comparar")
+    segundos_integracion = time.perf_counter() - inicio
+
+    filas = []
+    for d in digitos:
+        inicio = time.perf_counter()
+        sp.N(forma, d)
+        segundos_simbolico = segundos_integracion + time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        resultado = integrar_precision(func, *limites, digitos=d, pool=pool)
+        segundos_precision = time.perf_counter() - inicio
+
+        filas.append(FilaComparacion(
+            digitos=d,
+            segundos_precision=segundos_precision,
+            segundos_simbolico=segundos_simbolico,
+            digitos_coincidentes=digitos_coincidentes(forma, resultado),
+            digitos_estimados=resultado.digitos_correctos,
+        ))
+    return filas
@@ -0,0 +1,80 @@
+"""
+Módulo para evaluar una misma integral triple rectangular sobre muchas cajas.
+
+La primitiva triple F(x,y,z), con ∂³F/∂x∂y∂z = f, se calcula una sola vez y
+se guarda en caché; la integral sobre cada caja se obtiene por
+inclusión-exclusión sobre sus 8 vértices, evaluando F con NumPy para todas
+las cajas a la vez.
+"""
+from itertools import product
+from typing import Union
+
+import numpy as np
+import sympy as sp
+
+from calculadora_calculo.calculos.cache import cacheado
+from calculadora_calculo.calculos.integrales import x, y, z, a_expresion
+from calculadora_calculo.calculos.nativo import nucleo_nativo
+from calculadora_calculo.calculos.trabajos import reportar_etapa
+
+
+@cacheado(expresiones=('func',))
+def primitiva_triple(func: Union[str, sp.Expr]) -> sp.Expr:
+    """
+    Calcula la primitiva triple de una función en coordenadas rectangulares.
+
+    Args:
+        func: Función f(x,y,z) como cadena o expresión
+
+    Returns:
+        F(x,y,z) tal que ∂³F/∂x∂y∂z = f
+
+    Raises:
+        ValueError: Si sympy no encuentra una primitiva cerrada
+    """
+    primitiva = a_expresion(func)
+    for var in (z, y, x):
+        reportar_etapa(f"primitiva respecto a {var}")
+        primitiva = sp.integrate(primitiva, var)
+    if primitiva.has(sp.Integral):
+        raise ValueError("La función no tiene una primitiva triple en forma cerrada")
+    return primitiva
+
+
+def integrar_cajas(
+    func: Union[str, sp.Expr],
+    x_lims: np.ndarray,
+    y_lims: np.ndarray,
+    z_lims: np.ndarray
+) -> np.ndarray:
+    """
+    Calcula la integral triple de una misma función sobre muchas cajas rectangulares.
+
+    La integral sobre [x0,x1]×[y0,y1]×[z0,z1] es la suma de F en los vértices
+    con signo (-1)^(número de extremos inferiores). Requiere que la primitiva
+    sea continua en cada caja (p. ej. sin cruzar polos del integrando).
+
+    Args:
+        func: Función f(x,y,z) como cadena o expresión
+        x_lims: Arreglo (N, 2) con los límites en x de cada caja
+        y_lims: Arreglo (N, 2) con los límites en y de cada caja
+        z_lims: Arreglo (N, 2) con los límites en z de cada caja
+
+    Returns:
+        Arreglo (N,) con la integral de cada caja
+    """
+    limites = [np.asarray(lims, dtype=float).reshape(-1, 2) for lims in (x_lims, y_lims, z_lims)]
+    if len({len(lims) for lims in limites}) != 1:
+        raise ValueError("Debe haber el mismo número de límites en x, y y z")
+
+    # Compilada una vez por proceso (caché de núcleos; en C si hay muchas cajas)
+    F = nucleo_nativo(primitiva_triple(func), (x, y, z))
+    total = np.zeros(len(limites[0]))
+    reportar_etapa("evaluación en los vértices")
+    with np.errstate(all='ignore'):
+        for vertice in product((0, 1), repeat=3):
+            # Signo negativo por cada extremo inferior
+            signo = (-1) ** (3 - sum(vertice))
+            puntos = [lims[:, k] for lims, k in zip(limites, vertice)]
+            total += signo * np.broadcast_to(F(*puntos), total.shape)
+    return total
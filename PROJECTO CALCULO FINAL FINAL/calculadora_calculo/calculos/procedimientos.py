@@ -0,0 +1,901 @@
+"""
+Módulo con los cálculos paso a paso que muestra la interfaz.
+
+Las funciones están a nivel de módulo para poder ejecutarse en procesos
+trabajadores: reciben expresiones ya analizadas y devuelven un diccionario
+con los pasos (texto/LaTeX) y el resultado.
+"""
+import sympy as sp
+from typing import Tuple, List, Dict, Any
+from calculadora_calculo.calculos.integrales import (
+    integrando_con_jacobiano, calcular_integral_triple_numerica,
+    calcular_integral_triple_qmc, integrar_iterada
+)
+from calculadora_calculo.calculos.cubatura import ResultadoNumerico
+from calculadora_calculo.calculos.montecarlo import EstimacionQMC, CONFIANZA
+from calculadora_calculo.calculos.trabajos import reportar_etapa
+from calculadora_calculo.calculos.cache import cacheado
+from calculadora_calculo.calculos.separable import factorizar_separable, integral_1d
+from calculadora_calculo.calculos.simetria import analizar_simetria, aplicar_simetrias
+from calculadora_calculo.calculos.polinomios import (
+    como_polinomio, integrar_polinomio_caja, integrar_polinomio_cilindro, integrar_polinomio_esfera
+)
+from calculadora_calculo.calculos.simplificacion import simplificar_rapido
+from calculadora_calculo.calculos.instrumentacion import CrecimientoExcesivo, MonitorCrecimiento
+from calculadora_calculo.calculos.motor import Traza, integrar
+from calculadora_calculo.calculos.grafo import GrafoIntegral
+from calculadora_calculo.calculos.particion import particionar
+from calculadora_calculo.calculos.coordenadas import obtener_sistema
+
+
+def _limites_interfaz(coord_type: str, x_lim, y_lim, z_lim):
+    """Traduce el sistema y los límites de la pestaña de Integrales a los de integrales.py."""
+    if coord_type == "Rectangulares":
+        return 'rectangular', (x_lim, y_lim, z_lim)
+    if coord_type == "Cilíndricas":
+        # r de 0 a x_max y una vuelta completa en θ, como en el procedimiento simbólico
+        return 'cilindrica', ((0, x_lim[1]), (0, 2*sp.pi), z_lim)
+    return 'esferica', ((0, x_lim[1]), (0, sp.pi), (0, 2*sp.pi))
+
+
+def integral_interfaz(func: sp.Expr, coord_type: str, x_lim, y_lim, z_lim):
+    """
+    Integrando (con jacobiano) y límites de la integral de la pestaña de Integrales.
+
+    Returns:
+        Tupla (integrando, limites) en el formato de integrar_iterada
+    """
+    tipo, limites = _limites_interfaz(coord_type, x_lim, y_lim, z_lim)
+    return integrando_con_jacobiano(func, tipo, *limites)
+
+
+def resultado_numerico_a_latex(resultado: ResultadoNumerico) -> str:
+    """Representa un resultado numérico como 'valor ± error' en LaTeX."""
+    error = sp.latex(sp.Float(resultado.error_estimado, 2))
+    return f"\\approx {resultado.valor:.10g} \\pm {error}"
+
+
+def _resultado_latex(resultado) -> str:
+    """LaTeX del resultado de motor.integrar, simbólico o numérico."""
+    if isinstance(resultado, ResultadoNumerico):
+        return resultado_numerico_a_latex(resultado)
+    return sp.latex(simplificar_rapido(resultado))
+
+
+def estimacion_qmc_a_latex(estimacion: EstimacionQMC) -> str:
+    """Representa una estimación cuasi-Monte Carlo parcial con su intervalo de confianza."""
+    semiancho = sp.latex(sp.Float(estimacion.semiancho, 2))
+    return (f"\\approx {estimacion.valor:.10g} \\pm {semiancho}"
+            f"\\;\\text{{({CONFIANZA:.0%}, {estimacion.muestras} muestras)}}").replace("%", "\\%")
+
+
+def _encabezado_integral(func: sp.Expr, coord_type: str, x_lim, y_lim, z_lim) -> List[str]:
+    """Resumen en LaTeX del sistema, la función y los límites de la integral triple."""
+    return [
+        f"\\text{{Sistema de coordenadas:}}\\;\\text{{{coord_type}}}",
+        f"f(x,y,z) = {sp.latex(func)}",
+        f"x \\in [{sp.latex(sp.nsimplify(x_lim[0]))}, {sp.latex(sp.nsimplify(x_lim[1]))}]",
+        f"y \\in [{sp.latex(sp.nsimplify(y_lim[0]))}, {sp.latex(sp.nsimplify(y_lim[1]))}]",
+        f"z \\in [{sp.latex(sp.nsimplify(z_lim[0]))}, {sp.latex(sp.nsimplify(z_lim[1]))}]",
+    ]
+
+
+def procedimiento_integral_qmc(
+    func: sp.Expr,
+    coord_type: str,
+    x_lim: Tuple[float, float],
+    y_lim: Tuple[float, float],
+    z_lim: Tuple[float, float]
+) -> Dict[str, Any]:
+    """
+    Estima la integral triple de la pestaña de Integrales con cuasi-Monte Carlo.
+
+    Las estimaciones parciales se envían a la interfaz tras cada bloque de muestras.
+
+    Args:
+        func: Función f(x,y,z) ya analizada
+        coord_type: 'Rectangulares', 'Cilíndricas' o 'Esféricas'
+        x_lim: Límites en x (o r/ρ según el sistema)
+        y_lim: Límites en y
+        z_lim: Límites en z
+
+    Returns:
+        Diccionario con 'encabezado', 'resultado' (ResultadoNumerico) y 'resultado_latex'
+    """
+    tipo, limites = _limites_interfaz(coord_type, x_lim, y_lim, z_lim)
+    resultado = calcular_integral_triple_qmc(func, tipo, *limites)
+    estimacion = EstimacionQMC(resultado.valor, resultado.error_estimado, resultado.evaluaciones)
+    return {
+        'encabezado': _encabezado_integral(func, coord_type, x_lim, y_lim, z_lim),
+        'resultado': resultado,
+        'resultado_latex': [
+            f"\\text{{Estimación cuasi-Monte Carlo:}}\\; {estimacion_qmc_a_latex(estimacion)}",
+            f"\\text{{Método: {resultado.metodo}}}",
+        ],
+    }
+
+
+@cacheado
+def procedimiento_integral_numerica(
+    func: sp.Expr,
+    coord_type: str,
+    x_lim: Tuple[float, float],
+    y_lim: Tuple[float, float],
+    z_lim: Tuple[float, float]
+) -> Dict[str, Any]:
+    """
+    Aproxima numéricamente la integral triple de la pestaña de Integrales.
+
+    Args:
+        func: Función f(x,y,z) ya analizada
+        coord_type: 'Rectangulares', 'Cilíndricas' o 'Esféricas'
+        x_lim: Límites en x (o r/ρ según el sistema)
+        y_lim: Límites en y
+        z_lim: Límites en z
+
+    Returns:
+        Diccionario con 'resultado' (ResultadoNumerico) y 'resultado_latex'
+    """
+    tipo, limites = _limites_interfaz(coord_type, x_lim, y_lim, z_lim)
+    resultado = calcular_integral_triple_numerica(func, tipo, *limites)
+    return {
+        'resultado': resultado,
+        'resultado_latex': [
+            f"\\text{{Aproximación numérica:}}\\; {resultado_numerico_a_latex(resultado)}",
+            f"\\text{{Método: {resultado.metodo}, {resultado.evaluaciones} evaluaciones}}",
+        ],
+    }
+
+
+def _pasos_polinomio(integrando: sp.Expr, limites: List[Tuple[sp.Symbol, Any, Any]]):
+    """
+    Integra un integrando polinómico sobre una caja con la fórmula cerrada de cada monomio.
+
+    Returns:
+        Tupla (pasos, resultado), o None si el integrando no es un polinomio en
+        las variables de integración o los límites no forman una caja
+    """
+    polinomio = como_polinomio(integrando, [lim[0] for lim in limites])
+    if polinomio is None:
+        return None
+
+    reportar_etapa("integración polinómica")
+    try:
+        resultado = integrar_polinomio_caja(integrando, *limites)
+    except ValueError:
+        return None
+    pasos = Traza([f"\nLa función es un polinomio de {len(polinomio.terms())} monomios: "
+                   "cada monomio se integra con su fórmula cerrada.",
+                   "   ∫ tᵏ dt (de a a b) = (bᵏ⁺¹ - aᵏ⁺¹)/(k+1) en cada variable"])
+    pasos.texto("   Suma de los monomios: ", resultado)
+    return pasos, resultado
+
+
+def _pasos_polinomio_region(func: sp.Expr, coord_type: str, x_lim, z_lim):
+    """
+    Integra una función polinómica en x, y, z sobre el cilindro o la bola de la interfaz.
+
+    La región es el cilindro de radio x_max en cilíndricas y la bola de radio
+    x_max en esféricas; cada monomio xᵃ·yᵇ·zᶜ tiene su fórmula cerrada.
+
+    Returns:
+        Tupla (pasos, resultado), o None si la función no es un polinomio en x, y, z
+        o contiene otros símbolos
+    """
+    x, y, z = sp.symbols('x y z')
+    # r, ρ, θ y φ son variables de integración en estas regiones, no coeficientes
+    if not sp.sympify(func).free_symbols <= {x, y, z}:
+        return None
+    polinomio = como_polinomio(func, (x, y, z))
+    if polinomio is None:
+        return None
+
+    reportar_etapa("integración polinómica")
+    pasos = Traza([f"\nLa función es un polinomio de {len(polinomio.terms())} monomios: "
+                   "cada monomio xᵃ·yᵇ·zᶜ se integra con su fórmula cerrada."])
+    if coord_type == "Cilíndricas":
+        pasos.append(f"   Región: cilindro de radio {x_lim[1]} con z ∈ [{z_lim[0]}, {z_lim[1]}]")
+        pasos.append("   ∫∫ xᵃ·yᵇ dA (disco de radio R) = 2π·(a-1)!!·(b-1)!!·Rᵃ⁺ᵇ⁺²/((a+b+2)·(a+b)!!), "
+                     "nula si a o b es impar")
+        resultado = integrar_polinomio_cilindro(func, x_lim[1], z_lim, variables=(x, y, z))
+    else:
+        pasos.append(f"   Región: bola de radio {x_lim[1]}")
+        pasos.append("   ∭ xᵃ·yᵇ·zᶜ dV (bola de radio R) = 4π·(a-1)!!·(b-1)!!·(c-1)!!·Rⁿ⁺³/((n+3)·(n+1)!!), "
+                     "con n = a+b+c, nula si algún exponente es impar")
+        resultado = integrar_polinomio_esfera(func, x_lim[1], variables=(x, y, z))
+    pasos.texto("   Suma de los monomios: ", resultado)
+    return pasos, resultado
+
+
+def _texto_limite(valor) -> str:
+    """Límite en una sola línea (sp.pretty si cabe, si no la forma textual)."""
+    texto = sp.pretty(valor)
+    return texto if '\n' not in texto else str(valor)
+
+
+def _pasos_simetria(integrando: sp.Expr, limites: List[Tuple[sp.Symbol, Any, Any]]):
+    """
+    Analiza la simetría del integrando antes de integrar.
+
+    Returns:
+        Tupla (pasos, factor, limites) como reducir_por_simetria: factor 0 si
+        la integral es nula, 2ᵏ si se redujo a la mitad en k variables
+    """
+    reportar_etapa("análisis de simetría")
+    simetrias = analizar_simetria(integrando, *limites)
+    pasos = Traza()
+    superiores = {var: lim_sup for var, _, lim_sup in limites}
+    for simetria in simetrias:
+        var, centro = simetria.variable, _texto_limite(simetria.centro)
+        if simetria.tipo == 'impar':
+            pasos.append(f"\nSimetría: la función es impar en {var} respecto a {var} = {centro}, "
+                         "por lo que la integral es 0.")
+        else:
+            pasos.append(f"\nSimetría: la función es par en {var} respecto a {var} = {centro}; "
+                         f"se integra de {centro} a {_texto_limite(superiores[var])} y se multiplica por 2.")
+    factor, reducidos = aplicar_simetrias(simetrias, limites)
+    return pasos, factor, reducidos
+
+
+def _pasos_separable(integrando: sp.Expr, limites: List[Tuple[sp.Symbol, Any, Any]]):
+    """
+    Integra un integrando separable como producto de integrales de una variable.
+
+    Returns:
+        Tupla (pasos, resultado), o None si el integrando no es separable
+    """
+    reportar_etapa("integración separable")
+    terminos = factorizar_separable(integrando, [lim[0] for lim in limites])
+    if terminos is None:
+        return None
+
+    if len(terminos) == 1:
+        pasos = Traza(["\nLa función es separable: la integral es el producto de integrales de una variable."])
+    else:
+        pasos = Traza([f"\nLa función es suma de {len(terminos)} términos separables: "
+                       "cada uno es un producto de integrales de una variable."])
+    resultado = sp.Integer(0)
+    for k, (constante, factores) in enumerate(terminos, 1):
+        if len(terminos) > 1:
+            pasos.append(f"\nTérmino {k}:")
+        producto = constante
+        for var, lim_inf, lim_sup in limites:
+            valor = integral_1d(factores[var], var, sp.sympify(lim_inf), sp.sympify(lim_sup))
+            pasos.texto("   ∫(", factores[var], f") d{var} (de {lim_inf} a {lim_sup}) = ", valor)
+            producto *= valor
+        if constante != 1:
+            pasos.texto("   Constante: ", constante)
+        pasos.texto("   Producto: ", producto)
+        resultado += producto
+    return pasos, resultado
+
+
+def _pasos_particion(integrando: sp.Expr, limites: List[Tuple[sp.Symbol, Any, Any]]):
+    """
+    Integra un integrando no suave sumando sus integrales en subregiones donde es suave.
+
+    Returns:
+        Tupla (pasos, resultado), o None si no hay nada que partir
+    """
+    reportar_etapa("partición del dominio")
+    piezas = particionar(integrando, *limites)
+    if len(piezas) == 1 and piezas[0].integrando == integrando:
+        return None
+
+    pasos = Traza([f"\nLa función no es suave (Abs, sign, Max, Min o Piecewise): la región se divide "
+                   f"en {len(piezas)} subregiones donde es suave y se suman sus integrales."])
+    resultado = sp.Integer(0)
+    for k, pieza in enumerate(piezas, 1):
+        reportar_etapa(f"integración de la subregión {k} de {len(piezas)}")
+        valor = integrar_iterada(pieza.integrando, *pieza.limites)
+        rangos = ", ".join(f"{var} ∈ [{_texto_limite(lim_inf)}, {_texto_limite(lim_sup)}]"
+                           for var, lim_inf, lim_sup in reversed(pieza.limites))
+        pasos.append(f"\nSubregión {k}: {rangos}")
+        pasos.texto("   ∫(", pieza.integrando, ") = ", valor)
+        resultado += valor
+    pasos.texto("   Suma de las subregiones: ", resultado)
+    return pasos, resultado
+
+
+def _pasos_integral(integrando: sp.Expr, limites: List[Tuple[sp.Symbol, Any, Any]],
+                    monitor: MonitorCrecimiento):
+    """
+    Integra paso a paso en el mismo orden que integrar_iterada.
+
+    Primero se analiza la simetría; después se prueban la partición del
+    dominio, el polinomio sobre una caja y la separación en integrales de una
+    variable, y si nada de eso aplica se integra variable a variable.
+
+    Args:
+        integrando: Función ya expresada en las variables de integración (con jacobiano)
+        limites: Tuplas (variable, mínimo, máximo), la primera es la más interna
+        monitor: Monitor del tamaño de las integrales parciales
+
+    Returns:
+        Tupla (pasos, resultado)
+
+    Raises:
+        CrecimientoExcesivo: Si una integral parcial supera el umbral del monitor
+    """
+    pasos, factor, limites = _pasos_simetria(integrando, limites)
+    if factor == 0:
+        return pasos, sp.S.Zero
+
+    directo = (_pasos_particion(integrando, limites) or _pasos_polinomio(integrando, limites)
+               or _pasos_separable(integrando, limites))
+    if directo is not None:
+        pasos_directos, resultado = directo
+        pasos.extend(pasos_directos)
+    else:
+        grafo = GrafoIntegral(integrando)
+        resultado = integrando
+        for k, (var, lim_inf, lim_sup) in enumerate(limites, 1):
+            etapa = grafo.integrar(var, lim_inf, lim_sup)
+            monitor.registrar(f"integración respecto a {var}", etapa.resultado)
+            objeto = "" if k == 1 else "el resultado "
+            pasos.append(f"\n{k}. Integrando {objeto}con respecto a {sp.pretty(var)} "
+                         f"(de {_texto_limite(lim_inf)} a {_texto_limite(lim_sup)}):")
+            pasos.texto("   ∫(", resultado, f") d{sp.pretty(var)} = ", etapa.resultado)
+            if etapa.reutilizada:
+                pasos.append("   (integral parcial reutilizada de un cálculo anterior)")
+            resultado = etapa.resultado
+
+    if factor != 1:
+        resultado = factor * resultado
+        pasos.texto(f"\nMultiplicando por el factor de simetría {factor}: ", resultado)
+    return pasos, resultado
+
+
+@cacheado
+def procedimiento_integral_triple(
+    func: sp.Expr,
+    coord_type: str,
+    x_lim: Tuple[float, float],
+    y_lim: Tuple[float, float],
+    z_lim: Tuple[float, float]
+) -> Dict[str, Any]:
+    """
+    Calcula la integral triple mostrada en la pestaña de Integrales, registrando cada etapa.
+
+    Si una expresión intermedia crece por encima del umbral de
+    instrumentacion.py, el cálculo pasa al motor numérico.
+
+    Args:
+        func: Función f(x,y,z) ya analizada
+        coord_type: 'Rectangulares', 'Cilíndricas' o 'Esféricas'
+        x_lim: Límites en x (o r/ρ según el sistema)
+        y_lim: Límites en y
+        z_lim: Límites en z
+
+    Returns:
+        Diccionario con 'encabezado', 'pasos' (Traza que se dibuja al mostrarse),
+        'resultado', 'resultado_latex' y 'metricas' (tamaño de la expresión
+        tras cada etapa)
+    """
+    monitor = MonitorCrecimiento(func)
+    try:
+        datos = _procedimiento_integral_simbolica(func, coord_type, x_lim, y_lim, z_lim, monitor)
+    except CrecimientoExcesivo as e:
+        numerica = procedimiento_integral_numerica(func, coord_type, x_lim, y_lim, z_lim)
+        datos = {
+            'encabezado': _encabezado_integral(func, coord_type, x_lim, y_lim, z_lim),
+            'pasos': Traza([
+                f"{e}.",
+                "Se abandona la integración simbólica y se usa el motor numérico.",
+                "Tamaño de las expresiones intermedias:",
+            ] + [f"  - {metrica.describir()}" for metrica in monitor.metricas]),
+            'resultado': numerica['resultado'],
+            'resultado_latex': numerica['resultado_latex'],
+        }
+    datos['metricas'] = monitor.metricas
+    return datos
+
+
+def _procedimiento_integral_simbolica(
+    func: sp.Expr,
+    coord_type: str,
+    x_lim: Tuple[float, float],
+    y_lim: Tuple[float, float],
+    z_lim: Tuple[float, float],
+    monitor: MonitorCrecimiento
+) -> Dict[str, Any]:
+    """
+    Integración simbólica paso a paso de procedimiento_integral_triple.
+
+    Raises:
+        CrecimientoExcesivo: Si una expresión intermedia supera el umbral del monitor
+    """
+    x, y, z = sp.symbols('x y z')
+    x_min, x_max = x_lim
+    y_min, y_max = y_lim
+    z_min, z_max = z_lim
+
+    # Traza de pasos: las expresiones se dibujan solo si se muestra el procedimiento
+    pasos = Traza()
+    pasos.texto("Función a integrar: f(x,y,z) = ", func)
+    pasos.extend([
+        "Límites de integración:",
+        f"  - x ∈ [{x_min}, {x_max}]",
+        f"  - y ∈ [{y_min}, {y_max}]",
+        f"  - z ∈ [{z_min}, {z_max}]"
+    ])
+    pasos.append(f"\nSistema de coordenadas: {coord_type}")
+
+    if coord_type == "Rectangulares":
+        pasos.append("\nIntegrando en coordenadas rectangulares (x, y, z):")
+
+        # Mostrar la integral original
+        pasos.texto("Expresión original: ∫∫∫ (", func, ") dz dy dx")
+
+        pasos_integral, result = _pasos_integral(
+            func, [(z, z_min, z_max), (y, y_min, y_max), (x, x_min, x_max)], monitor
+        )
+        pasos.extend(pasos_integral)
+
+    elif coord_type == "Cilíndricas":
+        r, theta = sp.symbols('r theta')
+        pasos.append("\nConversión a coordenadas cilíndricas (r, θ, z):")
+        pasos.append("   x = r·cos(θ)")
+        pasos.append("   y = r·sin(θ)")
+        pasos.append("   z = z")
+        pasos.append("   Jacobiano: |J| = r")
+
+        # Aplicar la transformación
+        func_cyl = func.subs({
+            x: r * sp.cos(theta),
+            y: r * sp.sin(theta),
+            z: z
+        }) * r  # Jacobiano
+
+        pasos.texto("\nFunción en coordenadas cilíndricas: ", func_cyl)
+
+        # Mostrar la integral
+        pasos.texto("\nExpresión a integrar: ∫∫∫ (", func_cyl, ") dz dr dθ")
+
+        # La región completa admite las fórmulas cerradas de los monomios en x, y, z
+        pasos_integral, result = _pasos_polinomio_region(func, coord_type, x_lim, z_lim) or _pasos_integral(
+            func_cyl, [(z, z_min, z_max), (r, 0, x_max), (theta, 0, 2*sp.pi)], monitor
+        )
+        pasos.extend(pasos_integral)
+
+    else:  # Esféricas
+        rho, phi, theta = sp.symbols('rho phi theta')
+        pasos.append("\nConversión a coordenadas esféricas (ρ, φ, θ):")
+        pasos.append("   x = ρ·sin(φ)·cos(θ)")
+        pasos.append("   y = ρ·sin(φ)·sin(θ)")
+        pasos.append("   z = ρ·cos(φ)")
+        pasos.append("   Jacobiano: |J| = ρ²·sin(φ)")
+
+        # Aplicar la transformación
+        func_sph = func.subs({
+            x: rho * sp.sin(phi) * sp.cos(theta),
+            y: rho * sp.sin(phi) * sp.sin(theta),
+            z: rho * sp.cos(phi)
+        }) * rho**2 * sp.sin(phi)  # Jacobiano
+
+        pasos.texto("\nFunción en coordenadas esféricas: ", func_sph)
+
+        # Mostrar la integral
+        pasos.texto("\nExpresión a integrar: ∫∫∫ (", func_sph, ") dρ dφ dθ")
+
+        # La región completa admite las fórmulas cerradas de los monomios en x, y, z
+        pasos_integral, result = _pasos_polinomio_region(func, coord_type, x_lim, z_lim) or _pasos_integral(
+            func_sph, [(rho, 0, x_max), (phi, 0, sp.pi), (theta, 0, 2*sp.pi)], monitor
+        )
+        pasos.extend(pasos_integral)
+
+    # Procedimiento y resumen en LaTeX (función y límites)
+    encabezado_latex = _encabezado_integral(func, coord_type, x_lim, y_lim, z_lim)
+    reportar_etapa("simplificación del resultado")
+    resultado_latex = [f"\\text{{Resultado final:}}\\; {sp.latex(simplificar_rapido(result))}"]
+    if result.has(sp.Integral):
+        # Sin forma cerrada: añadir la aproximación numérica
+        resultado_latex += procedimiento_integral_numerica(
+            func, coord_type, x_lim, y_lim, z_lim
+        )['resultado_latex']
+
+    return {
+        'encabezado': encabezado_latex,
+        'pasos': pasos,
+        'resultado': result,
+        'resultado_latex': resultado_latex,
+    }
+
+
+@cacheado
+def procedimiento_green(
+    P: sp.Expr,
+    Q: sp.Expr,
+    x_lim: Tuple[float, float],
+    y_lim: Tuple[float, float]
+) -> Dict[str, Any]:
+    """
+    Aplica el Teorema de Green sobre el rectángulo dado, registrando el procedimiento.
+
+    Args:
+        P: Función P(x,y)
+        Q: Función Q(x,y)
+        x_lim: Límites en x (min, max)
+        y_lim: Límites en y (min, max)
+
+    Returns:
+        Diccionario con 'pasos' (Traza), 'resultado' (simbólico o
+        ResultadoNumerico), 'resultado_latex' e 'integral' (integrando y
+        límites de la integral calculada, para verificarla)
+    """
+    x, y = sp.symbols('x y')
+    x_min, x_max = x_lim
+    y_min, y_max = y_lim
+
+    # Calcular las derivadas parciales
+    dQ_dx = sp.diff(Q, x)
+    dP_dy = sp.diff(P, y)
+    integrando = dQ_dx - dP_dy
+
+    # Calcular la integral doble
+    limites = ((y, y_min, y_max), (x, x_min, x_max))
+    resultado = integrar(integrando, *limites)
+
+    # Procedimiento paso a paso (LaTeX, se genera al mostrarse)
+    pasos_green = Traza([
+        "\\text{Teorema de Green}",
+        "\\oint_C (P\\,dx + Q\\,dy) = \\iint_D (\\partial Q/\\partial x - \\partial P/\\partial y)\\,dA",
+        "\\text{Datos de entrada:}",
+    ])
+    pasos_green.latex("P(x,y) = ", P)
+    pasos_green.latex("Q(x,y) = ", Q)
+    pasos_green.latex("x \\in [", x_min, ", ", x_max, "]")
+    pasos_green.latex("y \\in [", y_min, ", ", y_max, "]")
+    pasos_green.append("\\text{1. Cálculo de las derivadas parciales:}")
+    pasos_green.latex("\\partial Q/\\partial x = ", dQ_dx)
+    pasos_green.latex("\\partial P/\\partial y = ", dP_dy)
+    pasos_green.append("\\text{2. Aplicación del teorema:}")
+    pasos_green.latex(
+        "\\oint_C (P\\,dx + Q\\,dy) = \\iint_D (", dQ_dx, " - ", dP_dy,
+        ")\\,dA = \\iint_D (", integrando, ")\\,dA"
+    )
+    pasos_green.append("\\text{3. Cálculo de la integral doble:}")
+    pasos_green.latex(
+        "x \\in [", x_min, ", ", x_max, "],\\quad y \\in [", y_min, ", ", y_max, "]"
+    )
+
+    reportar_etapa("simplificación del resultado")
+    return {
+        'pasos': pasos_green,
+        'resultado': resultado,
+        'resultado_latex': [_resultado_latex(resultado)],
+        'integral': (integrando, limites),
+    }
+
+
+@cacheado
+def procedimiento_stokes(F1: sp.Expr, F2: sp.Expr, F3: sp.Expr) -> Dict[str, Any]:
+    """
+    Aplica el Teorema de Stokes sobre la superficie z = 1 - x - y del primer octante.
+
+    Args:
+        F1, F2, F3: Componentes del campo vectorial F(x,y,z)
+
+    Returns:
+        Diccionario con 'pasos' (Traza), 'resultado' (simbólico o
+        ResultadoNumerico), 'resultado_latex' e 'integral' (integrando y
+        límites de la integral calculada, para verificarla)
+    """
+    x, y, z = sp.symbols('x y z')
+
+    # Calcular el rotacional de F = (F1, F2, F3)
+    # rot(F) = (∂F3/∂y - ∂F2/∂z, ∂F1/∂z - ∂F3/∂x, ∂F2/∂x - ∂F1/∂y)
+    rot_F1, rot_F2, rot_F3 = obtener_sistema('cartesianas', (x, y, z)).rotacional((F1, F2, F3))
+
+    # Superficie plana z = 1 - x - y en el primer octante, normal (1, 1, 1)
+    # Proyectamos sobre el plano xy: D es el triángulo 0 ≤ x ≤ 1, 0 ≤ y ≤ 1-x
+    integrando = rot_F1 + rot_F2 + rot_F3
+
+    # Evaluamos z = 1 - x - y en el integrando
+    integrando = integrando.subs(z, 1 - x - y)
+
+    # Calculamos la integral doble
+    limites = ((y, 0, 1 - x), (x, 0, 1))
+    result = integrar(integrando, *limites)
+
+    # Procedimiento en LaTeX (se genera al mostrarse)
+    pasos_stokes = Traza([
+        "\\text{Teorema de Stokes}",
+        "\\oint_C F\\cdot dr = \\iint_S (\\nabla \\times F)\\cdot dS",
+        "\\text{Datos de entrada:}",
+    ])
+    pasos_stokes.latex("F(x,y,z) = (", F1, ", ", F2, ", ", F3, ")")
+    pasos_stokes.extend([
+        "\\text{1. Cálculo del rotacional de F (\\nabla \\times F):}",
+        "\\nabla \\times F = (\\partial F_3/\\partial y - \\partial F_2/\\partial z,\\; \\partial F_1/\\partial z - \\partial F_3/\\partial x,\\; \\partial F_2/\\partial x - \\partial F_1/\\partial y)",
+    ])
+    pasos_stokes.latex(
+        "\\partial F_3/\\partial y - \\partial F_2/\\partial z = ",
+        sp.diff(F3, y), " - ", sp.diff(F2, z), " = ", rot_F1
+    )
+    pasos_stokes.latex(
+        "\\partial F_1/\\partial z - \\partial F_3/\\partial x = ",
+        sp.diff(F1, z), " - ", sp.diff(F3, x), " = ", rot_F2
+    )
+    pasos_stokes.latex(
+        "\\partial F_2/\\partial x - \\partial F_1/\\partial y = ",
+        sp.diff(F2, x), " - ", sp.diff(F1, y), " = ", rot_F3
+    )
+    pasos_stokes.latex("\\nabla \\times F = (", rot_F1, ", ", rot_F2, ", ", rot_F3, ")")
+    pasos_stokes.append("\\text{2. Integral de superficie sobre S (z=1-x-y):}")
+    pasos_stokes.latex(
+        "\\iint_S (\\nabla \\times F)\\cdot dS = \\iint_D (",
+        rot_F1, " + ", rot_F2, " + ", rot_F3, ")\\,dA"
+    )
+    pasos_stokes.latex("\\text{Sustituyendo } z = 1 - x - y: \\; ", integrando)
+    pasos_stokes.append("0 \\leq x \\leq 1,\\; 0 \\leq y \\leq 1-x")
+
+    reportar_etapa("simplificación del resultado")
+    return {
+        'pasos': pasos_stokes,
+        'resultado': result,
+        'resultado_latex': [_resultado_latex(result)],
+        'integral': (integrando, limites),
+    }
+
+
+@cacheado
+def procedimiento_divergencia(
+    F1: sp.Expr,
+    F2: sp.Expr,
+    F3: sp.Expr,
+    region_type: str,
+    region: Dict[str, Any],
+    coord_system: str
+) -> Dict[str, Any]:
+    """
+    Aplica el Teorema de la Divergencia sobre una región ya validada por la interfaz.
+
+    Args:
+        F1, F2, F3: Componentes del campo vectorial F(x,y,z)
+        region_type: 'Esfera', 'Cubo' o 'Cilindro'
+        region: Parámetros de la región (radio, centro, lado, altura, eje, límites e 'info')
+        coord_system: Sistema de coordenadas en minúsculas ('cartesianas', 'cilíndricas', 'esféricas')
+
+    Returns:
+        Diccionario con 'pasos' (Traza), 'resultado' (simbólico o
+        ResultadoNumerico), 'resultado_latex' e 'integral' (integrando y
+        límites de la integral calculada, para verificarla)
+    """
+    x, y, z = sp.symbols('x y z')
+    rho, phi, theta = sp.symbols('rho phi theta')
+    r = sp.symbols('r')
+
+    radio = region.get('radio')
+    x0 = region.get('x0', 0)
+    y0 = region.get('y0', 0)
+    z0 = region.get('z0', 0)
+    eje = region.get('eje', 'z')
+    x_lim = region.get('x_lim')
+    y_lim = region.get('y_lim')
+    z_lim = region.get('z_lim')
+    r_lim = region.get('r_lim')
+    rho_lim = region.get('rho_lim')
+    theta_lim = region.get('theta_lim')
+    phi_lim = region.get('phi_lim')
+
+    # Calcular la divergencia de F = (F1, F2, F3)
+    div_F = obtener_sistema('cartesianas', (x, y, z)).divergencia((F1, F2, F3))
+
+    # Inicializar el procedimiento
+    procedimiento = Traza([
+        "Teorema de la Divergencia",
+        "∯_S F·dS = ∭_V (∇·F) dV\n",
+        "Datos de entrada:",
+        f"F(x,y,z) = ({F1}, {F2}, {F3})",
+        region.get('info', f"Región: {region_type}"),
+        f"Sistema de coordenadas: {coord_system.capitalize()}\n",
+        "1. Cálculo de la divergencia (∇·F):",
+        "   ∇·F = ∂F₁/∂x + ∂F₂/∂y + ∂F₃/∂z",
+        f"   ∂F₁/∂x = {sp.diff(F1, x)}",
+        f"   ∂F₂/∂y = {sp.diff(F2, y)}",
+        f"   ∂F₃/∂z = {sp.diff(F3, z)}",
+        f"   ∇·F = {sp.diff(F1, x)} + {sp.diff(F2, y)} + {sp.diff(F3, z)}",
+        f"   ∇·F = {div_F}\n"
+    ])
+
+    # Calcular la integral según el sistema de coordenadas
+    if coord_system == "esféricas" or region_type == "Esfera":
+        # Usar coordenadas esféricas
+        procedimiento.extend([
+            "2. Cambio a coordenadas esféricas:",
+            "   x = x0 + ρ·sin(φ)·cos(θ)",
+            "   y = y0 + ρ·sin(φ)·sin(θ)",
+            "   z = z0 + ρ·cos(φ)",
+            "   Jacobiano: ρ²·sin(φ)\n"
+        ])
+
+        # Expresar la divergencia en coordenadas esféricas
+        esfericas = obtener_sistema('esfericas', (rho, phi, theta))
+        div_F_sph = esfericas.transformar(
+            div_F, cartesianas=(x, y, z), origen=(x0, y0, z0)
+        ) * esfericas.jacobiano
+
+        procedimiento.append("3. Cálculo de la integral triple:")
+        procedimiento.texto(f"   ∭_V (∇·F) dV = ∫₀^π ∫₀^2π ∫₀^{radio} (", div_F_sph, ") dρ dθ dφ")
+        procedimiento.append(f"   Límites: 0 ≤ ρ ≤ {radio}, 0 ≤ θ ≤ 2π, 0 ≤ φ ≤ π")
+
+        # Calcular la integral
+        try:
+            integral = (div_F_sph, ((rho, *rho_lim), (theta, *theta_lim), (phi, *phi_lim)))
+            resultado = integrar(integral[0], *integral[1])
+            reportar_etapa("simplificación del resultado")
+            if not isinstance(resultado, ResultadoNumerico):
+                resultado = simplificar_rapido(resultado)
+
+        except Exception as e:
+            raise Exception(f"Error al calcular la integral: {str(e)}")
+
+    elif coord_system == "cilíndricas" or region_type == "Cilindro":
+        # Usar coordenadas cilíndricas
+        procedimiento.extend([
+            "2. Cambio a coordenadas cilíndricas:",
+            f"   {'z' if eje == 'z' else 'x' if eje == 'x' else 'y'} = {eje}",
+            f"   {'x' if eje != 'x' else 'y'} = r·cos(θ)",
+            f"   {'y' if eje != 'y' else 'x'} = r·sin(θ)",
+            "   Jacobiano: r\n"
+        ])
+
+        # Expresar la divergencia en coordenadas cilíndricas
+        if eje == 'z':
+            cilindricas = obtener_sistema('cilindricas', (r, theta, z))
+            div_F_cyl = cilindricas.transformar(div_F, cartesianas=(x, y, z)) * cilindricas.jacobiano
+        elif eje == 'x':
+            div_F_cyl = div_F.subs({
+                y: r * sp.cos(theta),
+                z: r * sp.sin(theta),
+                x: x
+            }) * r  # Jacobiano
+        else:  # eje 'y'
+            div_F_cyl = div_F.subs({
+                x: r * sp.cos(theta),
+                z: r * sp.sin(theta),
+                y: y
+            }) * r  # Jacobiano
+
+        eje_lim = z_lim if eje == 'z' else x_lim if eje == 'x' else y_lim
+        procedimiento.append("3. Cálculo de la integral triple:")
+        procedimiento.texto(
+            f"   ∭_V (∇·F) dV = "
+            f"∫_{eje_lim[0]}^{eje_lim[1]} "
+            f"∫_0^{2*sp.pi} ∫_0^{radio} (", div_F_cyl, ") dr dθ "
+            f"{'dz' if eje == 'z' else 'dx' if eje == 'x' else 'dy'}"
+        )
+        procedimiento.append(
+            f"   Límites: 0 ≤ r ≤ {radio}, 0 ≤ θ ≤ 2π, "
+            f"{'z' if eje == 'z' else 'x' if eje == 'x' else 'y'} ∈ "
+            f"[{eje_lim[0]}, {eje_lim[1]}]"
+        )
+
+        # Calcular la integral
+        try:
+            var_eje = z if eje == 'z' else x if eje == 'x' else y
+            integral = (div_F_cyl, ((r, *r_lim), (theta, *theta_lim), (var_eje, *eje_lim)))
+            resultado = integrar(integral[0], *integral[1])
+            reportar_etapa("simplificación del resultado")
+            if not isinstance(resultado, ResultadoNumerico):
+                resultado = simplificar_rapido(resultado)
+
+        except Exception as e:
+            raise Exception(f"Error al calcular la integral: {str(e)}")
+
+    else:  # Coordenadas cartesianas
+        procedimiento.extend([
+            "2. Uso de coordenadas cartesianas:",
+            "   x, y, z",
+            "   Jacobiano: 1\n"
+        ])
+
+        procedimiento.extend([
+            "3. Cálculo de la integral triple:",
+            f"   ∭_V (∇·F) dV = "
+            f"∫_{x_lim[0]}^{x_lim[1]} "
+            f"∫_{y_lim[0]}^{y_lim[1]} "
+            f"∫_{z_lim[0]}^{z_lim[1]} "
+            f"({div_F}) dz dy dx"
+        ])
+
+        # Calcular la integral
+        try:
+            integral = (div_F, ((z, *z_lim), (y, *y_lim), (x, *x_lim)))
+            resultado = integrar(integral[0], *integral[1])
+            reportar_etapa("simplificación del resultado")
+            if not isinstance(resultado, ResultadoNumerico):
+                resultado = simplificar_rapido(resultado)
+
+        except Exception as e:
+            raise Exception(f"Error al calcular la integral: {str(e)}")
+
+    return {
+        'pasos': procedimiento,
+        'resultado': resultado,
+        'resultado_latex': [_resultado_latex(resultado)],
+        'integral': integral,
+    }
+
+
+def gram_schmidt(vectors: List[sp.Matrix], orthonormal: bool = True) -> List[sp.Matrix]:
+    """
+    Aplica el proceso de Gram-Schmidt a una lista de vectores.
+
+    Args:
+        vectors: Vectores columna de entrada
+        orthonormal: Si es True, normaliza cada vector de la base
+
+    Returns:
+        Lista de vectores de la base
+    """
+    basis = []
+    for v in vectors:
+        w = v - sum((v.dot(b) / b.dot(b) * b for b in basis), sp.zeros(v.shape[0], 1))
+        if w.norm() == 0:
+            raise ValueError("Input vectors are linearly dependent.")
+        if orthonormal:
+            w = w / w.norm()
+        basis.append(w)
+    return basis
+
+
+def vector_a_latex(vector) -> str:
+    """Convierte un vector en su representación LaTeX entre corchetes."""
+    return "\\left[" + ", ".join(sp.latex(comp) for comp in vector) + "\\right]"
+
+
+def procedimiento_gram_schmidt(vectors: List[sp.Matrix], orthonormal: bool = True) -> Dict[str, Any]:
+    """
+    Aplica Gram-Schmidt registrando cada proyección y normalización en LaTeX.
+
+    Args:
+        vectors: Vectores columna de entrada
+        orthonormal: Si es True, se construye una base ortonormal
+
+    Returns:
+        Diccionario con 'pasos' (LaTeX) y 'base' (vectores u_k)
+    """
+    # Verifica independencia lineal antes de registrar los pasos
+    gram_schmidt(vectors, orthonormal)
+
+    process_type = "Ortonormal" if orthonormal else "Ortogonal"
+    # Construir procedimiento paso a paso (LaTeX)
+    pasos_latex = []
+    pasos_latex.append(f"\\text{{Proceso: {process_type}}}")
+    pasos_latex.append("\\text{Vectores de entrada:}")
+    for i, v in enumerate(vectors, 1):
+        pasos_latex.append(f"v_{{{i}}} = {vector_a_latex(v)}")
+
+    # Recalcular explícitamente para registrar pasos
+    u_basis = []
+    for k, v in enumerate(vectors, 1):
+        reportar_etapa(f"paso {k} de Gram-Schmidt")
+        w = v
+        detalle_proy = []
+        for j, b in enumerate(u_basis, 1):
+            coef = simplificar_rapido((v.dot(b) / b.dot(b)))
+            w = w - coef * b
+            detalle_proy.append(f"\\text{{Proy}}_{{v_{k} \to u_{j}}} = {sp.latex(coef)}\\, u_{{{j}}}")
+        pasos_latex.append(f"\\text{{Paso {k}}}")
+        if detalle_proy:
+            pasos_latex.extend(detalle_proy)
+        else:
+            pasos_latex.append("\\text{No hay proyecciones previas}")
+        pasos_latex.append(f"w_{{{k}}} = {vector_a_latex(simplificar_rapido(w))}")
+        if w.norm() == 0:
+            raise ValueError("Los vectores de entrada son linealmente dependientes.")
+        if orthonormal:
+            norm_w = simplificar_rapido(sp.sqrt((w.T*w)[0]))
+            u = simplificar_rapido(w / norm_w)
+            pasos_latex.append(f"u_{{{k}}} = \\frac{{w_{{{k}}}}}{{{sp.latex(norm_w)}}} = {vector_a_latex(u)}")
+        else:
+            u = simplificar_rapido(w)
+            pasos_latex.append(f"u_{{{k}}} = w_{{{k}}} = {vector_a_latex(u)}")
+        u_basis.append(u)
+
+    return {
+        'pasos': pasos_latex,
+        'base': u_basis,
+    }
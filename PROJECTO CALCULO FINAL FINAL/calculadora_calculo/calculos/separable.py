@@ -0,0 +1,94 @@
+"""
+Módulo para integrar de forma rápida integrandos separables.
+
+Si sobre una caja el integrando se factoriza como f(x)·g(y)·h(z) (o es una
+suma de términos así), la integral múltiple es el producto de integrales de
+una variable, que se calculan por separado y se guardan en caché. Así se
+evita arrastrar la expresión completa por cada pasada de sp.integrate.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import sympy as sp
+
+# Límite de operaciones para intentar expandir un integrando no separable
+MAX_OPERACIONES_EXPANSION = 200
+
+
+def _separar_termino(termino: sp.Expr, variables: Sequence[sp.Symbol]) -> Optional[Tuple[sp.Expr, Dict]]:
+    """Separa un término en (constante, {variable: factor}); None si no es separable."""
+    partes = sp.separatevars(termino, symbols=list(variables), dict=True)
+    if partes is None:
+        return None
+    constante = partes.pop('coeff')
+    return constante, {var: partes.get(var, sp.Integer(1)) for var in variables}
+
+
+def factorizar_separable(
+    expr: sp.Expr,
+    variables: Sequence[sp.Symbol]
+) -> Optional[List[Tuple[sp.Expr, Dict[sp.Symbol, sp.Expr]]]]:
+    """
+    Descompone un integrando en una suma de productos de factores de una variable.
+
+    Args:
+        expr: Integrando
+        variables: Variables de integración
+
+    Returns:
+        Lista de términos (constante, {variable: factor}) cuya suma es expr,
+        o None si algún término no es separable
+    """
+    expr = sp.sympify(expr)
+    completo = _separar_termino(expr, variables)
+    if completo is not None:
+        return [completo]
+
+    candidatos = [sp.Add.make_args(expr)]
+    if sp.count_ops(expr) <= MAX_OPERACIONES_EXPANSION:
+        candidatos.append(sp.Add.make_args(sp.expand(expr)))
+    for terminos in candidatos:
+        if len(terminos) < 2:
+            continue
+        separados = [_separar_termino(t, variables) for t in terminos]
+        if all(s is not None for s in separados):
+            return separados
+    return None
+
+
+@lru_cache(maxsize=512)
+def integral_1d(factor: sp.Expr, var: sp.Symbol, lim_inf: Any, lim_sup: Any) -> sp.Expr:
+    """Integral definida de una variable, guardada en caché."""
+    return sp.integrate(factor, (var, lim_inf, lim_sup))
+
+
+def integrar_separable(expr: sp.Expr, *limites: Tuple[sp.Symbol, Any, Any]) -> Optional[sp.Expr]:
+    """
+    Calcula una integral múltiple como producto de integrales de una variable.
+
+    Args:
+        expr: Integrando
+        *limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada
+
+    Returns:
+        Resultado simbólico, o None si los límites no forman una caja o el
+        integrando no es separable
+    """
+    variables = [lim[0] for lim in limites]
+    # Los límites no pueden depender de las variables de integración
+    for _, lim_inf, lim_sup in limites:
+        libres = sp.sympify(lim_inf).free_symbols | sp.sympify(lim_sup).free_symbols
+        if libres & set(variables):
+            return None
+
+    terminos = factorizar_separable(expr, variables)
+    if terminos is None:
+        return None
+
+    resultado = sp.Integer(0)
+    for constante, factores in terminos:
+        producto = constante
+        for var, lim_inf, lim_sup in limites:
+            producto *= integral_1d(factores[var], var, sp.sympify(lim_inf), sp.sympify(lim_sup))
+        resultado += producto
+    return resultado
@@ -0,0 +1,148 @@
+"""
+Módulo de análisis de simetría de integrales iteradas.
+
+Todo intervalo [a, b] es simétrico respecto a su punto medio c. Si el
+integrando es impar respecto a c en alguna variable, la integral es nula;
+si es par, basta integrar en [c, b] y multiplicar por 2. En las variables
+angulares que recorren un periodo completo (θ de 0 a 2π) se comprueba
+además la reflexión respecto a c - π/2, que corresponde a cambiar el signo
+de x en coordenadas cilíndricas y esféricas.
+"""
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+import sympy as sp
+
+# Tamaño máximo de las expresiones que se expanden para comparar reflexiones
+MAX_OPERACIONES_SIMETRIA = 400
+# Periodo de las variables angulares
+PERIODO_ANGULAR = 2 * sp.pi
+
+
+class Simetria(NamedTuple):
+    """Simetría detectada en una variable de integración."""
+    variable: sp.Symbol
+    tipo: str  # 'par' o 'impar'
+    centro: sp.Expr
+
+
+def _es_cero(expr: sp.Expr) -> bool:
+    """Comprueba si una expresión es idénticamente nula (sin simplificaciones costosas)."""
+    if expr == 0:
+        return True
+    if sp.count_ops(expr) > MAX_OPERACIONES_SIMETRIA:
+        return False
+    return sp.expand(expr) == 0
+
+
+def paridad(expr: sp.Expr, var: sp.Symbol, centro: Any = 0) -> Optional[str]:
+    """
+    Paridad de una expresión respecto a la reflexión var -> 2·centro - var.
+
+    Returns:
+        'par', 'impar' o None si no tiene ninguna de las dos
+    """
+    reflejada = expr.xreplace({var: 2 * sp.sympify(centro) - var})
+    if _es_cero(reflejada - expr):
+        return 'par'
+    if _es_cero(reflejada + expr):
+        return 'impar'
+    return None
+
+
+def _centro(lim_inf: sp.Expr, lim_sup: sp.Expr) -> Optional[sp.Expr]:
+    """Punto medio del intervalo, o None si solo uno de los extremos es infinito."""
+    if lim_inf == -sp.oo and lim_sup == sp.oo:
+        return sp.S.Zero
+    if not (lim_inf.is_finite and lim_sup.is_finite):
+        return None
+    return (lim_inf + lim_sup) / 2
+
+
+def _periodo_completo(expr: sp.Expr, var: sp.Symbol, lim_inf: sp.Expr, lim_sup: sp.Expr) -> bool:
+    """Indica si el intervalo abarca un periodo angular completo de la expresión."""
+    if not _es_cero(lim_sup - lim_inf - PERIODO_ANGULAR):
+        return False
+    return _es_cero(expr.xreplace({var: var + PERIODO_ANGULAR}) - expr)
+
+
+def analizar_simetria(func: sp.Expr, *limites: Tuple[sp.Symbol, Any, Any]) -> List[Simetria]:
+    """
+    Detecta las simetrías de una integral iterada, variable por variable.
+
+    Solo se analiza una variable si sus límites no dependen de las demás
+    variables de integración y los límites de las demás no dependen de ella,
+    de modo que la reflexión no altera la región.
+
+    Args:
+        func: Integrando
+        *limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada
+
+    Returns:
+        Lista de simetrías; si la integral es nula, termina con la primera 'impar'
+    """
+    func = sp.sympify(func)
+    variables = {lim[0] for lim in limites}
+    libres_limites = {
+        var: sp.sympify(lim_inf).free_symbols | sp.sympify(lim_sup).free_symbols
+        for var, lim_inf, lim_sup in limites
+    }
+
+    simetrias = []
+    for var, lim_inf, lim_sup in limites:
+        if var not in func.free_symbols or libres_limites[var] & variables:
+            continue
+        if any(var in libres for otra, libres in libres_limites.items() if otra != var):
+            continue
+        lim_inf, lim_sup = sp.sympify(lim_inf), sp.sympify(lim_sup)
+        centro = _centro(lim_inf, lim_sup)
+        if centro is None:
+            continue
+
+        tipo = paridad(func, var, centro)
+        if tipo != 'impar' and _periodo_completo(func, var, lim_inf, lim_sup):
+            # En un periodo completo cualquier eje de reflexión es válido para anular
+            eje = centro - sp.pi / 2
+            if paridad(func, var, eje) == 'impar':
+                return simetrias + [Simetria(var, 'impar', eje)]
+        if tipo == 'impar':
+            return simetrias + [Simetria(var, 'impar', centro)]
+        if tipo == 'par':
+            simetrias.append(Simetria(var, 'par', centro))
+    return simetrias
+
+
+def reducir_por_simetria(
+    func: sp.Expr,
+    *limites: Tuple[sp.Symbol, Any, Any]
+) -> Tuple[sp.Expr, List[Tuple[sp.Symbol, Any, Any]]]:
+    """
+    Aplica las simetrías detectadas a una integral iterada.
+
+    Args:
+        func: Integrando
+        *limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada
+
+    Returns:
+        Tupla (factor, limites): la integral original es factor por la integral
+        sobre los nuevos límites; factor 0 indica que la integral es nula
+    """
+    return aplicar_simetrias(analizar_simetria(func, *limites), limites)
+
+
+def aplicar_simetrias(
+    simetrias: List[Simetria],
+    limites: Sequence[Tuple[sp.Symbol, Any, Any]]
+) -> Tuple[sp.Expr, List[Tuple[sp.Symbol, Any, Any]]]:
+    """
+    Reduce los límites según unas simetrías ya detectadas (ver reducir_por_simetria).
+    """
+    if simetrias and simetrias[-1].tipo == 'impar':
+        return sp.S.Zero, list(limites)
+
+    # Variable par: [a, b] -> [c, b] con factor 2
+    centros = {s.variable: s.centro for s in simetrias}
+    reducidos = [
+        (var, centros[var], lim_sup) if var in centros else (var, lim_inf, lim_sup)
+        for var, lim_inf, lim_sup in limites
+    ]
+    return sp.Integer(2) ** len(simetrias), reducidos
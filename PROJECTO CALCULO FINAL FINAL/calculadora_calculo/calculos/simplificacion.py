@@ -0,0 +1,88 @@
+"""
+Módulo de simplificación por niveles de los resultados mostrados.
+
+sp.simplify prueba muchas transformaciones y a menudo tarda más que la
+propia integral. Los resultados se simplifican en dos niveles:
+
+- Rápido: cancel, together y (en árboles pequeños) trigsimp; se queda con la
+  forma más corta y nunca alarga la expresión. Se aplica al construir los
+  procedimientos.
+- Profundo: sp.simplify completo en un proceso trabajador con un presupuesto
+  de tiempo. La interfaz solo actualiza el resultado si termina a tiempo y
+  la expresión queda realmente más corta.
+"""
+from typing import Any, Callable, Optional
+
+import sympy as sp
+from sympy.functions.elementary.trigonometric import TrigonometricFunction
+
+from calculadora_calculo.calculos.cache import cacheado
+from calculadora_calculo.calculos.trabajos import reportar_etapa
+
+# Tamaño máximo (operaciones) de las expresiones a las que se aplica trigsimp
+MAX_OPERACIONES_TRIGSIMP = 60
+# Segundos que se dejan a la simplificación profunda
+PRESUPUESTO_SIMPLIFICACION = 5
+
+
+def tamano(expr: Any) -> int:
+    """Número de operaciones de una expresión, matriz o lista de ellas."""
+    if isinstance(expr, (list, tuple)):
+        return sum(tamano(e) for e in expr)
+    if isinstance(expr, sp.MatrixBase):
+        return sum(tamano(e) for e in expr)
+    return sp.count_ops(expr)
+
+
+def _aplicar(expr: Any, simplificador: Callable[[sp.Expr], sp.Expr]) -> Any:
+    """Aplica un simplificador elemento a elemento a matrices y listas."""
+    if isinstance(expr, (list, tuple)):
+        return type(expr)(_aplicar(e, simplificador) for e in expr)
+    if isinstance(expr, sp.MatrixBase):
+        return expr.applyfunc(simplificador)
+    return simplificador(sp.sympify(expr))
+
+
+def _rapido(expr: sp.Expr) -> sp.Expr:
+    candidatos = [expr]
+    transformaciones = [sp.cancel, sp.together]
+    if expr.has(TrigonometricFunction) and sp.count_ops(expr) <= MAX_OPERACIONES_TRIGSIMP:
+        transformaciones.append(sp.trigsimp)
+    for transformacion in transformaciones:
+        try:
+            candidatos.append(transformacion(expr))
+        except (sp.PolynomialError, TypeError, ValueError):
+            continue
+    # min conserva el primero en los empates: la expresión original
+    return min(candidatos, key=sp.count_ops)
+
+
+def simplificar_rapido(expr: Any) -> Any:
+    """
+    Simplificación inmediata y barata de un resultado.
+
+    Args:
+        expr: Expresión, matriz o lista de ellas
+
+    Returns:
+        La forma más corta entre la original y las de cancel, together y trigsimp
+    """
+    return _aplicar(expr, _rapido)
+
+
+@cacheado
+def simplificar_profundo(expr: Any) -> Optional[Any]:
+    """
+    Simplificación completa con sp.simplify (para un proceso trabajador).
+
+    Args:
+        expr: Expresión, matriz o lista de ellas
+
+    Returns:
+        La forma simplificada, o None si no es más corta que la que da
+        simplificar_rapido (la que ya se está mostrando)
+    """
+    rapida = simplificar_rapido(expr)
+    reportar_etapa("simplificación profunda")
+    simplificada = _aplicar(expr, sp.simplify)
+    return simplificada if tamano(simplificada) < tamano(rapida) else None
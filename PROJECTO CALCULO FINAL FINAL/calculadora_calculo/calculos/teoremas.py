@@ -6,6 +6,15 @@ Módulo para implementar los teoremas fundamentales del cálculo vectorial:
 """
 import sympy as sp
 from typing import Tuple, List, Dict, Any, Union
+from calculadora_calculo.calculos.integrales import integrar_iterada
+from calculadora_calculo.calculos.cubatura import ResultadoNumerico
+from calculadora_calculo.calculos.montecarlo import integrar_qmc
+from calculadora_calculo.calculos.trabajos import reportar_etapa
+from calculadora_calculo.calculos.cache import cacheado
+from calculadora_calculo.calculos.coordenadas import obtener_sistema
+from calculadora_calculo.calculos.polinomios import (
+    como_polinomio, integrar_polinomio_cilindro, integrar_polinomio_elipsoide, integrar_polinomio_esfera
+)
 
 # Símbolos comunes para coordenadas rectangulares
 x, y, z = sp.symbols('x y z', real=True)
@@ -17,11 +26,12 @@ r, theta = sp.symbols('r theta', real=True, nonnegative=True)
 rho, phi = sp.symbols('rho phi', real=True, nonnegative=True)
 
 # Vectores unitarios
-i_hat, j_hat, k_hat = sp.symbols('i j k', real=True, commutative=False)
-e_r, e_theta, e_z = sp.symbols('e_r e_theta e_z', real=True, commutative=False)
-e_rho, e_phi, e_theta_sph = sp.symbols('e_rho e_phi e_theta', real=True, commutative=False)
+i_hat, j_hat, k_hat = sp.symbols('i j k', commutative=False)
+e_r, e_theta, e_z = sp.symbols('e_r e_theta e_z', commutative=False)
+e_rho, e_phi, e_theta_sph = sp.symbols('e_rho e_phi e_theta', commutative=False)
 
 
+@cacheado
 def teorema_green(
     P: sp.Expr,
     Q: sp.Expr,
@@ -52,6 +62,10 @@ def teorema_green(
     if parametros is None:
         parametros = {}
     
+    # Variables polares (también para integrar sobre círculos y elipses en cartesianas)
+    r_sym = sp.symbols('r', real=True, positive=True)
+    theta_sym = sp.symbols('theta', real=True)
+    
     if sistema_coordenadas == 'cartesianas':
         # Teorema de Green estándar en coordenadas cartesianas
         dQ_dx = sp.diff(Q, x)
@@ -60,9 +74,6 @@ def teorema_green(
         
     elif sistema_coordenadas == 'polares':
         # Versión en coordenadas polares del teorema de Green
-        r_sym = sp.symbols('r', real=True, positive=True)
-        theta_sym = sp.symbols('theta', real=True)
-        
         # Convertir P y Q a coordenadas polares si es necesario
         # Asumimos que P y Q ya están en términos de r y theta
         # P = P(r, theta), Q = Q(r, theta)
@@ -85,9 +96,8 @@ def teorema_green(
             c = parametros.get('y_min', -1)
             d = parametros.get('y_max', 1)
             
-            resultado = sp.integrate(
-                sp.integrate(integrando, (y, c, d)),
-                (x, a, b)
+            resultado = integrar_iterada(
+                integrando, (y, c, d), (x, a, b)
             )
         else:  # polares
             r_min = parametros.get('r_min', 0)
@@ -95,9 +105,8 @@ def teorema_green(
             theta_min = parametros.get('theta_min', 0)
             theta_max = parametros.get('theta_max', 2*sp.pi)
             
-            resultado = sp.integrate(
-                sp.integrate(integrando * r_sym, (r_sym, r_min, r_max)),
-                (theta_sym, theta_min, theta_max)
+            resultado = integrar_iterada(
+                integrando * r_sym, (r_sym, r_min, r_max), (theta_sym, theta_min, theta_max)
             )
     
     elif region == 'circulo':
@@ -112,15 +121,13 @@ def teorema_green(
                 y: y0 + r_sym * sp.sin(theta_sym)
             }) * r_sym  # Jacobiano
             
-            resultado = sp.integrate(
-                sp.integrate(integrando_polar, (r_sym, 0, radio)),
-                (theta_sym, 0, 2*sp.pi)
+            resultado = integrar_iterada(
+                integrando_polar, (r_sym, 0, radio), (theta_sym, 0, 2*sp.pi)
             )
         else:  # polares
             # Asumimos que el círculo está centrado en el origen
-            resultado = sp.integrate(
-                sp.integrate(integrando * r_sym, (r_sym, 0, radio)),
-                (theta_sym, 0, 2*sp.pi)
+            resultado = integrar_iterada(
+                integrando * r_sym, (r_sym, 0, radio), (theta_sym, 0, 2*sp.pi)
             )
     
     elif region == 'elipse':
@@ -134,9 +141,8 @@ def teorema_green(
                 y: b * r_sym * sp.sin(theta_sym)
             }) * a * b * r_sym  # Jacobiano
             
-            resultado = sp.integrate(
-                sp.integrate(integrando_elip, (r_sym, 0, 1)),
-                (theta_sym, 0, 2*sp.pi)
+            resultado = integrar_iterada(
+                integrando_elip, (r_sym, 0, 1), (theta_sym, 0, 2*sp.pi)
             )
         else:  # polares
             # Para elipses en coordenadas polares, usamos coordenadas elípticas
@@ -145,18 +151,18 @@ def teorema_green(
                 r_sym: r_sym * sp.sqrt((a*sp.cos(theta_sym))**2 + (b*sp.sin(theta_sym))**2)
             }) * r_sym  # Jacobiano ya incluye la transformación
             
-            resultado = sp.integrate(
-                sp.integrate(integrando_elip, (r_sym, 0, 1)),
-                (theta_sym, 0, 2*sp.pi)
+            resultado = integrar_iterada(
+                integrando_elip, (r_sym, 0, 1), (theta_sym, 0, 2*sp.pi)
             )
     
     elif region == 'personalizada' and 'limites' in parametros:
         # Región personalizada con límites dados
         limites = parametros['limites']
         # Asumimos que limites es una lista de tuplas (lim_inf, lim_sup, var_integracion)
-        resultado = integrando
-        for lim_inf, lim_sup, var in reversed(limites):
-            resultado = sp.integrate(resultado, (var, lim_inf, lim_sup))
+        # La última tupla es la variable más interna
+        resultado = integrar_iterada(
+            integrando, *[(var, lim_inf, lim_sup) for lim_inf, lim_sup, var in reversed(limites)]
+        )
     
     else:
         raise ValueError(f"Tipo de región no soportado: {region}")
@@ -164,6 +170,7 @@ def teorema_green(
     return resultado
 
 
+@cacheado
 def teorema_stokes(
     F: Tuple[sp.Expr, sp.Expr, sp.Expr],
     superficie: str = 'plano',
@@ -191,7 +198,8 @@ def teorema_stokes(
             - Esférico: (F_ρ, F_φ, F_θ)
         superficie: Tipo de superficie ('plano', 'esfera', 'cilindro', 'cono', 'personalizada')
         parametros: Parámetros específicos de la superficie
-        sistema_coordenadas: 'cartesianas', 'cilindricas' o 'esfericas'
+        sistema_coordenadas: 'cartesianas', 'cilindricas', 'esfericas' u otro sistema
+            registrado en coordenadas.py ('toroidales'...)
         
     Returns:
         Resultado simbólico de la integral de superficie
@@ -201,31 +209,8 @@ def teorema_stokes(
     
     F1, F2, F3 = F
     
-    # Calcular el rotacional según el sistema de coordenadas
-    if sistema_coordenadas == 'cartesianas':
-        # ∇ × F en coordenadas cartesianas
-        rot_F1 = sp.diff(F3, y) - sp.diff(F2, z)
-        rot_F2 = sp.diff(F1, z) - sp.diff(F3, x)
-        rot_F3 = sp.diff(F2, x) - sp.diff(F1, y)
-        
-    elif sistema_coordenadas == 'cilindricas':
-        # ∇ × F en coordenadas cilíndricas
-        # F = (F_r, F_θ, F_z)
-        rot_r = (1/r) * sp.diff(F3, theta) - sp.diff(F2, z)
-        rot_theta = sp.diff(F1, z) - sp.diff(F3, r)
-        rot_z = (1/r) * (sp.diff(r*F2, r) - sp.diff(F1, theta))
-        rot_F1, rot_F2, rot_F3 = rot_r, rot_theta, rot_z
-        
-    elif sistema_coordenadas == 'esfericas':
-        # ∇ × F en coordenadas esféricas
-        # F = (F_ρ, F_φ, F_θ)
-        rot_rho = (1/(rho*sp.sin(phi))) * (sp.diff(sp.sin(phi)*F3, phi) - sp.diff(F2, theta))
-        rot_phi = (1/rho) * (1/sp.sin(phi) * sp.diff(F1, theta) - sp.diff(rho*F3, rho))
-        rot_theta = (1/rho) * (sp.diff(rho*F2, rho) - sp.diff(F1, phi))
-        rot_F1, rot_F2, rot_F3 = rot_rho, rot_phi, rot_theta
-        
-    else:
-        raise ValueError("Sistema de coordenadas no soportado. Use 'cartesianas', 'cilindricas' o 'esfericas'")
+    # ∇ × F con los factores de escala del sistema (F en componentes físicas)
+    rot_F1, rot_F2, rot_F3 = obtener_sistema(sistema_coordenadas).rotacional(F)
     
     # Definir la integral de superficie según el tipo de superficie
     if superficie == 'plano':
@@ -250,9 +235,8 @@ def teorema_stokes(
         dS = sp.sqrt(1 + a**2 + b**2)
         
         # Integrar sobre la región en el plano xy
-        resultado = sp.integrate(
-            sp.integrate(integrando * dS, (y, y_lim[0], y_lim[1])),
-            (x, x_lim[0], x_lim[1])
+        resultado = integrar_iterada(
+            integrando * dS, (y, y_lim[0], y_lim[1]), (x, x_lim[0], x_lim[1])
         )
     
     elif superficie == 'esfera':
@@ -263,19 +247,14 @@ def teorema_stokes(
         z0 = parametros.get('z0', 0)
         
         if sistema_coordenadas == 'cartesianas':
-            # Transformación a coordenadas esféricas
-            x_sph = x0 + rho * sp.sin(phi) * sp.cos(theta)
-            y_sph = y0 + rho * sp.sin(phi) * sp.sin(theta)
-            z_sph = z0 + rho * sp.cos(phi)
-            
             # Vector normal unitario (hacia afuera)
             n = (sp.sin(phi)*sp.cos(theta), sp.sin(phi)*sp.sin(theta), sp.cos(phi))
             
             # Evaluar el rotacional en las coordenadas esféricas
-            rot_F_sph = (
-                rot_F1.subs({x: x_sph, y: y_sph, z: z_sph}),
-                rot_F2.subs({x: x_sph, y: y_sph, z: z_sph}),
-                rot_F3.subs({x: x_sph, y: y_sph, z: z_sph})
+            esfericas = obtener_sistema('esfericas')
+            rot_F_sph = tuple(
+                esfericas.transformar(componente, origen=(x0, y0, z0))
+                for componente in (rot_F1, rot_F2, rot_F3)
             )
         else:
             # Ya estamos en coordenadas esféricas
@@ -290,21 +269,22 @@ def teorema_stokes(
         ) * rho**2 * sp.sin(phi)  # Jacobiano para esféricas
         
         # Integrar sobre la esfera
-        resultado = sp.integrate(
-            sp.integrate(integrando, (theta, 0, 2*sp.pi)),
-            (phi, 0, sp.pi)
+        resultado = integrar_iterada(
+            integrando, (theta, 0, 2*sp.pi), (phi, 0, sp.pi)
         )
     
     # Si no se reconoce la superficie, devolver el rotacional para que se calcule la integral de línea
     return rot_F1, rot_F2, rot_F3
 
 
+@cacheado
 def teorema_divergencia(
     F: Tuple[sp.Expr, sp.Expr, sp.Expr],
     region: str = 'cubo',
     parametros: Dict[str, Any] = None,
-    sistema_coordenadas: str = 'cartesianas'
-) -> sp.Expr:
+    sistema_coordenadas: str = 'cartesianas',
+    metodo: str = 'simbolico'
+) -> Union[sp.Expr, ResultadoNumerico]:
     """
     Aplica el Teorema de la Divergencia para calcular el flujo de un campo vectorial F
     a través de una superficie cerrada S como la integral de volumen de la divergencia
@@ -326,35 +306,29 @@ def teorema_divergencia(
             - Esférico: (F_ρ, F_φ, F_θ)
         region: Tipo de región ('cubo', 'esfera', 'cilindro', 'elipsoide', 'personalizada')
         parametros: Parámetros específicos de la región
-        sistema_coordenadas: 'cartesianas', 'cilindricas' o 'esfericas'
+        sistema_coordenadas: 'cartesianas', 'cilindricas', 'esfericas' u otro sistema
+            registrado en coordenadas.py ('toroidales'...)
+        metodo: 'simbolico' o 'qmc' (cuasi-Monte Carlo, solo para regiones personalizadas;
+            admite 'tolerancia' en parametros)
         
     Returns:
-        Resultado simbólico de la integral de volumen
+        Resultado simbólico de la integral de volumen, o ResultadoNumerico con 'qmc'
     """
     if parametros is None:
         parametros = {}
     
     F1, F2, F3 = F
     
-    # Calcular la divergencia según el sistema de coordenadas
-    if sistema_coordenadas == 'cartesianas':
-        # ∇·F en coordenadas cartesianas
-        div_F = sp.diff(F1, x) + sp.diff(F2, y) + sp.diff(F3, z)
-        
-    elif sistema_coordenadas == 'cilindricas':
-        # ∇·F en coordenadas cilíndricas
-        # F = (F_r, F_θ, F_z)
-        div_F = (1/r) * sp.diff(r*F1, r) + (1/r) * sp.diff(F2, theta) + sp.diff(F3, z)
-        
-    elif sistema_coordenadas == 'esfericas':
-        # ∇·F en coordenadas esféricas
-        # F = (F_ρ, F_φ, F_θ)
-        div_F = (1/rho**2) * sp.diff(rho**2 * F1, rho) + \
-                (1/(rho*sp.sin(phi))) * sp.diff(sp.sin(phi)*F2, phi) + \
-                (1/(rho*sp.sin(phi))) * sp.diff(F3, theta)
-    else:
-        raise ValueError("Sistema de coordenadas no soportado. Use 'cartesianas', 'cilindricas' o 'esfericas'")
+    # ∇·F con los factores de escala del sistema (F en componentes físicas)
+    sistema = obtener_sistema(sistema_coordenadas)
+    div_F = sistema.divergencia(F)
     
+    # Divergencia polinómica sobre una región estándar: fórmula cerrada por monomios
+    if sistema_coordenadas == 'cartesianas' and region in ('esfera', 'cilindro', 'elipsoide'):
+        resultado = _divergencia_polinomica(div_F, region, parametros)
+        if resultado is not None:
+            return resultado
+
     # Definir la integral de volumen según el tipo de región
     if region == 'cubo':
         if sistema_coordenadas == 'cartesianas':
@@ -367,12 +341,9 @@ def teorema_divergencia(
             f = parametros.get('z_max', 1)
             
             # Integrar sobre el cubo
-            resultado = sp.integrate(
-                sp.integrate(
-                    sp.integrate(div_F, (z, e, f)),
-                    (y, c, d)
-                ),
-                (x, a, b)
+            resultado = integrar_iterada(
+                div_F,
+                (z, e, f), (y, c, d), (x, a, b)
             )
         else:
             # Para otros sistemas de coordenadas, usar la región apropiada
@@ -382,28 +353,20 @@ def teorema_divergencia(
         # Esfera de radio r centrada en (x0, y0, z0)
         radio = parametros.get('radio', 1)
         
+        esfericas = obtener_sistema('esfericas')
         if sistema_coordenadas == 'cartesianas':
             x0 = parametros.get('x0', 0)
             y0 = parametros.get('y0', 0)
             z0 = parametros.get('z0', 0)
             
-            # Transformación a coordenadas esféricas
-            x_sph = x0 + rho * sp.sin(phi) * sp.cos(theta)
-            y_sph = y0 + rho * sp.sin(phi) * sp.sin(theta)
-            z_sph = z0 + rho * sp.cos(phi)
-            
             # Evaluar la divergencia en coordenadas esféricas
-            div_F_sph = div_F.subs({
-                x: x_sph,
-                y: y_sph,
-                z: z_sph
-            })
+            div_F_sph = esfericas.transformar(div_F, origen=(x0, y0, z0))
         else:
             # Ya estamos en coordenadas esféricas o cilíndricas
             div_F_sph = div_F
         
         # Jacobiano para coordenadas esféricas: ρ²·sin(φ)
-        jacobiano = rho**2 * sp.sin(phi)
+        jacobiano = esfericas.jacobiano
         
         # Límites para la esfera
         rho_lim = (0, radio)
@@ -411,12 +374,9 @@ def teorema_divergencia(
         theta_lim = (0, 2*sp.pi)
         
         # Integrar sobre la esfera
-        resultado = sp.integrate(
-            sp.integrate(
-                sp.integrate(div_F_sph * jacobiano, (rho, *rho_lim)),
-                (phi, *phi_lim)
-            ),
-            (theta, *theta_lim)
+        resultado = integrar_iterada(
+            div_F_sph * jacobiano,
+            (rho, *rho_lim), (phi, *phi_lim), (theta, *theta_lim)
         )
     
     elif region == 'cilindro':
@@ -425,25 +385,19 @@ def teorema_divergencia(
         altura = parametros.get('altura', 2)
         
         if sistema_coordenadas in ['cartesianas', 'cilindricas']:
+            cilindricas = obtener_sistema('cilindricas')
             if sistema_coordenadas == 'cartesianas':
                 x0 = parametros.get('x0', 0)
                 y0 = parametros.get('y0', 0)
                 
-                # Transformación a coordenadas cilíndricas
-                x_cyl = x0 + r * sp.cos(theta)
-                y_cyl = y0 + r * sp.sin(theta)
-                
                 # Evaluar la divergencia en coordenadas cilíndricas
-                div_F_cyl = div_F.subs({
-                    x: x_cyl,
-                    y: y_cyl
-                })
+                div_F_cyl = cilindricas.transformar(div_F, origen=(x0, y0, 0))
             else:
                 # Ya estamos en coordenadas cilíndricas
                 div_F_cyl = div_F
             
             # Jacobiano para coordenadas cilíndricas: r
-            jacobiano = r
+            jacobiano = cilindricas.jacobiano
             
             # Límites para el cilindro
             r_lim = (0, radio)
@@ -451,12 +405,9 @@ def teorema_divergencia(
             z_lim = (-altura/2, altura/2)
             
             # Integrar sobre el cilindro
-            resultado = sp.integrate(
-                sp.integrate(
-                    sp.integrate(div_F_cyl * jacobiano, (r, *r_lim)),
-                    (theta, *theta_lim)
-                ),
-                (z, *z_lim)
+            resultado = integrar_iterada(
+                div_F_cyl * jacobiano,
+                (r, *r_lim), (theta, *theta_lim), (z, *z_lim)
             )
         else:
             raise NotImplementedError("Cilindro no soportado en coordenadas esféricas")
@@ -469,22 +420,14 @@ def teorema_divergencia(
         
         if sistema_coordenadas == 'cartesianas':
             # Usar coordenadas esféricas modificadas para el elipsoide
-            r_sym = sp.symbols('r', real=True, nonnegative=True)
-            
-            # Transformación a coordenadas elipsoidales
-            x_elip = a * r_sym * sp.sin(phi) * sp.cos(theta)
-            y_elip = b * r_sym * sp.sin(phi) * sp.sin(theta)
-            z_elip = c * r_sym * sp.cos(phi)
+            elipsoidales = obtener_sistema('elipsoidales', a=a, b=b, c=c)
+            r_sym = elipsoidales.variables[0]
             
             # Evaluar la divergencia en coordenadas elipsoidales
-            div_F_elip = div_F.subs({
-                x: x_elip,
-                y: y_elip,
-                z: z_elip
-            })
+            div_F_elip = elipsoidales.transformar(div_F)
             
             # Jacobiano para coordenadas elipsoidales: a·b·c·r²·sin(φ)
-            jacobiano = a * b * c * r_sym**2 * sp.sin(phi)
+            jacobiano = elipsoidales.jacobiano
             
             # Límites para el elipsoide
             r_lim = (0, 1)
@@ -492,12 +435,9 @@ def teorema_divergencia(
             theta_lim = (0, 2*sp.pi)
             
             # Integrar sobre el elipsoide
-            resultado = sp.integrate(
-                sp.integrate(
-                    sp.integrate(div_F_elip * jacobiano, (r_sym, *r_lim)),
-                    (phi, *phi_lim)
-                ),
-                (theta, *theta_lim)
+            resultado = integrar_iterada(
+                div_F_elip * jacobiano,
+                (r_sym, *r_lim), (phi, *phi_lim), (theta, *theta_lim)
             )
         else:
             raise NotImplementedError("Elipsoide solo soportado en coordenadas cartesianas")
@@ -506,17 +446,51 @@ def teorema_divergencia(
         # Región personalizada con límites dados
         limites = parametros['limites']
         # Asumimos que limites es una lista de tuplas (lim_inf, lim_sup, var_integracion)
-        resultado = div_F
-        for lim_inf, lim_sup, var in reversed(limites):
-            # Aplicar el jacobiano apropiado según la variable de integración
-            if var == r or var == rho:
-                resultado = resultado * var  # r·dr o ρ·dρ
-            elif var == phi:
-                resultado = resultado * sp.sin(phi)  # sin(φ)·dφ
-            
-            resultado = sp.integrate(resultado, (var, lim_inf, lim_sup))
+        # Jacobiano del sistema de coordenadas (r en cilíndricas, ρ²·sin(φ) en esféricas)
+        integrando = div_F * sistema.jacobiano
+        
+        # La última tupla es la variable más interna
+        limites_iterada = [(var, lim_inf, lim_sup) for lim_inf, lim_sup, var in reversed(limites)]
+        if metodo == 'qmc':
+            reportar_etapa("integración cuasi-Monte Carlo")
+            resultado = integrar_qmc(
+                integrando, *limites_iterada, tolerancia=parametros.get('tolerancia')
+            )
+        else:
+            resultado = integrar_iterada(integrando, *limites_iterada)
     
     else:
         raise ValueError(f"Tipo de región no soportado: {region}")
     
     return resultado
+
+
+def _divergencia_polinomica(div_F: sp.Expr, region: str, parametros: Dict[str, Any]) -> Union[sp.Expr, None]:
+    """
+    Integra una divergencia polinómica (en x, y, z) sobre una esfera, cilindro o elipsoide.
+
+    Usa los mismos parámetros y valores por defecto que teorema_divergencia.
+
+    Returns:
+        Resultado exacto, o None si la divergencia no es un polinomio
+    """
+    if como_polinomio(div_F, (x, y, z)) is None:
+        return None
+
+    reportar_etapa("integración polinómica")
+    if region == 'esfera':
+        centro = (parametros.get('x0', 0), parametros.get('y0', 0), parametros.get('z0', 0))
+        return integrar_polinomio_esfera(div_F, parametros.get('radio', 1), centro)
+    if region == 'cilindro':
+        altura = parametros.get('altura', 2)
+        return integrar_polinomio_cilindro(
+            div_F, parametros.get('radio', 1), (-altura/2, altura/2),
+            (parametros.get('x0', 0), parametros.get('y0', 0))
+        )
+    # Elipsoide centrado en el origen; el jacobiano a·b·c lo aplica la fórmula
+    semiejes = (
+        parametros.get('semi_eje_x', 2),
+        parametros.get('semi_eje_y', 1.5),
+        parametros.get('semi_eje_z', 1)
+    )
+    return integrar_polinomio_elipsoide(div_F, semiejes)
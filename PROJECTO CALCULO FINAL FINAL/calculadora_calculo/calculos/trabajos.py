@@ -0,0 +1,387 @@
+"""
+Módulo para ejecutar cálculos simbólicos en procesos trabajadores independientes.
+
+Cada trabajador es un proceso persistente que recibe trabajos por una tubería,
+de modo que varios cálculos pueden correr a la vez en núcleos distintos y un
+trabajo en curso puede cancelarse terminando su proceso.
+
+Los trabajos pueden tener un presupuesto de tiempo por etapa y de memoria. Las
+funciones de cálculo anuncian la etapa en curso con reportar_etapa(); si una
+etapa excede su presupuesto, el proceso trabajador se termina y el futuro
+recibe un PresupuestoExcedido que indica la etapa responsable. Los cálculos
+largos pueden además enviar resultados parciales con reportar_progreso().
+"""
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, CancelledError
+from typing import Any, Callable, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: sin límite de memoria por proceso
+    resource = None
+
+# Contexto 'spawn': no se hereda el estado de Qt del proceso principal
+_CONTEXTO = mp.get_context('spawn')
+
+# Identificadores de trabajo únicos en el proceso, aunque haya varios pools
+_contador_trabajos = itertools.count(1)
+
+# Estado del trabajo en curso dentro de un proceso trabajador
+_conexion_actual = None
+_id_actual = None
+_etapa_actual = None
+
+
+class PresupuestoExcedido(RuntimeError):
+    """Un trabajo superó su presupuesto de tiempo o de memoria."""
+
+    def __init__(self, recurso: str, limite, etapa: Optional[str]):
+        self.recurso = recurso
+        self.limite = limite
+        self.etapa = etapa
+        if recurso == 'tiempo':
+            detalle = f"Tiempo agotado ({limite:g} s)"
+        else:
+            detalle = f"Memoria agotada ({limite / 2**20:.0f} MiB)"
+        if etapa:
+            detalle += f" en la etapa: {etapa}"
+        super().__init__(detalle)
+
+
+def reportar_etapa(nombre: str) -> None:
+    """
+    Anuncia la etapa de cálculo que empieza (p. ej. 'integración respecto a z').
+
+    El presupuesto de tiempo se mide por etapa. Fuera de un proceso trabajador
+    la llamada no tiene efecto.
+    """
+    global _etapa_actual
+    _etapa_actual = nombre
+    if _conexion_actual is not None:
+        _conexion_actual.send(('etapa', _id_actual, nombre))
+
+
+def reportar_progreso(dato: Any) -> None:
+    """
+    Envía un resultado parcial del trabajo en curso (p. ej. una estimación que se refina).
+
+    El dato debe poder serializarse con pickle. Fuera de un proceso trabajador
+    la llamada no tiene efecto.
+    """
+    if _conexion_actual is not None:
+        _conexion_actual.send(('progreso', _id_actual, dato))
+
+
+def _memoria_virtual_actual() -> Optional[int]:
+    """Tamaño virtual actual del proceso en bytes (solo Linux)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _limitar_memoria(limite: Optional[int]):
+    """Aplica un límite de espacio de direcciones sobre el uso actual; devuelve el límite previo."""
+    if resource is None or limite is None:
+        return None
+    base = _memoria_virtual_actual()
+    if base is None:
+        return None
+    previo = resource.getrlimit(resource.RLIMIT_AS)
+    duro = previo[1]
+    nuevo = base + limite
+    if duro != resource.RLIM_INFINITY:
+        nuevo = min(nuevo, duro)
+    resource.setrlimit(resource.RLIMIT_AS, (nuevo, duro))
+    return previo
+
+
+def _bucle_trabajador(conexion, prioridad: int = 0) -> None:
+    """Bucle principal de un proceso trabajador: recibe trabajos y devuelve resultados."""
+    global _conexion_actual, _id_actual, _etapa_actual
+    if prioridad and hasattr(os, 'nice'):
+        # Sin os.nice (Windows) el trabajador conserva la prioridad normal
+        os.nice(prioridad)
+    while True:
+        try:
+            mensaje = conexion.recv()
+        except (EOFError, OSError):
+            break
+        if mensaje is None:
+            break
+
+        id_trabajo, funcion, args, kwargs, limite_memoria = mensaje
+        _conexion_actual, _id_actual, _etapa_actual = conexion, id_trabajo, None
+        previo = _limitar_memoria(limite_memoria)
+        try:
+            resultado = funcion(*args, **kwargs)
+            respuesta = ('ok', id_trabajo, resultado)
+        except MemoryError:
+            respuesta = ('memoria', id_trabajo, _etapa_actual)
+        except Exception as e:
+            respuesta = ('error', id_trabajo, f"{type(e).__name__}: {e}")
+        finally:
+            if previo is not None:
+                resource.setrlimit(resource.RLIMIT_AS, previo)
+            _conexion_actual = None
+
+        try:
+            conexion.send(respuesta)
+        except Exception as e:
+            # El resultado no se pudo serializar
+            conexion.send(('error', id_trabajo, f"Resultado no serializable: {e}"))
+
+
+class FuturoTrabajo(Future):
+    """Future de un trabajo enviado al pool; permite cancelar trabajos en curso."""
+
+    def __init__(self, id_trabajo: int):
+        super().__init__()
+        self.id_trabajo = id_trabajo
+        self.cancelacion_solicitada = False
+        # Última etapa y último resultado parcial anunciados por el trabajo
+        self.etapa = None
+        self.progreso = None
+
+    def cancel(self) -> bool:
+        """
+        Cancela el trabajo. Si aún no empezó, se descarta; si está en curso,
+        su proceso trabajador se termina y el futuro recibe un CancelledError.
+        """
+        if super().cancel():
+            return True
+        if self.done():
+            return False
+        self.cancelacion_solicitada = True
+        return True
+
+
+class _Trabajo:
+    """Trabajo pendiente en la cola del pool."""
+
+    def __init__(self, futuro: FuturoTrabajo, funcion: Callable, args: tuple, kwargs: dict,
+                 limite_tiempo: Optional[float], limite_memoria: Optional[int]):
+        self.futuro = futuro
+        self.funcion = funcion
+        self.args = args
+        self.kwargs = kwargs
+        self.limite_tiempo = limite_tiempo
+        self.limite_memoria = limite_memoria
+
+
+class PoolTrabajos:
+    """
+    Pool de procesos trabajadores persistentes.
+
+    Cada trabajador tiene un hilo de supervisión en el proceso principal que
+    toma trabajos de la cola, los envía al proceso y espera la respuesta. Los
+    procesos se crean de forma perezosa y se reemplazan cuando se cancelan.
+    """
+
+    # Intervalo (s) con el que el supervisor revisa cancelaciones
+    INTERVALO_SONDEO = 0.05
+
+    def __init__(
+        self,
+        max_trabajadores: Optional[int] = None,
+        limite_tiempo: Optional[float] = None,
+        limite_memoria: Optional[int] = None,
+        prioridad: int = 0
+    ):
+        """
+        Args:
+            max_trabajadores: Número de procesos (por defecto, núcleos - 1)
+            limite_tiempo: Presupuesto por defecto en segundos para cada etapa
+            limite_memoria: Presupuesto por defecto de memoria adicional en bytes
+            prioridad: Incremento de 'nice' de los procesos (p. ej. 19 para
+                trabajos de fondo que no deben quitar CPU a los demás)
+        """
+        if max_trabajadores is None:
+            max_trabajadores = max(1, (os.cpu_count() or 2) - 1)
+        self.max_trabajadores = max_trabajadores
+        self.limite_tiempo = limite_tiempo
+        self.limite_memoria = limite_memoria
+        self.prioridad = prioridad
+        self._cola = queue.Queue()
+        self._cerrado = False
+        self._callbacks_inicio = []
+        self._callbacks_etapa = []
+        self._callbacks_progreso = []
+        self._hilos = []
+        for i in range(max_trabajadores):
+            hilo = threading.Thread(
+                target=self._supervisar, name=f"trabajador-{i}", daemon=True
+            )
+            hilo.start()
+            self._hilos.append(hilo)
+
+    def al_iniciar(self, callback: Callable[[FuturoTrabajo], None]) -> None:
+        """Registra un callback que se invoca cuando un trabajo empieza a ejecutarse."""
+        self._callbacks_inicio.append(callback)
+
+    def al_cambiar_etapa(self, callback: Callable[[FuturoTrabajo, str], None]) -> None:
+        """Registra un callback que se invoca cuando un trabajo anuncia una etapa nueva."""
+        self._callbacks_etapa.append(callback)
+
+    def al_progresar(self, callback: Callable[[FuturoTrabajo, Any], None]) -> None:
+        """Registra un callback que se invoca con cada resultado parcial de un trabajo."""
+        self._callbacks_progreso.append(callback)
+
+    def enviar(
+        self,
+        funcion: Callable,
+        *args,
+        limite_tiempo: Optional[float] = None,
+        limite_memoria: Optional[int] = None,
+        **kwargs
+    ) -> FuturoTrabajo:
+        """
+        Envía un trabajo al pool.
+
+        Args:
+            funcion: Función a nivel de módulo (debe poder serializarse con pickle)
+            *args, **kwargs: Argumentos de la función
+            limite_tiempo: Segundos máximos por etapa (None usa el del pool)
+            limite_memoria: Bytes adicionales máximos (None usa el del pool)
+
+        Returns:
+            Futuro asociado al trabajo
+        """
+        if self._cerrado:
+            raise RuntimeError("El pool de trabajos está cerrado")
+        if limite_tiempo is None:
+            limite_tiempo = self.limite_tiempo
+        if limite_memoria is None:
+            limite_memoria = self.limite_memoria
+        futuro = FuturoTrabajo(self.reservar_id())
+        self._cola.put(_Trabajo(futuro, funcion, args, kwargs, limite_tiempo, limite_memoria))
+        return futuro
+
+    def reservar_id(self) -> int:
+        """Reserva un identificador de trabajo único (p. ej. para un futuro que agrupa varios trabajos)."""
+        return next(_contador_trabajos)
+
+    def cerrar(self) -> None:
+        """Detiene los trabajadores y cancela los trabajos pendientes (llamarlo otra vez no hace nada)."""
+        # La cola ya contiene los centinelas None de la primera llamada
+        if self._cerrado:
+            return
+        self._cerrado = True
+        # Descartar lo pendiente
+        while True:
+            try:
+                trabajo = self._cola.get_nowait()
+            except queue.Empty:
+                break
+            trabajo.futuro.cancel()
+        for _ in self._hilos:
+            self._cola.put(None)
+
+    # Métodos internos
+    def _iniciar_proceso(self):
+        """Crea un proceso trabajador nuevo y devuelve (proceso, conexión)."""
+        conexion_padre, conexion_hijo = _CONTEXTO.Pipe()
+        proceso = _CONTEXTO.Process(
+            target=_bucle_trabajador, args=(conexion_hijo, self.prioridad), daemon=True
+        )
+        proceso.start()
+        conexion_hijo.close()
+        return proceso, conexion_padre
+
+    def _terminar_proceso(self, proceso, conexion) -> None:
+        """Termina un proceso trabajador de forma inmediata."""
+        try:
+            conexion.close()
+        except OSError:
+            pass
+        if proceso.is_alive():
+            proceso.kill()
+        proceso.join(timeout=1)
+
+    def _supervisar(self) -> None:
+        """Hilo supervisor de un trabajador."""
+        proceso, conexion = None, None
+        while True:
+            trabajo = self._cola.get()
+            if trabajo is None:
+                break
+            futuro = trabajo.futuro
+            if not futuro.set_running_or_notify_cancel():
+                continue
+
+            for callback in self._callbacks_inicio:
+                callback(futuro)
+
+            if proceso is None or not proceso.is_alive():
+                proceso, conexion = self._iniciar_proceso()
+
+            exceso = None
+            try:
+                conexion.send((futuro.id_trabajo, trabajo.funcion, trabajo.args,
+                               trabajo.kwargs, trabajo.limite_memoria))
+                inicio_etapa = time.monotonic()
+                respuesta = None
+                while respuesta is None:
+                    if futuro.cancelacion_solicitada:
+                        break
+                    if conexion.poll(self.INTERVALO_SONDEO):
+                        mensaje = conexion.recv()
+                        if mensaje[0] == 'etapa':
+                            futuro.etapa = mensaje[2]
+                            inicio_etapa = time.monotonic()
+                            for callback in self._callbacks_etapa:
+                                callback(futuro, futuro.etapa)
+                        elif mensaje[0] == 'progreso':
+                            futuro.progreso = mensaje[2]
+                            for callback in self._callbacks_progreso:
+                                callback(futuro, futuro.progreso)
+                        elif mensaje[0] == 'memoria':
+                            exceso = PresupuestoExcedido('memoria', trabajo.limite_memoria, mensaje[2])
+                            break
+                        else:
+                            respuesta = mensaje
+                    elif not proceso.is_alive():
+                        raise RuntimeError("El proceso trabajador terminó inesperadamente")
+                    elif (trabajo.limite_tiempo is not None
+                          and time.monotonic() - inicio_etapa > trabajo.limite_tiempo):
+                        exceso = PresupuestoExcedido('tiempo', trabajo.limite_tiempo, futuro.etapa)
+                        break
+            except Exception as e:
+                self._terminar_proceso(proceso, conexion)
+                proceso, conexion = None, None
+                futuro.set_exception(RuntimeError(str(e)))
+                continue
+
+            if exceso is not None:
+                # Presupuesto excedido: el proceso se descarta
+                self._terminar_proceso(proceso, conexion)
+                proceso, conexion = None, None
+                futuro.set_exception(exceso)
+                continue
+
+            if respuesta is None:
+                # Cancelación de un trabajo en curso: terminar el proceso
+                self._terminar_proceso(proceso, conexion)
+                proceso, conexion = None, None
+                futuro.set_exception(CancelledError())
+                continue
+
+            estado, _, contenido = respuesta
+            if estado == 'ok':
+                futuro.set_result(contenido)
+            else:
+                futuro.set_exception(RuntimeError(contenido))
+
+        if proceso is not None:
+            try:
+                conexion.send(None)
+            except OSError:
+                pass
+            proceso.join(timeout=1)
+            self._terminar_proceso(proceso, conexion)
@@ -0,0 +1,159 @@
+"""
+Módulo de verificación numérica de los resultados simbólicos.
+
+SymPy devuelve a veces formas cerradas incorrectas (ramas de Piecewise mal
+elegidas, problemas de rama tras el cambio a esféricas...). Una vez mostrado
+un resultado simbólico, la interfaz calcula la misma integral con un motor
+numérico en un trabajador de baja prioridad y compara ambos valores.
+
+Los motores se prueban del más barato al más caro y se detiene en el primero
+cuya estimación de error cumple la tolerancia:
+
+- Gauss-Legendre de orden 8 y de orden 16 (solo sobre cajas).
+- Tanh-sinh en los ejes con singularidades en los extremos (cajas).
+- Cubatura adaptativa de Genz-Malik (cajas de dos o más dimensiones).
+- Cuasi-Monte Carlo (límites que dependen de otras variables).
+- Tanh-sinh de mpmath con las cifras que pide la tolerancia.
+"""
+import math
+from typing import Any, Callable, Iterator, NamedTuple, Optional, Tuple
+
+import sympy as sp
+
+from calculadora_calculo.calculos.cubatura import (
+    ResultadoNumerico, integrar_adaptativa, integrar_doble_exponencial, integrar_gauss_legendre
+)
+from calculadora_calculo.calculos.montecarlo import integrar_qmc
+from calculadora_calculo.calculos.precision import integrar_precision
+from calculadora_calculo.calculos.trabajos import reportar_etapa
+
+# Error relativo admitido entre el resultado simbólico y el numérico
+TOLERANCIA_VERIFICACION = 1e-6
+# Órdenes de Gauss-Legendre que se prueban antes de la cubatura adaptativa
+ORDENES_GAUSS = (8, 16)
+
+
+class ResultadoVerificacion(NamedTuple):
+    """Comparación de un resultado simbólico con su cálculo numérico."""
+    simbolico: complex
+    numerico: ResultadoNumerico
+    diferencia: float
+    tolerancia: float
+    concluyente: bool
+
+    @property
+    def coincide(self) -> bool:
+        """Si la diferencia cabe en la tolerancia más el error del motor numérico."""
+        return self.diferencia <= self.tolerancia + self.numerico.error_estimado
+
+    def describir(self) -> str:
+        estado = "coincide" if self.coincide else "NO coincide"
+        if not self.concluyente:
+            estado += " (el motor numérico no alcanzó la tolerancia)"
+        return (f"Verificación numérica: {estado}; {self.numerico.metodo} da "
+                f"{self.numerico.valor:.10g} ± {self.numerico.error_estimado:.2g} "
+                f"(diferencia {self.diferencia:.2g})")
+
+
+def _valor_simbolico(resultado: Any) -> Optional[complex]:
+    """Valor numérico de un resultado simbólico, o None si no se puede verificar."""
+    if isinstance(resultado, ResultadoNumerico):
+        return None
+    try:
+        resultado = sp.sympify(resultado)
+    except (sp.SympifyError, TypeError):
+        return None
+    if not resultado.is_number or resultado.has(sp.Integral, sp.nan, sp.zoo, sp.oo, -sp.oo):
+        return None
+    try:
+        valor = complex(sp.N(resultado))
+    except (TypeError, ValueError):
+        return None
+    return valor if math.isfinite(abs(valor)) else None
+
+
+def _motores(
+    integrando: sp.Expr,
+    limites: Tuple[Tuple[sp.Symbol, Any, Any], ...],
+    objetivo: float,
+    tolerancia: float
+) -> Iterator[Tuple[str, Callable[[], ResultadoNumerico]]]:
+    """Motores numéricos aplicables, del más barato al más caro."""
+    variables = {lim[0] for lim in limites}
+    caja = not any((sp.sympify(lim_inf).free_symbols | sp.sympify(lim_sup).free_symbols) & variables
+                   for _, lim_inf, lim_sup in limites)
+    if caja:
+        for orden in ORDENES_GAUSS:
+            yield ("Gauss-Legendre", lambda orden=orden: integrar_gauss_legendre(integrando, *limites, orden=orden))
+        yield ("tanh-sinh", lambda: integrar_doble_exponencial(
+            integrando, *limites, tolerancia_abs=objetivo, tolerancia_rel=0.0
+        ))
+        if len(limites) >= 2:
+            yield ("cubatura adaptativa", lambda: integrar_adaptativa(
+                integrando, *limites, tolerancia_abs=objetivo, tolerancia_rel=0.0
+            ))
+    else:
+        yield ("cuasi-Monte Carlo", lambda: integrar_qmc(integrando, *limites, tolerancia=objetivo, semilla=0))
+
+    def alta_precision() -> ResultadoNumerico:
+        resultado = integrar_precision(integrando, *limites, digitos=max(8, math.ceil(-math.log10(tolerancia)) + 2))
+        return ResultadoNumerico(
+            valor=float(resultado.valor),
+            error_estimado=float(resultado.error_estimado),
+            evaluaciones=resultado.evaluaciones,
+            metodo=resultado.metodo,
+        )
+    yield ("tanh-sinh de mpmath", alta_precision)
+
+
+def verificar_resultado(
+    resultado: Any,
+    integrando: sp.Expr,
+    *limites: Tuple[sp.Symbol, Any, Any],
+    tolerancia: float = TOLERANCIA_VERIFICACION
+) -> Optional[ResultadoVerificacion]:
+    """
+    Compara un resultado simbólico con la misma integral calculada numéricamente.
+
+    Args:
+        resultado: Forma cerrada que se quiere comprobar
+        integrando: Integrando (con el jacobiano incluido)
+        *limites: Tuplas (variable, mínimo, máximo) como en integrar_iterada
+        tolerancia: Error relativo admitido (absoluto si el resultado es menor que 1)
+
+    Returns:
+        ResultadoVerificacion, o None si el resultado no es un número (tiene
+        parámetros, integrales sin evaluar o ya es numérico) o ningún motor
+        numérico pudo calcular la integral
+    """
+    simbolico = _valor_simbolico(resultado)
+    if simbolico is None:
+        return None
+    variables = {lim[0] for lim in limites}
+    if sp.sympify(integrando).free_symbols - variables:
+        return None
+
+    objetivo = tolerancia * max(1.0, abs(simbolico))
+    mejor = None
+    for nombre, motor in _motores(sp.sympify(integrando), limites, objetivo, tolerancia):
+        reportar_etapa(f"verificación numérica ({nombre})")
+        try:
+            numerico = motor()
+        except (ValueError, TypeError, ZeroDivisionError, ArithmeticError):
+            continue
+        if not math.isfinite(numerico.valor) or not math.isfinite(numerico.error_estimado):
+            continue
+        if mejor is None or numerico.error_estimado < mejor.error_estimado:
+            mejor = numerico
+        if numerico.error_estimado <= objetivo:
+            break
+    if mejor is None:
+        return None
+
+    return ResultadoVerificacion(
+        simbolico=simbolico,
+        numerico=mejor,
+        diferencia=abs(simbolico - mejor.valor),
+        tolerancia=objetivo,
+        concluyente=mejor.error_estimado <= objetivo,
+    )
@@ -7,6 +7,8 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout
 from PySide6.QtCore import Qt
 import sympy as sp
 
+from calculadora_calculo.calculos.nativo import nucleo_nativo
+
 # Símbolos comunes
 x, y, z = sp.symbols('x y z', real=True)
 
@@ -93,8 +95,8 @@ class Visualizador3D(QWidget):
             y_range: Tupla (y_min, y_max) para el rango de y
             num_points: Número de puntos en cada dirección para la malla
         """
-        # Convertir la función simbólica a una función numérica
-        f_np = sp.lambdify((x, y), func, 'numpy')
+        # Convertir la función simbólica a una función numérica (compilada una sola vez)
+        f_np = nucleo_nativo(func, (x, y))
         
         # Crear la malla de puntos
         x_vals = np.linspace(x_range[0], x_range[1], num_points)
@@ -103,7 +105,7 @@ class Visualizador3D(QWidget):
         
         # Evaluar la función en la malla
         try:
-            Z = f_np(X, Y)
+            Z = np.broadcast_to(f_np(X, Y), X.shape)
         except:
             # Si hay un error (por ejemplo, división por cero), usar ceros
             Z = np.zeros_like(X)
@@ -159,10 +161,9 @@ class Visualizador3D(QWidget):
         """
         F1, F2, F3 = F
         
-        # Convertir las funciones simbólicas a funciones numéricas
-        F1_np = sp.lambdify((x, y, z), F1, 'numpy')
-        F2_np = sp.lambdify((x, y, z), F2, 'numpy')
-        F3_np = sp.lambdify((x, y, z), F3, 'numpy')
+        # Convertir el campo en una sola función numérica: los subtérminos
+        # comunes de las componentes se evalúan una vez por malla
+        F_np = nucleo_nativo([F1, F2, F3], (x, y, z))
         
         # Crear la malla de puntos
         x_vals = np.linspace(x_range[0], x_range[1], num_points)
@@ -173,9 +174,8 @@ class Visualizador3D(QWidget):
         
         # Evaluar las componentes del campo vectorial
         try:
-            U = F1_np(X, Y, Z)
-            V = F2_np(X, Y, Z)
-            W = F3_np(X, Y, Z)
+            # Las componentes constantes llegan como escalares
+            U, V, W = (np.broadcast_to(c, X.shape) for c in F_np(X, Y, Z))
         except:
             # Si hay un error, usar un campo vectorial nulo
             U = np.zeros_like(X)
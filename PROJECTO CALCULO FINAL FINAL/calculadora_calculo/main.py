@@ -1,5 +1,7 @@
 import sys
 import os
+import logging
+import multiprocessing
 from pathlib import Path
 
 # Añadir el directorio del proyecto al path
@@ -18,6 +20,8 @@ def main():
     QCoreApplication.setAttribute(Qt.AA_UseDesktopOpenGL, True)
     QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts, True)
     app = QApplication(sys.argv)
+    # Registro de avisos y métricas de cálculo (tamaño de las expresiones por etapa)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s: %(message)s")
     
     # Configuración del estilo de la aplicación
     app.setStyle('Fusion')
@@ -42,6 +46,8 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Necesario para los procesos trabajadores en ejecutables empaquetados
+    multiprocessing.freeze_support()
     main()
 
 
@@ -0,0 +1,88 @@
+"""
+Pruebas de la integración polinómica y de los caminos que dependen de ella.
+
+Los integrandos nulos, constantes e impares se comparan con sp.integrate.
+"""
+import pytest
+import sympy as sp
+from sympy.parsing.sympy_parser import parse_expr
+
+from calculadora_calculo.calculos.integrales import integrar_iterada
+from calculadora_calculo.calculos.normalizacion import diccionario_analisis
+from calculadora_calculo.calculos.polinomios import (
+    integrar_polinomio_caja, integrar_polinomio_cilindro, integrar_polinomio_elipsoide,
+    integrar_polinomio_esfera
+)
+from calculadora_calculo.calculos.procedimientos import procedimiento_green, procedimiento_integral_triple
+from calculadora_calculo.calculos.teoremas import (
+    phi, rho, teorema_divergencia, teorema_green, teorema_stokes, x, y, z
+)
+
+CAJA = ((z, -1, 2), (y, 0, 1), (x, -1, 1))
+
+INTEGRANDOS = [
+    pytest.param(sp.S.Zero, id='nulo'),
+    pytest.param(sp.Integer(3), id='constante'),
+    pytest.param(sp.Rational(1, 2), id='racional'),
+    pytest.param(x**3 * y, id='impar'),
+    pytest.param(x**2 * z + y - 2, id='general'),
+]
+
+
+def _sympy(func, *limites):
+    return sp.integrate(func, *limites)
+
+
+@pytest.mark.parametrize('func', INTEGRANDOS)
+def test_caja_coincide_con_sympy(func):
+    assert sp.simplify(integrar_polinomio_caja(func, *CAJA) - _sympy(func, *CAJA)) == 0
+
+
+@pytest.mark.parametrize('func', INTEGRANDOS)
+def test_integrar_iterada_coincide_con_sympy(func):
+    assert sp.simplify(integrar_iterada(func, *CAJA) - _sympy(func, *CAJA)) == 0
+
+
+@pytest.mark.parametrize('func', INTEGRANDOS)
+def test_regiones_estandar_coinciden_con_sympy(func):
+    r, t, p = sp.symbols('r t p', nonnegative=True)
+    polares = {x: r * sp.cos(t), y: r * sp.sin(t)}
+    cilindro = _sympy(sp.sympify(func).xreplace(polares) * r, (r, 0, 2), (t, 0, 2 * sp.pi), (z, 0, 3))
+    assert sp.simplify(integrar_polinomio_cilindro(func, 2, (0, 3)) - cilindro) == 0
+
+    esfericas = {x: r * sp.sin(p) * sp.cos(t), y: r * sp.sin(p) * sp.sin(t), z: r * sp.cos(p)}
+    bola = _sympy(sp.sympify(func).xreplace(esfericas) * r**2 * sp.sin(p),
+                  (r, 0, 1), (p, 0, sp.pi), (t, 0, 2 * sp.pi))
+    assert sp.simplify(integrar_polinomio_esfera(func, 1) - bola) == 0
+    assert sp.simplify(integrar_polinomio_elipsoide(func, (1, 1, 1)) - bola) == 0
+
+
+def test_campo_conservativo_en_green():
+    assert teorema_green.sin_cache(y, x) == 0
+
+
+def test_campo_sin_divergencia_en_cubo():
+    assert teorema_divergencia.sin_cache((y, z, x), 'cubo') == 0
+
+
+def test_stokes_en_esfericas():
+    assert teorema_stokes.sin_cache((0, 0, rho * sp.sin(phi)), sistema_coordenadas='esfericas') == (
+        2 * sp.cos(phi), -2 * sp.sin(phi), 0
+    )
+
+
+def test_procedimientos_con_integrando_nulo():
+    X, Y = sp.symbols('x y')
+    assert procedimiento_green.sin_cache(Y, X, (0, 1), (0, 1))['resultado'] == 0
+    resultado = procedimiento_integral_triple.sin_cache(sp.S.Zero, 'Rectangulares', (0, 1), (0, 1), (0, 1))
+    assert resultado['resultado'] == 0
+
+
+@pytest.mark.parametrize('texto, coord_type, esperado', [
+    ('rho', 'Esféricas', sp.pi),
+    ('theta', 'Cilíndricas', 2 * sp.pi**2),
+])
+def test_procedimientos_con_variables_de_la_region(texto, coord_type, esperado):
+    func = parse_expr(texto, local_dict=diccionario_analisis())
+    resultado = procedimiento_integral_triple.sin_cache(func, coord_type, (0, 1), (0, 1), (0, 2))
+    assert sp.simplify(resultado['resultado'] - esperado) == 0
@@ -0,0 +1,44 @@
+"""
+Pruebas del procedimiento paso a paso de la pestaña de Integrales.
+
+Los integrandos con r, ρ, θ o φ se comparan con sp.integrate sobre la
+función ya transformada, con los mismos límites que usa el procedimiento.
+"""
+import pytest
+import sympy as sp
+from sympy.parsing.sympy_parser import parse_expr
+
+from calculadora_calculo.calculos.normalizacion import diccionario_analisis
+from calculadora_calculo.calculos.procedimientos import procedimiento_integral_triple
+
+x, y, z, r, rho, theta, phi = sp.symbols('x y z r rho theta phi')
+
+CASOS = [
+    ('Cilíndricas', 'θ**2 + y'),
+    ('Cilíndricas', 'r*theta'),
+    ('Cilíndricas', 'x*theta'),
+    ('Cilíndricas', 'r**2 + x**2'),
+    ('Esféricas', 'rho**2'),
+    ('Esféricas', 'sin(phi)'),
+    ('Esféricas', 'ρ*cos(φ)**2'),
+    ('Esféricas', 'x**2 + rho'),
+]
+
+
+def _referencia(func, coord_type):
+    if coord_type == 'Cilíndricas':
+        transformada = func.subs({x: r * sp.cos(theta), y: r * sp.sin(theta)}) * r
+        return sp.integrate(transformada, (z, 0, 2), (r, 0, 1), (theta, 0, 2 * sp.pi))
+    transformada = func.subs({
+        x: rho * sp.sin(phi) * sp.cos(theta),
+        y: rho * sp.sin(phi) * sp.sin(theta),
+        z: rho * sp.cos(phi),
+    }) * rho**2 * sp.sin(phi)
+    return sp.integrate(transformada, (rho, 0, 1), (phi, 0, sp.pi), (theta, 0, 2 * sp.pi))
+
+
+@pytest.mark.parametrize('coord_type, texto', CASOS)
+def test_variables_de_la_region_coinciden_con_sympy(coord_type, texto):
+    func = parse_expr(texto, local_dict=diccionario_analisis(x=x, y=y, z=z))
+    resultado = procedimiento_integral_triple.sin_cache(func, coord_type, (0, 1), (0, 1), (0, 2))
+    assert sp.simplify(resultado['resultado'] - _referencia(func, coord_type)) == 0
@@ -0,0 +1,11 @@
+"""
+Pruebas del pool de procesos trabajadores.
+"""
+from calculadora_calculo.calculos.trabajos import PoolTrabajos
+
+
+def test_cerrar_dos_veces():
+    pool = PoolTrabajos(1)
+    assert pool.enviar(sum, [1, 2, 3]).result(timeout=60) == 6
+    pool.cerrar()
+    pool.cerrar()
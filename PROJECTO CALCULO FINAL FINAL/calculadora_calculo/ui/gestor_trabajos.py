@@ -0,0 +1,107 @@
+from concurrent.futures import CancelledError
+from PySide6.QtCore import QObject, QTimer, Signal
+from calculadora_calculo.calculos.trabajos import PoolTrabajos, FuturoTrabajo
+from calculadora_calculo.calculos.portafolio import FuturoPortafolio, ejecutar_portafolio
+
+
+class GestorTrabajos(QObject):
+    """
+    Puente entre el pool de procesos de cálculo y la interfaz Qt.
+
+    Los resultados llegan desde hilos supervisores; las señales se entregan en
+    el hilo de la interfaz cuando se conectan a métodos de un QObject.
+
+    Los trabajos de fondo (verificaciones) van a un pool aparte de un solo
+    proceso con prioridad mínima: nunca ocupan un trabajador de los cálculos
+    principales ni les quitan CPU.
+    """
+
+    # Incremento de 'nice' del pool de fondo
+    PRIORIDAD_FONDO = 19
+
+    trabajo_iniciado = Signal(int)
+    trabajo_terminado = Signal(int, object)
+    trabajo_fallido = Signal(int, str)
+    trabajo_cancelado = Signal(int)
+    etapa_cambiada = Signal(int, str)
+    progreso = Signal(int, object)
+
+    def __init__(self, max_trabajadores=None, limite_tiempo=None, limite_memoria=None, parent=None):
+        super().__init__(parent)
+        self._pool = PoolTrabajos(max_trabajadores, limite_tiempo, limite_memoria)
+        self._pool.al_iniciar(lambda futuro: self.trabajo_iniciado.emit(futuro.id_trabajo))
+        self._pool.al_cambiar_etapa(lambda futuro, etapa: self.etapa_cambiada.emit(futuro.id_trabajo, etapa))
+        self._pool.al_progresar(lambda futuro, dato: self.progreso.emit(futuro.id_trabajo, dato))
+        self._limites = (limite_tiempo, limite_memoria)
+        self._pool_fondo = None
+        self._futuros = {}
+
+    def enviar(self, funcion, *args, **kwargs) -> FuturoTrabajo:
+        """
+        Envía una función a un proceso trabajador y devuelve su futuro.
+        Acepta limite_tiempo (s por etapa) y limite_memoria (bytes) como en PoolTrabajos.enviar.
+        """
+        futuro = self._pool.enviar(funcion, *args, **kwargs)
+        self._futuros[futuro.id_trabajo] = futuro
+        futuro.add_done_callback(self._notificar)
+        return futuro
+
+    def enviar_fondo(self, funcion, *args, **kwargs) -> FuturoTrabajo:
+        """
+        Envía una función al pool de fondo (un proceso de prioridad mínima, creado al primer uso).
+        Acepta limite_tiempo y limite_memoria como enviar.
+        """
+        if self._pool_fondo is None:
+            self._pool_fondo = PoolTrabajos(1, *self._limites, prioridad=self.PRIORIDAD_FONDO)
+        futuro = self._pool_fondo.enviar(funcion, *args, **kwargs)
+        self._futuros[futuro.id_trabajo] = futuro
+        futuro.add_done_callback(self._notificar)
+        return futuro
+
+    def enviar_portafolio(self, func, *limites, **kwargs) -> FuturoPortafolio:
+        """
+        Lanza varias estrategias de integración en paralelo y devuelve el futuro de la primera válida.
+        Acepta max_estrategias y limite_tiempo como portafolio.ejecutar_portafolio.
+        """
+        futuro = ejecutar_portafolio(self._pool, func, *limites, **kwargs)
+        self._futuros[futuro.id_trabajo] = futuro
+        if futuro.done():
+            # Resultado de la caché: notificar cuando el llamador ya haya registrado el trabajo
+            QTimer.singleShot(0, lambda: self._notificar(futuro))
+        else:
+            futuro.add_done_callback(self._notificar)
+        return futuro
+
+    def cancelar(self, id_trabajo: int) -> bool:
+        """Cancela un trabajo pendiente o en curso."""
+        futuro = self._futuros.get(id_trabajo)
+        return futuro.cancel() if futuro is not None else False
+
+    def cancelar_todos(self):
+        """Cancela todos los trabajos activos."""
+        for futuro in list(self._futuros.values()):
+            futuro.cancel()
+
+    def activos(self) -> int:
+        """Número de trabajos pendientes o en curso."""
+        return len(self._futuros)
+
+    def cerrar(self):
+        """Cancela los trabajos y detiene los procesos trabajadores."""
+        self.cancelar_todos()
+        self._pool.cerrar()
+        if self._pool_fondo is not None:
+            self._pool_fondo.cerrar()
+
+    def _notificar(self, futuro: FuturoTrabajo):
+        self._futuros.pop(futuro.id_trabajo, None)
+        if futuro.cancelled() or futuro.cancelacion_solicitada:
+            self.trabajo_cancelado.emit(futuro.id_trabajo)
+            return
+        error = futuro.exception()
+        if isinstance(error, CancelledError):
+            self.trabajo_cancelado.emit(futuro.id_trabajo)
+        elif error is not None:
+            self.trabajo_fallido.emit(futuro.id_trabajo, str(error))
+        else:
+            self.trabajo_terminado.emit(futuro.id_trabajo, futuro.result())
@@ -5,10 +5,22 @@ from calculadora_calculo.ui.math_render import lines_to_html
 import pyqtgraph as pg
 import numpy as np
 from calculadora_calculo.calculos.visualizacion import Visualizador3D
+from calculadora_calculo.calculos.procedimientos import gram_schmidt, vector_a_latex, procedimiento_gram_schmidt
+from calculadora_calculo.calculos.simplificacion import simplificar_profundo, PRESUPUESTO_SIMPLIFICACION
+from calculadora_calculo.ui.gestor_trabajos import GestorTrabajos
 
 class GramSchmidtWidget(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, gestor_trabajos=None):
         super().__init__(parent)
+        # Los cálculos se ejecutan en procesos trabajadores
+        if gestor_trabajos is None:
+            gestor_trabajos = GestorTrabajos(max_trabajadores=1, parent=self)
+        self.gestor_trabajos = gestor_trabajos
+        self._trabajo_actual = None
+        # Simplificación profunda de la base mostrada (en segundo plano)
+        self._trabajo_simplificacion = None
+        self.gestor_trabajos.trabajo_terminado.connect(self._al_terminar_trabajo)
+        self.gestor_trabajos.trabajo_fallido.connect(self._al_fallar_trabajo)
         self.init_ui()
 
     def init_ui(self):
@@ -196,18 +208,10 @@ class GramSchmidtWidget(QWidget):
         return vectors
 
     def gram_schmidt(self, vectors, orthonormal=True):
-        basis = []
-        for v in vectors:
-            w = v - sum((v.dot(b) / b.dot(b) * b for b in basis), sp.zeros(v.shape[0], 1))
-            if w.norm() == 0:
-                raise ValueError("Input vectors are linearly dependent.")
-            if orthonormal:
-                w = w / w.norm()
-            basis.append(w)
-        return basis
+        return gram_schmidt(vectors, orthonormal)
 
     def vector_to_latex(self, vector):
-        return "\\left[" + ", ".join(sp.latex(comp) for comp in vector) + "\\right]"
+        return vector_a_latex(vector)
 
     def vector_to_str(self, vector):
         return "[" + ", ".join(str(comp) for comp in vector) + "]"
@@ -219,56 +223,65 @@ class GramSchmidtWidget(QWidget):
                 raise ValueError("No se ingresaron vectores válidos.")
 
             orthonormal = (self.proceso_combo.currentText() == "Ortonormal")
-            basis = self.gram_schmidt(vectors, orthonormal)
-
-            process_type = "Ortonormal" if orthonormal else "Ortogonal"
-            # Construir procedimiento paso a paso (LaTeX)
-            pasos_latex = []
-            pasos_latex.append(f"\\text{{Proceso: {process_type}}}")
-            pasos_latex.append("\\text{Vectores de entrada:}")
-            for i, v in enumerate(vectors, 1):
-                pasos_latex.append(f"v_{{{i}}} = {self.vector_to_latex(v)}")
-
-            # Recalcular explícitamente para registrar pasos
-            u_basis = []
-            for k, v in enumerate(vectors, 1):
-                w = v
-                detalle_proy = []
-                for j, b in enumerate(u_basis, 1):
-                    coef = sp.simplify((v.dot(b) / b.dot(b)))
-                    w = w - coef * b
-                    detalle_proy.append(f"\\text{{Proy}}_{{v_{k} \to u_{j}}} = {sp.latex(coef)}\\, u_{{{j}}}")
-                pasos_latex.append(f"\\text{{Paso {k}}}")
-                if detalle_proy:
-                    pasos_latex.extend(detalle_proy)
-                else:
-                    pasos_latex.append("\\text{No hay proyecciones previas}")
-                pasos_latex.append(f"w_{{{k}}} = {self.vector_to_latex(sp.simplify(w))}")
-                if w.norm() == 0:
-                    raise ValueError("Los vectores de entrada son linealmente dependientes.")
-                if orthonormal:
-                    norm_w = sp.simplify(sp.sqrt((w.T*w)[0]))
-                    u = sp.simplify(w / norm_w)
-                    pasos_latex.append(f"u_{{{k}}} = \\frac{{w_{{{k}}}}}{{{sp.latex(norm_w)}}} = {self.vector_to_latex(u)}")
-                else:
-                    u = sp.simplify(w)
-                    pasos_latex.append(f"u_{{{k}}} = w_{{{k}}} = {self.vector_to_latex(u)}")
-                u_basis.append(u)
-
+            for trabajo in (self._trabajo_actual, self._trabajo_simplificacion):
+                if trabajo is not None:
+                    self.gestor_trabajos.cancelar(trabajo)
+            self._trabajo_simplificacion = None
+            futuro = self.gestor_trabajos.enviar(procedimiento_gram_schmidt, vectors, orthonormal)
+            self._trabajo_actual = futuro.id_trabajo
+            self._vectores_actuales = vectors
+            self.result_display.setPlainText("Calculando...")
+            self._auto_resize_textedit(self.result_display)
+        except Exception as e:
+            self._mostrar_error(e)
+
+    def _al_terminar_trabajo(self, id_trabajo, datos):
+        if id_trabajo == self._trabajo_simplificacion:
+            # Solo llega una base si es más corta que la mostrada
+            self._trabajo_simplificacion = None
+            if datos is not None:
+                self._mostrar_base(datos)
+            return
+        if id_trabajo != self._trabajo_actual:
+            return
+        self._trabajo_actual = None
+        try:
+            u_basis = datos['base']
             # Mostrar procedimiento y resultado renderizados
-            self.proceso_display.setHtml(lines_to_html(pasos_latex))
+            self.proceso_display.setHtml(lines_to_html(datos['pasos']))
             self._auto_resize_textedit(self.proceso_display)
 
-            resultado_latex = [f"u_{{{i+1}}} = {self.vector_to_latex(u)}" for i, u in enumerate(u_basis)]
-            self.result_display.setHtml(lines_to_html(resultado_latex))
-            self._auto_resize_textedit(self.result_display)
+            self._mostrar_base(u_basis)
             # Actualizar visualizadores
-            self.update_visuals(vectors, u_basis)
+            self.update_visuals(self._vectores_actuales, u_basis)
+
+            futuro = self.gestor_trabajos.enviar(
+                simplificar_profundo, list(u_basis), limite_tiempo=PRESUPUESTO_SIMPLIFICACION
+            )
+            self._trabajo_simplificacion = futuro.id_trabajo
         except Exception as e:
-            self.proceso_display.setPlainText("")
-            self.result_display.setPlainText(f"Ocurrió un error: {str(e)}")
-            self._auto_resize_textedit(self.proceso_display)
-            self._auto_resize_textedit(self.result_display)
+            self._mostrar_error(e)
+
+    def _mostrar_base(self, u_basis):
+        resultado_latex = [f"u_{{{i+1}}} = {self.vector_to_latex(u)}" for i, u in enumerate(u_basis)]
+        self.result_display.setHtml(lines_to_html(resultado_latex))
+        self._auto_resize_textedit(self.result_display)
+
+    def _al_fallar_trabajo(self, id_trabajo, mensaje):
+        if id_trabajo == self._trabajo_simplificacion:
+            # Sin tiempo o sin mejora: se conserva la simplificación rápida
+            self._trabajo_simplificacion = None
+            return
+        if id_trabajo != self._trabajo_actual:
+            return
+        self._trabajo_actual = None
+        self._mostrar_error(mensaje)
+
+    def _mostrar_error(self, e):
+        self.proceso_display.setPlainText("")
+        self.result_display.setPlainText(f"Ocurrió un error: {str(e)}")
+        self._auto_resize_textedit(self.proceso_display)
+        self._auto_resize_textedit(self.result_display)
 
     def _clear_2d(self):
         for item in self._lines2d:
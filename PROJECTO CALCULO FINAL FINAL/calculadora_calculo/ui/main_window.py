@@ -1,9 +1,12 @@
 from PySide6.QtWidgets import (QMainWindow, QTabWidget, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                              QTextEdit, QComboBox, QGroupBox, QFormLayout,
-                             QMessageBox, QStackedWidget, QDialog, QScrollArea, QFrame, QSizePolicy)
+                             QMessageBox, QStackedWidget, QDialog, QScrollArea, QFrame, QSizePolicy,
+                             QCheckBox)
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
+import time
+import logging
 import pyqtgraph as pg
 import numpy as np
 import sympy as sp
@@ -11,8 +14,31 @@ from sympy.parsing.sympy_parser import parse_expr
 from calculadora_calculo.calculos.visualizacion import Visualizador3D
 from calculadora_calculo.ui.gram_schmidt_widget import GramSchmidtWidget
 from calculadora_calculo.ui.math_render import lines_to_html
+from calculadora_calculo.ui.gestor_trabajos import GestorTrabajos
+from calculadora_calculo.calculos.montecarlo import EstimacionQMC
+from calculadora_calculo.calculos.normalizacion import diccionario_analisis
+from calculadora_calculo.calculos.limites import parsear_limite, parsear_intervalo, a_flotante
+from calculadora_calculo.calculos.simplificacion import simplificar_profundo, PRESUPUESTO_SIMPLIFICACION
+from calculadora_calculo.calculos.motor import renderizar_pasos
+from calculadora_calculo.calculos.verificacion import verificar_resultado, TOLERANCIA_VERIFICACION
+from calculadora_calculo.calculos.procedimientos import (
+    procedimiento_integral_triple, procedimiento_integral_numerica, procedimiento_integral_qmc,
+    estimacion_qmc_a_latex, integral_interfaz, procedimiento_green,
+    procedimiento_stokes, procedimiento_divergencia
+)
+
+logger = logging.getLogger(__name__)
+
 
 class MainWindow(QMainWindow):
+    # Presupuestos de cada cálculo: segundos por etapa de integración y memoria adicional
+    LIMITE_TIEMPO_ETAPA = 60
+    LIMITE_MEMORIA = 2 * 2**30
+    # Intervalo mínimo (s) entre actualizaciones de una estimación parcial
+    INTERVALO_PROGRESO = 0.25
+    # Error relativo admitido al comprobar numéricamente un resultado simbólico
+    TOLERANCIA_VERIFICACION = TOLERANCIA_VERIFICACION
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Calculadora Avanzada de Cálculo Vectorial")
@@ -23,6 +49,11 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(self.central_widget)
         self.main_layout = QHBoxLayout(self.central_widget)
         
+        # Cálculos en procesos trabajadores
+        self._init_trabajos()
+        # Procedimiento de cada sección (encabezado, traza); se dibuja solo si está a la vista
+        self._procedimientos = {}
+        
         # Crear pestañas
         self.tabs = QTabWidget()
         self.main_layout.addWidget(self.tabs)
@@ -37,7 +68,215 @@ class MainWindow(QMainWindow):
         
         # Configurar gráficos
         pg.setConfigOptions(antialias=True)
-        
+
+    def _init_trabajos(self):
+        """Crea el gestor de trabajos que ejecuta los cálculos fuera del hilo de la interfaz"""
+        self.gestor_trabajos = GestorTrabajos(
+            limite_tiempo=self.LIMITE_TIEMPO_ETAPA,
+            limite_memoria=self.LIMITE_MEMORIA,
+            parent=self
+        )
+        # Trabajo vigente por sección e id -> (sección, al_terminar, al_fallar)
+        self._trabajo_actual = {}
+        self._trabajos = {}
+        # Aproximación numérica de la integral en curso (líneas LaTeX)
+        self._integral_aproximada = []
+        self._ultimo_progreso = 0.0
+        # Integral (integrando, límites) del cálculo en curso de la pestaña de Integrales
+        self._integral_en_curso = None
+        # Resultado mostrado por sección (líneas LaTeX) y avisos de la verificación numérica
+        self._resultados = {}
+        self._avisos = {}
+        self.gestor_trabajos.trabajo_terminado.connect(self._al_terminar_trabajo)
+        self.gestor_trabajos.trabajo_fallido.connect(self._al_fallar_trabajo)
+        self.gestor_trabajos.trabajo_cancelado.connect(self._al_cancelar_trabajo)
+        self.gestor_trabajos.etapa_cambiada.connect(self._al_cambiar_etapa)
+        self.gestor_trabajos.progreso.connect(self._al_progresar_trabajo)
+
+    def _registrar_trabajo(self, seccion: str, futuro, al_terminar, al_fallar):
+        """Asocia un trabajo enviado a sus manejadores; cancela el anterior de la misma sección
+        y la simplificación pendiente del resultado que se va a reemplazar"""
+        self._descartar_trabajos(seccion, f"simplificacion_{seccion}", f"verificacion_{seccion}")
+        self._trabajo_actual[seccion] = futuro.id_trabajo
+        self._trabajos[futuro.id_trabajo] = (seccion, al_terminar, al_fallar)
+
+    def _descartar_trabajos(self, *secciones: str):
+        """Cancela los trabajos vigentes de las secciones y olvida sus manejadores"""
+        for nombre in secciones:
+            anterior = self._trabajo_actual.pop(nombre, None)
+            if anterior is not None:
+                self.gestor_trabajos.cancelar(anterior)
+
+    def _tomar_trabajo(self, id_trabajo: int):
+        """Devuelve los manejadores de un trabajo si sigue siendo el vigente de su sección"""
+        registro = self._trabajos.pop(id_trabajo, None)
+        if registro is None:
+            return None
+        seccion = registro[0]
+        if self._trabajo_actual.get(seccion) != id_trabajo:
+            return None
+        del self._trabajo_actual[seccion]
+        return registro
+
+    def _al_terminar_trabajo(self, id_trabajo: int, resultado):
+        registro = self._tomar_trabajo(id_trabajo)
+        if registro is not None:
+            registro[1](resultado)
+
+    def _al_fallar_trabajo(self, id_trabajo: int, mensaje: str):
+        registro = self._tomar_trabajo(id_trabajo)
+        if registro is not None:
+            registro[2](mensaje)
+
+    def _al_cancelar_trabajo(self, id_trabajo: int):
+        registro = self._tomar_trabajo(id_trabajo)
+        if registro is not None:
+            registro[2]("Cálculo cancelado")
+
+    def _al_cambiar_etapa(self, id_trabajo: int, etapa: str):
+        """Muestra la etapa en curso del trabajo vigente de cada sección"""
+        registro = self._trabajos.get(id_trabajo)
+        if registro is None or self._trabajo_actual.get(registro[0]) != id_trabajo:
+            return
+        display = {'integral': self.result_display, 'teorema': self.teorema_result}.get(registro[0])
+        if display is not None:
+            lineas = [f"\\text{{Calculando... ({etapa})}}"]
+            if registro[0] == 'integral':
+                lineas = self._integral_aproximada + lineas
+            self._set_math_lines(display, lineas)
+
+    def _al_progresar_trabajo(self, id_trabajo: int, dato):
+        """Muestra la estimación parcial de una integral cuasi-Monte Carlo"""
+        if self._trabajo_actual.get('integral') != id_trabajo or not isinstance(dato, EstimacionQMC):
+            return
+        self._integral_aproximada = [
+            f"\\text{{Estimación cuasi-Monte Carlo:}}\\; {estimacion_qmc_a_latex(dato)}"
+        ]
+        # Renderizar cada bloque saturaría la interfaz
+        ahora = time.monotonic()
+        if ahora - self._ultimo_progreso < self.INTERVALO_PROGRESO:
+            return
+        self._ultimo_progreso = ahora
+        self._set_math_lines(
+            self.result_display,
+            self._integral_aproximada + ["\\text{Refinando... pulse Cancelar para quedarse con esta estimación}"]
+        )
+        self._auto_resize_textedit(self.result_display)
+
+    def cancelar_calculo(self, seccion: str):
+        """Cancela el cálculo en curso de una sección (la integral incluye su aproximación
+        numérica y su portafolio de forma cerrada)"""
+        secciones = [seccion, f"simplificacion_{seccion}", f"verificacion_{seccion}"]
+        if seccion == 'integral':
+            secciones += ['integral_numerica', 'integral_cerrada']
+        for nombre in secciones:
+            id_trabajo = self._trabajo_actual.get(nombre)
+            if id_trabajo is not None:
+                self.gestor_trabajos.cancelar(id_trabajo)
+
+    def _simplificar_en_segundo_plano(self, seccion: str, resultado, al_simplificar):
+        """Lanza sp.simplify sobre un resultado ya mostrado, con un presupuesto de tiempo.
+        al_simplificar solo se llama si la forma obtenida es más corta que la mostrada."""
+        if not isinstance(resultado, sp.Basic) or resultado.is_Atom or resultado.has(sp.Integral):
+            return
+        futuro = self.gestor_trabajos.enviar(
+            simplificar_profundo, resultado, limite_tiempo=PRESUPUESTO_SIMPLIFICACION
+        )
+        self._registrar_trabajo(
+            f"simplificacion_{seccion}", futuro,
+            lambda simplificado: simplificado is not None and al_simplificar(simplificado),
+            lambda mensaje: None
+        )
+
+    def _verificar_en_segundo_plano(self, seccion: str, resultado, integral):
+        """Calcula numéricamente, en el pool de fondo, la integral de un resultado simbólico ya
+        mostrado; si los valores no coinciden, el resultado se marca con un aviso.
+
+        Args:
+            seccion: 'integral' o 'teorema'
+            resultado: Resultado simbólico mostrado
+            integral: Tupla (integrando, limites) de la integral calculada, o None
+        """
+        if (integral is None or not isinstance(resultado, sp.Basic)
+                or not resultado.is_number or resultado.has(sp.Integral)):
+            return
+        integrando, limites = integral
+        futuro = self.gestor_trabajos.enviar_fondo(
+            verificar_resultado, resultado, integrando, *limites, tolerancia=self.TOLERANCIA_VERIFICACION
+        )
+        self._registrar_trabajo(
+            f"verificacion_{seccion}", futuro,
+            lambda verificacion: self._al_verificar(seccion, verificacion),
+            lambda mensaje: logger.info("Verificación numérica no disponible: %s", mensaje)
+        )
+
+    def _al_verificar(self, seccion: str, verificacion):
+        """Registra la verificación numérica y marca el resultado si no coincide"""
+        if verificacion is None:
+            return
+        logger.info("%s: %s", seccion, verificacion.describir())
+        if verificacion.coincide:
+            return
+        self._avisos[seccion] = [
+            "¡Atención! El resultado simbólico no coincide con el cálculo numérico:",
+            verificacion.describir(),
+        ]
+        self._mostrar_resultado(seccion, self._resultados.get(seccion, []))
+        self._vista_resultado(seccion).setToolTip(verificacion.describir())
+
+    def _vista_resultado(self, seccion: str) -> QTextEdit:
+        """Área de texto del resultado de una sección"""
+        return self.result_display if seccion == 'integral' else self.teorema_result
+
+    def _mostrar_resultado(self, seccion: str, lineas: list):
+        """Muestra el resultado de una sección seguido de sus avisos de verificación"""
+        self._resultados[seccion] = list(lineas)
+        display = self._vista_resultado(seccion)
+        self._set_math_lines(display, list(lineas) + self._avisos.get(seccion, []))
+        self._auto_resize_textedit(display)
+
+    def _limpiar_avisos(self, seccion: str):
+        """Descarta los avisos del resultado anterior de una sección"""
+        self._avisos.pop(seccion, None)
+        self._vista_resultado(seccion).setToolTip("")
+
+    def closeEvent(self, event):
+        """Detiene los procesos trabajadores al cerrar la ventana"""
+        self.gestor_trabajos.cerrar()
+        super().closeEvent(event)
+
+    def _vista_procedimiento(self, seccion: str):
+        """Área de texto y casilla 'Mostrar procedimiento' de una sección"""
+        if seccion == 'integral':
+            return self.proceso_display, self.mostrar_proceso_check
+        return self.teorema_proceso, self.mostrar_teorema_proceso_check
+
+    def _fijar_procedimiento(self, seccion: str, encabezado: list, pasos=(), mostrar: bool = False):
+        """Guarda el procedimiento de una sección y lo dibuja si está a la vista.
+
+        Args:
+            seccion: 'integral' o 'teorema'
+            encabezado: Líneas ya escritas (texto o LaTeX)
+            pasos: Traza o lista de líneas; las expresiones se dibujan al mostrarse
+            mostrar: Si es True, marca la casilla (p. ej. para que se vean los errores)
+        """
+        self._procedimientos[seccion] = (list(encabezado), pasos)
+        _, casilla = self._vista_procedimiento(seccion)
+        if mostrar and not casilla.isChecked():
+            casilla.setChecked(True)  # la señal toggled lo dibuja
+        else:
+            self._refrescar_procedimiento(seccion)
+
+    def _refrescar_procedimiento(self, seccion: str):
+        """Dibuja el procedimiento guardado si la casilla está marcada, o lo oculta"""
+        display, casilla = self._vista_procedimiento(seccion)
+        display.setVisible(casilla.isChecked())
+        if not casilla.isChecked():
+            return
+        encabezado, pasos = self._procedimientos.get(seccion, ([], ()))
+        self._set_math_lines(display, encabezado + renderizar_pasos(pasos))
+        self._auto_resize_textedit(display)
+
     def _set_math_lines(self, text_edit: QTextEdit, lines: list[str]):
         """Establece contenido en formato matemático renderizado a partir de líneas de texto/LaTeX.
         Para texto plano, se envuelve con \\text{...}."""
@@ -76,6 +315,10 @@ class MainWindow(QMainWindow):
         self.coord_type.addItems(["Rectangulares", "Cilíndricas", "Esféricas"])
         coord_layout.addWidget(QLabel("Sistema de coordenadas:"))
         coord_layout.addWidget(self.coord_type)
+        self.metodo_integral = QComboBox()
+        self.metodo_integral.addItems(["Simbólico", "Cuasi-Monte Carlo"])
+        coord_layout.addWidget(QLabel("Método:"))
+        coord_layout.addWidget(self.metodo_integral)
         coord_group.setLayout(coord_layout)
         
         # Grupo de entrada de función y límites
@@ -135,6 +378,11 @@ class MainWindow(QMainWindow):
         # Botón de cálculo
         self.calc_button = QPushButton("Calcular Integral")
         self.calc_button.clicked.connect(self.calcular_integral)
+        self.cancel_button = QPushButton("Cancelar")
+        self.cancel_button.clicked.connect(lambda: self.cancelar_calculo('integral'))
+        botones_layout = QHBoxLayout()
+        botones_layout.addWidget(self.calc_button)
+        botones_layout.addWidget(self.cancel_button)
         
         # Apartado de procedimiento
         self.proceso_display = QTextEdit()
@@ -144,6 +392,10 @@ class MainWindow(QMainWindow):
         self.proceso_display.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.proceso_display.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
         self.proceso_display.setMinimumHeight(60)
+        # El procedimiento solo se dibuja (sp.pretty/sp.latex) al marcar la casilla
+        self.proceso_display.setVisible(False)
+        self.mostrar_proceso_check = QCheckBox("Mostrar procedimiento")
+        self.mostrar_proceso_check.toggled.connect(lambda: self._refrescar_procedimiento('integral'))
         
         # Área de resultados
         self.result_display = QTextEdit()
@@ -166,12 +418,12 @@ class MainWindow(QMainWindow):
         # Sección superior (controles)
         scroll_layout.addWidget(coord_group)
         scroll_layout.addWidget(input_group)
-        scroll_layout.addWidget(self.calc_button)
+        scroll_layout.addLayout(botones_layout)
 
         # Sección inferior (resultado, procedimiento y 3D)
         scroll_layout.addWidget(QLabel("Resultado:"))
         scroll_layout.addWidget(self.result_display)
-        scroll_layout.addWidget(QLabel("Procedimiento:"))
+        scroll_layout.addWidget(self.mostrar_proceso_check)
         scroll_layout.addWidget(self.proceso_display)
         scroll_layout.addWidget(QLabel("Visualización 3D:"))
         scroll_layout.addWidget(self.visualizador3d)
@@ -232,6 +484,11 @@ class MainWindow(QMainWindow):
         # Botón de cálculo
         self.calc_teorema_btn = QPushButton("Aplicar Teorema")
         self.calc_teorema_btn.clicked.connect(self.aplicar_teorema)
+        self.cancel_teorema_btn = QPushButton("Cancelar")
+        self.cancel_teorema_btn.clicked.connect(lambda: self.cancelar_calculo('teorema'))
+        botones_layout = QHBoxLayout()
+        botones_layout.addWidget(self.calc_teorema_btn)
+        botones_layout.addWidget(self.cancel_teorema_btn)
         
         # Área de procedimiento
         self.teorema_proceso = QTextEdit()
@@ -240,6 +497,9 @@ class MainWindow(QMainWindow):
         self.teorema_proceso.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.teorema_proceso.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
         self.teorema_proceso.setMinimumHeight(60)
+        self.teorema_proceso.setVisible(False)
+        self.mostrar_teorema_proceso_check = QCheckBox("Mostrar procedimiento")
+        self.mostrar_teorema_proceso_check.toggled.connect(lambda: self._refrescar_procedimiento('teorema'))
         
         # Área de resultados
         self.teorema_result = QTextEdit()
@@ -257,8 +517,8 @@ class MainWindow(QMainWindow):
         
         scroll_layout.addWidget(teorema_group)
         scroll_layout.addWidget(self.teorema_inputs)
-        scroll_layout.addWidget(self.calc_teorema_btn)
-        scroll_layout.addWidget(QLabel("Procedimiento:"))
+        scroll_layout.addLayout(botones_layout)
+        scroll_layout.addWidget(self.mostrar_teorema_proceso_check)
         scroll_layout.addWidget(self.teorema_proceso)
         scroll_layout.addWidget(QLabel("Resultado:"))
         scroll_layout.addWidget(self.teorema_result)
@@ -346,7 +606,7 @@ class MainWindow(QMainWindow):
         # Si entramos a Álgebra, crear si no existe
         if tab_text == "Álgebra":
             if self.gram_schmidt_widget is None:
-                self.gram_schmidt_widget = GramSchmidtWidget()
+                self.gram_schmidt_widget = GramSchmidtWidget(gestor_trabajos=self.gestor_trabajos)
                 self._algebra_layout.addWidget(self.gram_schmidt_widget)
         else:
             # Si salimos de Álgebra, destruir el WebEngine para liberar contexto
@@ -735,161 +995,65 @@ class MainWindow(QMainWindow):
             # Convertir la función a una expresión sympy
             x, y, z = sp.symbols('x y z')
             try:
-                func = parse_expr(
-                    func_str,
-                    local_dict={
-                        "x": x, "y": y, "z": z,
-                        "pi": sp.pi, "E": sp.E, "e": sp.E,
-                        "sin": sp.sin, "cos": sp.cos, "tan": sp.tan,
-                        "sqrt": sp.sqrt, "log": sp.log, "exp": sp.exp,
-                        "Abs": sp.Abs,
-                        # Alias de variables angulares y radiales comunes
-                        "phi": sp.symbols('phi'), "varphi": sp.symbols('phi'), "ϕ": sp.symbols('phi'), "φ": sp.symbols('phi'),
-                        "theta": sp.symbols('theta'), "vartheta": sp.symbols('theta'), "θ": sp.symbols('theta'),
-                        "rho": sp.symbols('rho'), "ρ": sp.symbols('rho')
-                    }
-                )
+                # Constantes, funciones y alias de variables angulares y radiales
+                # (φ, varphi, θ, ρ...) que se unifican en un solo símbolo cada uno
+                func = parse_expr(func_str, local_dict=diccionario_analisis(x=x, y=y, z=z))
             except Exception as e:
                 raise ValueError(f"Error al analizar la función: {str(e)}")
             
-            # Obtener los límites
+            # Obtener los límites como números exactos ('pi/2', 'sqrt(2)', '1/3'...);
+            # solo los métodos numéricos los convierten a coma flotante
             try:
-                x_lim = [float(lim.text()) for lim in self.x_lim if lim.text()]
-                y_lim = [float(lim.text()) for lim in self.y_lim if lim.text()]
-                z_lim = [float(lim.text()) for lim in self.z_lim if lim.text()]
-                
-                if len(x_lim) != 2 or len(y_lim) != 2 or len(z_lim) != 2:
-                    raise ValueError("Debe especificar ambos límites para x, y, z")
-                
-                x_min, x_max = sorted(x_lim)
-                y_min, y_max = sorted(y_lim)
-                z_min, z_max = sorted(z_lim)
-                
+                x_min, x_max = parsear_intervalo([lim.text() for lim in self.x_lim])
+                y_min, y_max = parsear_intervalo([lim.text() for lim in self.y_lim])
+                z_min, z_max = parsear_intervalo([lim.text() for lim in self.z_lim])
             except ValueError as e:
-                raise ValueError("Los límites deben ser números válidos")
+                raise ValueError(f"Los límites deben ser números válidos ({e})")
             
-            # Inicializar lista de pasos
-            pasos = [
-                f"Función a integrar: f(x,y,z) = {sp.pretty(func)}",
-                f"Límites de integración:",
-                f"  - x ∈ [{x_min}, {x_max}]",
-                f"  - y ∈ [{y_min}, {y_max}]",
-                f"  - z ∈ [{z_min}, {z_max}]"
-            ]
-            
-            # Calcular la integral según el tipo de coordenadas
+            # Calcular en procesos trabajadores para no bloquear la interfaz. La
+            # aproximación numérica se envía primero: tarda milisegundos y se
+            # muestra mientras llega la forma cerrada.
             coord_type = self.coord_type.currentText()
-            pasos.append(f"\nSistema de coordenadas: {coord_type}")
-            
-            if coord_type == "Rectangulares":
-                pasos.append("\nIntegrando en coordenadas rectangulares (x, y, z):")
-                
-                # Mostrar la integral original
-                integral_str = f"∫∫∫ ({sp.pretty(func)}) dz dy dx"
-                pasos.append(f"Expresión original: {integral_str}")
-                
-                # Integrar en z
-                int_z = sp.integrate(func, (z, z_min, z_max))
-                pasos.append(f"\n1. Integrando con respecto a z (de {z_min} a {z_max}):")
-                pasos.append(f"   ∫({sp.pretty(func)}) dz = {sp.pretty(int_z)}")
-                
-                # Integrar en y
-                int_y = sp.integrate(int_z, (y, y_min, y_max))
-                pasos.append(f"\n2. Integrando el resultado con respecto a y (de {y_min} a {y_max}):")
-                pasos.append(f"   ∫({sp.pretty(int_z)}) dy = {sp.pretty(int_y)}")
-                
-                # Integrar en x
-                result = sp.integrate(int_y, (x, x_min, x_max))
-                pasos.append(f"\n3. Integrando el resultado con respecto a x (de {x_min} a {x_max}):")
-                pasos.append(f"   ∫({sp.pretty(int_y)}) dx = {sp.pretty(result)}")
-                
-            elif coord_type == "Cilíndricas":
-                r, theta = sp.symbols('r theta')
-                pasos.append("\nConversión a coordenadas cilíndricas (r, θ, z):")
-                pasos.append("   x = r·cos(θ)")
-                pasos.append("   y = r·sin(θ)")
-                pasos.append("   z = z")
-                pasos.append("   Jacobiano: |J| = r")
-                
-                # Aplicar la transformación
-                func_cyl = func.subs({
-                    x: r * sp.cos(theta),
-                    y: r * sp.sin(theta),
-                    z: z
-                }) * r  # Jacobiano
-                
-                pasos.append(f"\nFunción en coordenadas cilíndricas: {sp.pretty(func_cyl)}")
-                
-                # Mostrar la integral
-                integral_str = f"∫∫∫ ({sp.pretty(func_cyl)}) dz dr dθ"
-                pasos.append(f"\nExpresión a integrar: {integral_str}")
-                
-                # Integrar en z
-                int_z = sp.integrate(func_cyl, (z, z_min, z_max))
-                pasos.append(f"\n1. Integrando con respecto a z (de {z_min} a {z_max}):")
-                pasos.append(f"   ∫({sp.pretty(func_cyl)}) dz = {sp.pretty(int_z)}")
-                
-                # Integrar en r
-                int_r = sp.integrate(int_z, (r, 0, x_max))
-                pasos.append(f"\n2. Integrando el resultado con respecto a r (de 0 a {x_max}):")
-                pasos.append(f"   ∫({sp.pretty(int_z)}) dr = {sp.pretty(int_r)}")
-                
-                # Integrar en theta
-                result = sp.integrate(int_r, (theta, 0, 2*sp.pi))
-                pasos.append(f"\n3. Integrando el resultado con respecto a θ (de 0 a 2π):")
-                pasos.append(f"   ∫({sp.pretty(int_r)}) dθ = {sp.pretty(result)}")
-                
-            else:  # Esféricas
-                rho, phi, theta = sp.symbols('rho phi theta')
-                pasos.append("\nConversión a coordenadas esféricas (ρ, φ, θ):")
-                pasos.append("   x = ρ·sin(φ)·cos(θ)")
-                pasos.append("   y = ρ·sin(φ)·sin(θ)")
-                pasos.append("   z = ρ·cos(φ)")
-                pasos.append("   Jacobiano: |J| = ρ²·sin(φ)")
-                
-                # Aplicar la transformación
-                func_sph = func.subs({
-                    x: rho * sp.sin(phi) * sp.cos(theta),
-                    y: rho * sp.sin(phi) * sp.sin(theta),
-                    z: rho * sp.cos(phi)
-                }) * rho**2 * sp.sin(phi)  # Jacobiano
-                
-                pasos.append(f"\nFunción en coordenadas esféricas: {sp.pretty(func_sph)}")
-                
-                # Mostrar la integral
-                integral_str = f"∫∫∫ ({sp.pretty(func_sph)}) dρ dφ dθ"
-                pasos.append(f"\nExpresión a integrar: {integral_str}")
-                
-                # Integrar en rho
-                int_rho = sp.integrate(func_sph, (rho, 0, x_max))
-                pasos.append(f"\n1. Integrando con respecto a ρ (de 0 a {x_max}):")
-                pasos.append(f"   ∫({sp.pretty(func_sph)}) dρ = {sp.pretty(int_rho)}")
-                
-                # Integrar en phi
-                int_phi = sp.integrate(int_rho, (phi, 0, sp.pi))
-                pasos.append(f"\n2. Integrando el resultado con respecto a φ (de 0 a π):")
-                pasos.append(f"   ∫({sp.pretty(int_rho)}) dφ = {sp.pretty(int_phi)}")
-                
-                # Integrar en theta
-                result = sp.integrate(int_phi, (theta, 0, 2*sp.pi))
-                pasos.append(f"\n3. Integrando el resultado con respecto a θ (de 0 a 2π):")
-                pasos.append(f"   ∫({sp.pretty(int_phi)}) dθ = {sp.pretty(result)}")
-            
-            # Procedimiento y resumen en LaTeX (función y límites)
-            encabezado_latex = [
-                f"\\text{{Sistema de coordenadas:}}\\;\\text{{{coord_type}}}",
-                f"f(x,y,z) = {sp.latex(func)}",
-                f"x \\in [{sp.latex(sp.nsimplify(x_min))}, {sp.latex(sp.nsimplify(x_max))}]",
-                f"y \\in [{sp.latex(sp.nsimplify(y_min))}, {sp.latex(sp.nsimplify(y_max))}]",
-                f"z \\in [{sp.latex(sp.nsimplify(z_min))}, {sp.latex(sp.nsimplify(z_max))}]",
-            ]
-            # Combinar encabezado (LaTeX) con pasos (texto plano)
-            self._set_math_lines(self.proceso_display, encabezado_latex + pasos)
-            self._auto_resize_textedit(self.proceso_display)
-
-            # Resultado final en LaTeX
-            resultado_latex = [f"\\text{{Resultado final:}}\\; {sp.latex(sp.simplify(result))}"]
-            self._set_math_lines(self.result_display, resultado_latex)
+            self._integral_aproximada = []
+            self._integral_en_curso = None
+            self._limpiar_avisos('integral')
+            if self.metodo_integral.currentText() == "Cuasi-Monte Carlo":
+                # Las estimaciones parciales llegan por la señal de progreso. La
+                # aproximación y la forma cerrada de un cálculo anterior escribirían
+                # sobre la estimación.
+                self._descartar_trabajos('integral_numerica', 'integral_cerrada')
+                futuro = self.gestor_trabajos.enviar(
+                    procedimiento_integral_qmc, func, coord_type,
+                    (x_min, x_max), (y_min, y_max), (z_min, z_max)
+                )
+                self._registrar_trabajo('integral', futuro, self._mostrar_integral_qmc, self._error_integral)
+            else:
+                futuro = self.gestor_trabajos.enviar(
+                    procedimiento_integral_numerica, func, coord_type,
+                    (x_min, x_max), (y_min, y_max), (z_min, z_max)
+                )
+                self._registrar_trabajo(
+                    'integral_numerica', futuro, self._mostrar_integral_numerica, lambda mensaje: None
+                )
+                futuro = self.gestor_trabajos.enviar(
+                    procedimiento_integral_triple, func, coord_type,
+                    (x_min, x_max), (y_min, y_max), (z_min, z_max)
+                )
+                self._registrar_trabajo('integral', futuro, self._mostrar_integral, self._error_integral)
+                # Varios órdenes y algoritmos compiten por la forma cerrada mientras
+                # el procedimiento paso a paso sigue su curso
+                integrando, limites = integral_interfaz(
+                    func, coord_type, (x_min, x_max), (y_min, y_max), (z_min, z_max)
+                )
+                self._integral_en_curso = (integrando, limites)
+                futuro = self.gestor_trabajos.enviar_portafolio(
+                    integrando, *limites, limite_tiempo=self.LIMITE_TIEMPO_ETAPA
+                )
+                self._registrar_trabajo(
+                    'integral_cerrada', futuro, self._mostrar_integral_cerrada, lambda mensaje: None
+                )
+            self._fijar_procedimiento('integral', [])
+            self._set_math_lines(self.result_display, ["\\text{Calculando...}"])
             self._auto_resize_textedit(self.result_display)
             
             # Actualizar visualización 3D: graficar z = f(x, y) con corte en z medio si aplica
@@ -897,7 +1061,9 @@ class MainWindow(QMainWindow):
                 z_mid = (z_min + z_max) / 2
                 func_xy = func.subs({z: z_mid})
                 # Intentar graficar superficie en el rango de x,y provistos
-                self.visualizador3d.graficar_superficie(func_xy, x_range=(x_min, x_max), y_range=(y_min, y_max))
+                self.visualizador3d.graficar_superficie(
+                    func_xy, x_range=a_flotante((x_min, x_max)), y_range=a_flotante((y_min, y_max))
+                )
             except Exception:
                 # Si no es posible graficar, continuar sin interrumpir el flujo
                 pass
@@ -907,13 +1073,77 @@ class MainWindow(QMainWindow):
             
         except Exception as e:
             error_msg = f"Error al calcular la integral: {str(e)}"
-            self._set_math_lines(self.proceso_display, [f"\\text{{{error_msg}}}"])
+            self._fijar_procedimiento('integral', [f"\\text{{{error_msg}}}"], mostrar=True)
             self.result_display.clear()
-            self._auto_resize_textedit(self.proceso_display)
             self._auto_resize_textedit(self.result_display)
             # Asegurarse de que estamos en la pestaña de Integrales incluso si hay error
             self.tabs.setCurrentIndex(0)
-    
+
+    def _mostrar_integral(self, datos):
+        """Muestra el procedimiento y el resultado de la integral triple calculada"""
+        # El procedimiento ya trae la forma cerrada: descartar el portafolio,
+        # aunque su resultado ya esté en camino
+        id_cerrada = self._trabajo_actual.pop('integral_cerrada', None)
+        if id_cerrada is not None:
+            self.gestor_trabajos.cancelar(id_cerrada)
+
+        # Tamaño de las expresiones intermedias de cada etapa (los trabajadores no registran)
+        for metrica in datos.get('metricas', []):
+            logger.info("Integral triple, %s", metrica.describir())
+
+        # Encabezado (LaTeX) y traza de pasos; la traza se dibuja al mostrarse
+        self._fijar_procedimiento('integral', datos['encabezado'], datos['pasos'])
+
+        # Resultado final en LaTeX
+        self._mostrar_resultado('integral', datos['resultado_latex'])
+
+        def al_simplificar(simplificado):
+            lineas = [f"\\text{{Resultado final:}}\\; {sp.latex(simplificado)}"] + datos['resultado_latex'][1:]
+            self._mostrar_resultado('integral', lineas)
+        self._simplificar_en_segundo_plano('integral', datos['resultado'], al_simplificar)
+        self._verificar_en_segundo_plano('integral', datos['resultado'], self._integral_en_curso)
+
+    def _mostrar_integral_qmc(self, datos):
+        """Muestra la estimación cuasi-Monte Carlo final"""
+        self._fijar_procedimiento('integral', datos['encabezado'])
+        self._set_math_lines(self.result_display, datos['resultado_latex'])
+        self._auto_resize_textedit(self.result_display)
+
+    def _mostrar_integral_cerrada(self, resultado):
+        """Muestra la forma cerrada obtenida por el portafolio antes que el procedimiento paso a paso"""
+        self._integral_aproximada = [
+            f"\\text{{Forma cerrada:}}\\; {sp.latex(resultado)}"
+        ] + self._integral_aproximada
+        lineas = list(self._integral_aproximada)
+        if 'integral' in self._trabajo_actual:
+            lineas.append("\\text{Calculando procedimiento...}")
+        self._set_math_lines(self.result_display, lineas)
+        self._auto_resize_textedit(self.result_display)
+
+    def _mostrar_integral_numerica(self, datos):
+        """Muestra la aproximación numérica mientras la integral simbólica sigue en curso"""
+        if 'integral' not in self._trabajo_actual:
+            # La forma cerrada ya llegó (o falló) y ocupa el resultado
+            if not self.result_display.toPlainText():
+                self._set_math_lines(self.result_display, datos['resultado_latex'])
+            return
+        self._integral_aproximada = self._integral_aproximada + datos['resultado_latex']
+        self._set_math_lines(
+            self.result_display, self._integral_aproximada + ["\\text{Calculando forma cerrada...}"]
+        )
+        self._auto_resize_textedit(self.result_display)
+
+    def _error_integral(self, mensaje: str):
+        """Muestra el error de un cálculo de integral triple"""
+        error_msg = f"Error al calcular la integral: {mensaje}"
+        self._fijar_procedimiento('integral', [f"\\text{{{error_msg}}}"], mostrar=True)
+        if self._integral_aproximada:
+            # Se conserva la aproximación numérica si la forma cerrada no llegó
+            self._set_math_lines(self.result_display, self._integral_aproximada)
+        else:
+            self.result_display.clear()
+        self._auto_resize_textedit(self.result_display)
+
     def insert_into_func(self, text: str, target_field=None):
         """Inserta texto en el QLineEdit de función, posicionando el cursor inteligentemente.
         
@@ -941,53 +1171,14 @@ class MainWindow(QMainWindow):
         h = max(60, min(h, max_height))
         text_edit.setFixedHeight(h)
     
-    def mostrar_procedimiento_teorema(self, titulo, pasos):
-        """Muestra un procedimiento paso a paso en el área de proceso de teoremas"""
-        try:
-            # Limpiar el área de proceso
-            self.teorema_proceso.clear()
-            
-            # Construir el contenido HTML
-            html_content = [f"<h2>{titulo}</h2><br>"]
-            
-            # Agregar cada paso
-            for i, paso in enumerate(pasos, 1):
-                # Si el paso es una cadena, mostrarlo como párrafo
-                if isinstance(paso, str):
-                    # Reemplazar ^ con formato de superíndice
-                    paso = paso.replace('^', '<sup>').replace('</sup>', '') + ('</sup>' if '^' in paso else '')
-                    # Si parece una ecuación (contiene operadores matemáticos)
-                    if any(c in paso for c in ['=', '∫', '∂', '∑', '∬', '∭', '∇', '·', '×']):
-                        html_content.append(f"<div style='margin: 10px 0; padding: 10px; background-color: #f8f9fa; border-left: 4px solid #3498db; border-radius: 4px;'>{paso}</div>")
-                    else:
-                        html_content.append(f"<p style='margin: 10px 0;'>{paso}</p>")
-                # Si el paso es una lista, asumir que son subpasos
-                elif isinstance(paso, list):
-                    for subpaso in paso:
-                        subpaso = subpaso.replace('^', '<sup>').replace('</sup>', '') + ('</sup>' if '^' in subpaso else '')
-                        html_content.append(f"<p style='margin: 5px 0 5px 20px;'>{subpaso}</p>")
-                
-                # Agregar línea divisoria entre pasos (excepto después del último)
-                if i < len(pasos):
-                    html_content.append("<hr style='margin: 10px 0; border: 0; border-top: 1px solid #e0e0e0;'>")
-            
-            # Establecer el contenido HTML en el QTextEdit
-            self.teorema_proceso.setHtml("".join(html_content))
-            
-            # Ajustar el tamaño del área de proceso
-            self._auto_resize_textedit(self.teorema_proceso)
-            
-        except Exception as e:
-            self.teorema_result.setPlainText(f"Error al mostrar el procedimiento: {str(e)}")
-            self._auto_resize_textedit(self.teorema_result)
-    
     def aplicar_teorema(self):
         """Aplica el teorema vectorial seleccionado"""
         teorema = self.teorema_combo.currentText()
         
         try:
             # Limpiar resultados anteriores
-            self.teorema_proceso.clear()
+            self._fijar_procedimiento('teorema', [])
+            self._limpiar_avisos('teorema')
             self.teorema_result.clear()
             
             # Asegurarse de que estamos en la pestaña de Teoremas
@@ -1010,342 +1201,36 @@ class MainWindow(QMainWindow):
         except Exception as e:
             error_msg = f"Error al aplicar el teorema: {str(e)}"
             self._set_math_lines(self.teorema_result, [f"\\text{{{error_msg}}}"])
-            self._set_math_lines(self.teorema_proceso, [f"\\text{{{error_msg}}}"])
+            self._fijar_procedimiento('teorema', [f"\\text{{{error_msg}}}"], mostrar=True)
             self._auto_resize_textedit(self.teorema_result)
-            self._auto_resize_textedit(self.teorema_proceso)
             # Asegurarse de que estamos en la pestaña de Teoremas incluso si hay error
             self.tabs.setCurrentIndex(1)
-    
-    def aplicar_green(self):
-        """Aplica el Teorema de Green"""
-        try:
-            # Limpiar resultados anteriores
-            self.teorema_proceso.clear()
-            self.teorema_result.clear()
-            
-            # Asegurarse de que estamos en la pestaña de Teoremas
-            self.tabs.setCurrentIndex(1)
-            self.repaint()  # Forzar actualización de la interfaz
-            
-            # Obtener las funciones P y Q
-            P_str = self.green_p.text().strip()
-            Q_str = self.green_q.text().strip()
-            
-            if not P_str or not Q_str:
-                raise ValueError("Por favor ingrese las funciones P y Q")
-                
-            # Obtener los límites de integración
-            try:
-                x_min = float(self.green_xmin.text().strip())
-                x_max = float(self.green_xmax.text().strip())
-                y_min = float(self.green_ymin.text().strip())
-                y_max = float(self.green_ymax.text().strip())
-            except ValueError:
-                raise ValueError("Por favor ingrese valores numéricos válidos para los límites")
-            
-            # Crear símbolos
-            x, y = sp.symbols('x y')
-            
-            # Parsear las expresiones
-            P = sp.parsing.sympy_parser.parse_expr(P_str, local_dict={"x": x, "y": y})
-            Q = sp.parsing.sympy_parser.parse_expr(Q_str, local_dict={"x": x, "y": y})
-            
-            # Calcular las derivadas parciales
-            self._auto_resize_textedit(self.teorema_result)
-            
-            # Asegurarse de que estamos en la pestaña de Teoremas
-            self.tabs.setCurrentIndex(1)
-            
-            return resultado
-            
-        except Exception as e:
-            error_msg = f"Error al aplicar el Teorema de Green: {str(e)}"
-            self.teorema_result.setPlainText(error_msg)
-            self.teorema_proceso.setHtml(f"<div style='color: red;'>{error_msg}</div>")
-            self._auto_resize_textedit(self.teorema_result)
-            self._auto_resize_textedit(self.teorema_proceso)
-            # Asegurarse de que estamos en la pestaña de Teoremas incluso si hay error
-            self.tabs.setCurrentIndex(1)
-            raise
 
-    def aplicar_stokes(self):
-        """Aplica el Teorema de Stokes"""
-        try:
-            # Limpiar resultados anteriores
-            self.teorema_proceso.clear()
-            self.teorema_result.clear()
-            
-            # Asegurarse de que estamos en la pestaña de Teoremas
-            self.tabs.setCurrentIndex(1)
-            self.repaint()  # Forzar actualización de la interfaz
-            
-            # Obtener los componentes del campo vectorial
-            F1_str = self.stokes_f1.text().strip()
-            F2_str = self.stokes_f2.text().strip()
-            F3_str = self.stokes_f3.text().strip()
-            
-            if not F1_str or not F2_str or not F3_str:
-                raise ValueError("Por favor ingrese todos los componentes del campo vectorial")
-            
-            # Obtener la superficie y parámetros
-            superficie = self.stokes_superficie.currentText()
-            param1 = self.stokes_param1.text().strip()
-            param2 = self.stokes_param2.text().strip()
-            param3 = self.stokes_param3.text().strip()
-            
-            # Convertir los parámetros a valores numéricos si es posible
-            try:
-                parametros = {}
-                if param1: 
-                    parametros['param1'] = float(param1) if param1.replace('.', '', 1).isdigit() else param1
-                if param2: 
-                    parametros['param2'] = float(param2) if param2.replace('.', '', 1).isdigit() else param2
-                if param3: 
-                    parametros['param3'] = float(param3) if param3.replace('.', '', 1).isdigit() else param3
-            except ValueError:
-                # Si no se pueden convertir a float, asumir que son expresiones simbólicas
-                parametros = {
-                    'param1': param1 if param1 else None,
-                    'param2': param2 if param2 else None,
-                    'param3': param3 if param3 else None
-                }
-            
-            # Símbolos para las variables
-            x, y, z = sp.symbols('x y z')
-            
-            # Parsear las expresiones
-            F1 = sp.parsing.sympy_parser.parse_expr(F1_str, local_dict={"x": x, "y": y, "z": z})
-            F2 = sp.parsing.sympy_parser.parse_expr(F2_str, local_dict={"x": x, "y": y, "z": z})
-            F3 = sp.parsing.sympy_parser.parse_expr(F3_str, local_dict={"x": x, "y": y, "z": z})
-            
-            # Iniciar el procedimiento
-            pasos = [
-                "<b>Teorema de Stokes:</b>",
-                "∮_C F·dr = ∬_S (∇ × F)·dS",
-                "",
-                "<b>Datos de entrada:</b>",
-                f"F(x,y,z) = ({F1}, {F2}, {F3})",
-                f"Superficie: {superficie}",
-                f"Parámetros: {parametros}",
-                "",
-                "<b>1. Cálculo del rotacional de F (∇ × F):</b>",
-                "   ∇ × F = (∂F₃/∂y - ∂F₂/∂z, ∂F₁/∂z - ∂F₃/∂x, ∂F₂/∂x - ∂F₁/∂y)"
-            ]
-            
-            # Calcular el rotacional
-            rot_F1 = sp.diff(F3, y) - sp.diff(F2, z)
-            rot_F2 = sp.diff(F1, z) - sp.diff(F3, x)
-            rot_F3 = sp.diff(F2, x) - sp.diff(F1, y)
-            
-            pasos.extend([
-                f"   ∂F₃/∂y - ∂F₂/∂z = {sp.diff(F3, y)} - {sp.diff(F2, z)} = {rot_F1}",
-                f"   ∂F₁/∂z - ∂F₃/∂x = {sp.diff(F1, z)} - {sp.diff(F3, x)} = {rot_F2}",
-                f"   ∂F₂/∂x - ∂F₁/∂y = {sp.diff(F2, x)} - {sp.diff(F1, y)} = {rot_F3}",
-                "",
-                f"   ∇ × F = ({rot_F1}, {rot_F2}, {rot_F3})",
-                "",
-                "<b>2. Cálculo de la integral de superficie sobre S:</b>"
-            ])
-            
-            # Llamar a la función del teorema de Stokes
-            from calculos.teoremas import teorema_stokes
-            try:
-                resultado = teorema_stokes((F1, F2, F3), superficie, parametros)
-                pasos.extend([
-                    f"   ∬_S (∇ × F)·dS = {resultado}",
-                    "",
-                    "<b>3. Aplicación del teorema de Stokes:</b>"
-                ])
-                
-                # Mostrar el procedimiento paso a paso en formato matemático
-                self._set_math_lines(self.teorema_proceso, pasos)
-                self._auto_resize_textedit(self.teorema_proceso)
-                
-                # Mostrar solo el resultado final en formato matemático
-                self._set_math_lines(self.teorema_result, [sp.latex(sp.simplify(resultado))])
-                self._auto_resize_textedit(self.teorema_result)
-                
-            except Exception as e:
-                error_msg = f"Error al calcular la integral de superficie: {str(e)}"
-                pasos.append(f"\nError: {error_msg}")
-                self._set_math_lines(self.teorema_proceso, pasos)
-                self._set_math_lines(self.teorema_result, [f"\\text{{Error: {error_msg}}}"])
-                self._auto_resize_textedit(self.teorema_proceso)
-                self._auto_resize_textedit(self.teorema_result)
-                raise
-                
-        except Exception as e:
-            error_msg = f"Error al aplicar el Teorema de Stokes: {str(e)}"
-            self._set_math_lines(self.teorema_result, [f"\\text{{{error_msg}}}"])
-            self._set_math_lines(self.teorema_proceso, [f"\\text{{{error_msg}}}"])
-            self._auto_resize_textedit(self.teorema_result)
-            self._auto_resize_textedit(self.teorema_proceso)
-            # Asegurarse de que estamos en la pestaña de Teoremas incluso si hay error
-            self.tabs.setCurrentIndex(1)
-            raise
-    
-    def aplicar_divergencia(self):
-        """Aplica el Teorema de la Divergencia"""
-        try:
-            F1_str = self.div_f1.text().strip()
-            F2_str = self.div_f2.text().strip()
-            F3_str = self.div_f3.text().strip()
-            
-            if not all([F1_str, F2_str, F3_str]):
-                raise ValueError("Por favor ingrese todas las componentes del campo vectorial")
-            
-            # Obtener los parámetros de la región
-            region = self.div_region.currentText()
-            param1 = self.div_param1.text().strip()
-            param2 = self.div_param2.text().strip()
-            param3 = self.div_param3.text().strip()
-            coord_type = self.div_coords.currentText()
-            
-            # Convertir los parámetros a valores numéricos si es posible
-            try:
-                parametros = {}
-                if param1: parametros['param1'] = float(param1) if param1.replace('.', '', 1).isdigit() else param1
-                if param2: parametros['param2'] = float(param2) if param2.replace('.', '', 1).isdigit() else param2
-                if param3: parametros['param3'] = float(param3) if param3.replace('.', '', 1).isdigit() else param3
-            except ValueError:
-                # Si no se pueden convertir a float, asumir que son expresiones simbólicas
-                parametros = {
-                    'param1': param1 if param1 else None,
-                    'param2': param2 if param2 else None,
-                    'param3': param3 if param3 else None
-                }
-            
-            # Símbolos para las variables
-            x, y, z = sp.symbols('x y z')
-            
-            # Parsear las expresiones
-            F1 = parse_expr(F1_str, local_dict={"x": x, "y": y, "z": z})
-            F2 = parse_expr(F2_str, local_dict={"x": x, "y": y, "z": z})
-            F3 = parse_expr(F3_str, local_dict={"x": x, "y": y, "z": z})
-            
-            # Iniciar el procedimiento
-            pasos = [
-                "Aplicando el Teorema de la Divergencia:",
-                "∯_S F·dS = ∭_V (∇·F) dV",
-                "",
-                f"Datos de entrada:",
-                f"F(x,y,z) = ({F1}, {F2}, {F3})",
-                f"Región: {region}",
-                f"Tipo de coordenadas: {coord_type}",
-                f"Parámetros: {parametros}",
-                "",
-                "Paso 1: Calcular la divergencia de F (∇·F)",
-                "   ∇·F = ∂F₁/∂x + ∂F₂/∂y + ∂F₃/∂z"
-            ]
-            
-            # Calcular la divergencia
-            div_F1 = sp.diff(F1, x)
-            div_F2 = sp.diff(F2, y)
-            div_F3 = sp.diff(F3, z)
-            div_F = div_F1 + div_F2 + div_F3
-            
-            pasos.extend([
-                f"   ∂F₁/∂x = {div_F1}",
-                f"   ∂F₂/∂y = {div_F2}",
-                f"   ∂F₃/∂z = {div_F3}",
-                "",
-                f"   ∇·F = {div_F1} + {div_F2} + {div_F3} = {div_F}",
-                "",
-                f"Paso 2: Calcular la integral de volumen en coordenadas {coord_type}"
-            ])
-            
-            # Llamar a la función del teorema de la divergencia
-            from calculos.teoremas import teorema_divergencia
-            try:
-                resultado = teorema_divergencia((F1, F2, F3), region, parametros, coord_type)
-                pasos.extend([
-                    f"   ∭_V (∇·F) dV = {resultado}",
-                    "",
-                    "Paso 3: Aplicar el teorema de la divergencia"
-                ])
-                
-                # Mostrar el procedimiento paso a paso en formato matemático
-                self._set_math_lines(self.teorema_proceso, pasos)
-                self._auto_resize_textedit(self.teorema_proceso)
-                
-                # Mostrar solo el resultado final en formato matemático
-                self._set_math_lines(self.teorema_result, [sp.latex(sp.simplify(resultado))])
-                self._auto_resize_textedit(self.teorema_result)
-                
-            except Exception as e:
-                error_msg = f"Error al calcular la integral de volumen: {str(e)}"
-                pasos.append(f"Error: {error_msg}")
-                self._set_math_lines(self.teorema_proceso, pasos)
-                self._set_math_lines(self.teorema_result, [f"\\text{{Error: {error_msg}}}"])
-                self._auto_resize_textedit(self.teorema_proceso)
-                self._auto_resize_textedit(self.teorema_result)
-                raise
-                
-        except Exception as e:
-            error_msg = f"Error al aplicar el Teorema de la Divergencia: {str(e)}"
-            self._set_math_lines(self.teorema_proceso, [f"\\text{{Error: {error_msg}}}"])
-            self._set_math_lines(self.teorema_result, [f"\\text{{Error: {error_msg}}}"])
-            self._auto_resize_textedit(self.teorema_proceso)
-            self._auto_resize_textedit(self.teorema_result)
-            # Asegurarse de que estamos en la pestaña de Teoremas incluso si hay error
-            self.tabs.setCurrentIndex(1)
-            raise
-    
-    def mostrar_procedimiento(self, titulo, pasos):
-        """Muestra un procedimiento paso a paso en el área de proceso"""
-        try:
-            # Limpiar el área de proceso
-            self.teorema_proceso.clear()
-            
-            # Construir el contenido como texto plano
-            texto_contenido = f"{titulo}\n" + "="*len(titulo) + "\n\n"
-            
-            # Agregar cada paso
-            for paso in pasos:
-                if isinstance(paso, str):
-                    # Limpiar etiquetas HTML y caracteres especiales
-                    paso = paso.replace('<b>', '').replace('</b>', '')
-                    paso = paso.replace('<br>', '\n').replace('</div>', '')
-                    paso = paso.replace('<div style="color: red;">', '¡Error! ')
-                    texto_contenido += paso + "\n\n"
-                elif isinstance(paso, list):
-                    for subpaso in paso:
-                        subpaso = subpaso.replace('<b>', '').replace('</b>', '')
-                        subpaso = '  • ' + subpaso if not subpaso.strip().startswith('•') else '  ' + subpaso
-                        texto_contenido += subpaso + "\n"
-                    texto_contenido += "\n"
-            
-            # Establecer el contenido en texto plano
-            self.teorema_proceso.setPlainText(texto_contenido.strip())
-            
-            # Configurar la fuente para mejor legibilidad
-            font = self.teorema_proceso.font()
-            font.setFamily('Consolas')
-            font.setPointSize(10)
-            self.teorema_proceso.setFont(font)
-            
-            # Ajustar el tamaño del área de proceso
-            self._auto_resize_textedit(self.teorema_proceso)
-            
-            # Asegurarse de que estamos en la pestaña de Teoremas
-            self.tabs.setCurrentIndex(1)
-            
-        except Exception as e:
-            self._set_math_lines(self.teorema_result, [f"\\text{{Error al mostrar el procedimiento: {str(e)} }}"]) 
-            self._auto_resize_textedit(self.teorema_result)
-            # Asegurarse de que estamos en la pestaña de Teoremas
-            self.tabs.setCurrentIndex(1)
-    
-    # Esta función se mantiene por compatibilidad, pero redirige a mostrar_procedimiento
-    def plot_3d_function(self, titulo, pasos):
-        """Muestra un procedimiento paso a paso (compatibilidad con código existente)"""
-        self.mostrar_procedimiento(titulo, pasos)
-            
+    def _mostrar_teorema(self, datos):
+        """Muestra el procedimiento y el resultado final de un teorema calculado"""
+        # Mostrar el procedimiento paso a paso en formato matemático
+        self._fijar_procedimiento('teorema', [], datos['pasos'])
+
+        # Mostrar solo el resultado final en formato matemático
+        self._mostrar_resultado('teorema', datos['resultado_latex'])
+
+        def al_simplificar(simplificado):
+            self._mostrar_resultado('teorema', [sp.latex(simplificado)])
+        self._simplificar_en_segundo_plano('teorema', datos['resultado'], al_simplificar)
+        self._verificar_en_segundo_plano('teorema', datos['resultado'], datos.get('integral'))
+
+    def _error_teorema(self, titulo: str, mensaje: str):
+        """Muestra el error de un cálculo de teorema"""
+        error_msg = f"{titulo}: {mensaje}"
+        self._fijar_procedimiento('teorema', [f"\\text{{{error_msg}}}"], mostrar=True)
+        self._set_math_lines(self.teorema_result, [f"\\text{{{error_msg}}}"])
+        self._auto_resize_textedit(self.teorema_result)
+
     def aplicar_green(self):
         """Aplica el Teorema de Green"""
         try:
             # Limpiar resultados anteriores
-            self.teorema_proceso.clear()
+            self._fijar_procedimiento('teorema', [])
             self.teorema_result.clear()
             
             # Asegurarse de que estamos en la pestaña de Teoremas
@@ -1359,14 +1244,14 @@ class MainWindow(QMainWindow):
             if not P_str or not Q_str:
                 raise ValueError("Por favor ingrese las funciones P y Q")
                 
-            # Obtener los límites de integración (usando valores por defecto si no están definidos)
+            # Obtener los límites de integración exactos (usando valores por defecto si no están definidos)
             try:
-                x_min = float(self.green_xmin.text().strip()) if hasattr(self, 'green_xmin') and self.green_xmin.text().strip() else -1
-                x_max = float(self.green_xmax.text().strip()) if hasattr(self, 'green_xmax') and self.green_xmax.text().strip() else 1
-                y_min = float(self.green_ymin.text().strip()) if hasattr(self, 'green_ymin') and self.green_ymin.text().strip() else -1
-                y_max = float(self.green_ymax.text().strip()) if hasattr(self, 'green_ymax') and self.green_ymax.text().strip() else 1
+                x_min = parsear_limite(self.green_xmin.text(), "-1") if hasattr(self, 'green_xmin') else sp.Integer(-1)
+                x_max = parsear_limite(self.green_xmax.text(), "1") if hasattr(self, 'green_xmax') else sp.Integer(1)
+                y_min = parsear_limite(self.green_ymin.text(), "-1") if hasattr(self, 'green_ymin') else sp.Integer(-1)
+                y_max = parsear_limite(self.green_ymax.text(), "1") if hasattr(self, 'green_ymax') else sp.Integer(1)
             except ValueError:
-                x_min, x_max, y_min, y_max = -1, 1, -1, 1
+                x_min, x_max, y_min, y_max = sp.Integer(-1), sp.Integer(1), sp.Integer(-1), sp.Integer(1)
             
             # Crear símbolos
             x, y = sp.symbols('x y')
@@ -1375,52 +1260,25 @@ class MainWindow(QMainWindow):
             P = sp.parsing.sympy_parser.parse_expr(P_str, local_dict={"x": x, "y": y})
             Q = sp.parsing.sympy_parser.parse_expr(Q_str, local_dict={"x": x, "y": y})
             
-            # Calcular las derivadas parciales
-            dQ_dx = sp.diff(Q, x)
-            dP_dy = sp.diff(P, y)
-            integrando = dQ_dx - dP_dy
-            
-            # Calcular la integral doble
-            resultado = sp.integrate(
-                sp.integrate(integrando, (y, y_min, y_max)),
-                (x, x_min, x_max)
+            # Calcular en un proceso trabajador
+            futuro = self.gestor_trabajos.enviar(
+                procedimiento_green, P, Q, (x_min, x_max), (y_min, y_max)
             )
-            
-            # Mostrar el procedimiento paso a paso (LaTeX)
-            pasos_green = [
-                "\\text{Teorema de Green}",
-                "\\oint_C (P\,dx + Q\,dy) = \\iint_D (\\partial Q/\\partial x - \\partial P/\\partial y)\,dA",
-                "\\text{Datos de entrada:}",
-                f"P(x,y) = {sp.latex(P)}",
-                f"Q(x,y) = {sp.latex(Q)}",
-                f"x \\in [{x_min}, {x_max}]",
-                f"y \\in [{y_min}, {y_max}]",
-                "\\text{1. Cálculo de las derivadas parciales:}",
-                f"\\partial Q/\\partial x = {sp.latex(dQ_dx)}",
-                f"\\partial P/\\partial y = {sp.latex(dP_dy)}",
-                "\\text{2. Aplicación del teorema:}",
-                f"\\oint_C (P\,dx + Q\,dy) = \\iint_D ({sp.latex(dQ_dx)} - {sp.latex(dP_dy)})\,dA = \\iint_D ({sp.latex(integrando)})\,dA",
-                "\\text{3. Cálculo de la integral doble:}",
-                f"x \\in [{x_min}, {x_max}],\quad y \\in [{y_min}, {y_max}]",
-            ]
-            self._set_math_lines(self.teorema_proceso, pasos_green)
-            self._auto_resize_textedit(self.teorema_proceso)
-            
-            # Mostrar solo el resultado final (LaTeX)
-            self._set_math_lines(self.teorema_result, [sp.latex(sp.simplify(resultado))])
+            self._registrar_trabajo('teorema', futuro, self._mostrar_teorema,
+                                    lambda msg: self._error_teorema("Error al aplicar el Teorema de Green", msg))
+            self._set_math_lines(self.teorema_result, ["\\text{Calculando...}"])
             self._auto_resize_textedit(self.teorema_result)
             
             # Asegurarse de que estamos en la pestaña de Teoremas
             self.tabs.setCurrentIndex(1)
             
-            return resultado
+            return futuro
             
         except Exception as e:
             error_msg = f"Error al aplicar el Teorema de Green: {str(e)}"
             self._set_math_lines(self.teorema_result, [f"\\text{{{error_msg}}}"])
-            self._set_math_lines(self.teorema_proceso, [f"\\text{{{error_msg}}}"])
+            self._fijar_procedimiento('teorema', [f"\\text{{{error_msg}}}"], mostrar=True)
             self._auto_resize_textedit(self.teorema_result)
-            self._auto_resize_textedit(self.teorema_proceso)
             # Asegurarse de que estamos en la pestaña de Teoremas incluso si hay error
             self.tabs.setCurrentIndex(1)
             raise
@@ -1440,54 +1298,11 @@ class MainWindow(QMainWindow):
             F2 = parse_expr(F2_str, local_dict={"x": x, "y": y, "z": z})
             F3 = parse_expr(F3_str, local_dict={"x": x, "y": y, "z": z})
             
-            # Calcular el rotacional de F = (F1, F2, F3)
-            # rot(F) = (∂F3/∂y - ∂F2/∂z, ∂F1/∂z - ∂F3/∂x, ∂F2/∂x - ∂F1/∂y)
-            rot_F1 = sp.diff(F3, y) - sp.diff(F2, z)
-            rot_F2 = sp.diff(F1, z) - sp.diff(F3, x)
-            rot_F3 = sp.diff(F2, x) - sp.diff(F1, y)
-            
-            # Para simplificar, asumiremos una superficie plana z = 1 - x - y en el primer octante
-            # En una aplicación real, esto debería ser configurable
-            
-            # Calcular la integral de superficie del rotacional
-            # ∬_S (∇ × F) · dS = ∬_D (∇ × F) · (r_u × r_v) du dv
-            # Para z = 1 - x - y, la normal es (1, 1, 1)
-            
-            # Proyectamos sobre el plano xy: D es el triángulo 0 ≤ x ≤ 1, 0 ≤ y ≤ 1-x
-            # El producto punto (rot_F) · (1,1,1) = rot_F1 + rot_F2 + rot_F3
-            integrando = rot_F1 + rot_F2 + rot_F3
-            
-            # Evaluamos z = 1 - x - y en el integrando
-            integrando = integrando.subs(z, 1 - x - y)
-            
-            # Calculamos la integral doble
-            result = sp.integrate(
-                sp.integrate(integrando, (y, 0, 1 - x)),
-                (x, 0, 1)
-            )
-            
-            # Procedimiento en LaTeX
-            pasos_stokes = [
-                "\\text{Teorema de Stokes}",
-                "\\oint_C F\\cdot dr = \\iint_S (\\nabla \\times F)\\cdot dS",
-                "\\text{Datos de entrada:}",
-                f"F(x,y,z) = ({sp.latex(F1)}, {sp.latex(F2)}, {sp.latex(F3)})",
-                "\\text{1. Cálculo del rotacional de F (\\nabla \\times F):}",
-                "\\nabla \\times F = (\\partial F_3/\\partial y - \\partial F_2/\\partial z,\\; \\partial F_1/\\partial z - \\partial F_3/\\partial x,\\; \\partial F_2/\\partial x - \\partial F_1/\\partial y)",
-                f"\\partial F_3/\\partial y - \\partial F_2/\\partial z = {sp.latex(sp.diff(F3, y))} - {sp.latex(sp.diff(F2, z))} = {sp.latex(rot_F1)}",
-                f"\\partial F_1/\\partial z - \\partial F_3/\\partial x = {sp.latex(sp.diff(F1, z))} - {sp.latex(sp.diff(F3, x))} = {sp.latex(rot_F2)}",
-                f"\\partial F_2/\\partial x - \\partial F_1/\\partial y = {sp.latex(sp.diff(F2, x))} - {sp.latex(sp.diff(F1, y))} = {sp.latex(rot_F3)}",
-                f"\\nabla \\times F = ({sp.latex(rot_F1)}, {sp.latex(rot_F2)}, {sp.latex(rot_F3)})",
-                "\\text{2. Integral de superficie sobre S (z=1-x-y):}",
-                f"\\iint_S (\\nabla \\times F)\\cdot dS = \\iint_D ({sp.latex(rot_F1)} + {sp.latex(rot_F2)} + {sp.latex(rot_F3)})\,dA",
-                f"\\text{{Sustituyendo }} z = 1 - x - y: \\; {sp.latex(integrando)}",
-                "0 \\leq x \\leq 1,\\; 0 \\leq y \\leq 1-x",
-            ]
-            self._set_math_lines(self.teorema_proceso, pasos_stokes)
-            self._auto_resize_textedit(self.teorema_proceso)
-            
-            # Mostrar solo el resultado final en LaTeX
-            self._set_math_lines(self.teorema_result, [sp.latex(sp.simplify(result))])
+            # Calcular en un proceso trabajador
+            futuro = self.gestor_trabajos.enviar(procedimiento_stokes, F1, F2, F3)
+            self._registrar_trabajo('teorema', futuro, self._mostrar_teorema,
+                                    lambda msg: self._error_teorema("Error en el Teorema de Stokes", msg))
+            self._set_math_lines(self.teorema_result, ["\\text{Calculando...}"])
             self._auto_resize_textedit(self.teorema_result)
             
             # Asegurarse de que estamos en la pestaña de Teoremas
@@ -1500,7 +1315,7 @@ class MainWindow(QMainWindow):
         """Aplica el Teorema de la Divergencia"""
         try:
             # Limpiar resultados anteriores
-            self.teorema_proceso.clear()
+            self._fijar_procedimiento('teorema', [])
             self.teorema_result.clear()
             
             # Asegurarse de que estamos en la pestaña de Teoremas
@@ -1521,10 +1336,10 @@ class MainWindow(QMainWindow):
             # Obtener los parámetros según el tipo de región
             if region_type == "Esfera":
                 try:
-                    radio = float(self.div_param1.text().strip() or "1")
-                    x0 = float(self.div_param2.text().strip() or "0")
-                    y0 = float(self.div_param3.text().strip() or "0")
-                    z0 = float(self.div_param3_2.text().strip() or "0") if hasattr(self, 'div_param3_2') else 0.0
+                    radio = parsear_limite(self.div_param1.text(), "1")
+                    x0 = parsear_limite(self.div_param2.text(), "0")
+                    y0 = parsear_limite(self.div_param3.text(), "0")
+                    z0 = parsear_limite(self.div_param3_2.text(), "0") if hasattr(self, 'div_param3_2') else sp.Integer(0)
                 except ValueError:
                     raise ValueError("Los parámetros de la esfera deben ser números válidos")
                 
@@ -1540,16 +1355,19 @@ class MainWindow(QMainWindow):
                 )
                 
                 # Límites de integración para la esfera
-                rho_lim = (0, radio)
-                theta_lim = (0, 2*sp.pi)
-                phi_lim = (0, sp.pi)
+                region = {
+                    'radio': radio, 'x0': x0, 'y0': y0, 'z0': z0,
+                    'rho_lim': (0, radio),
+                    'theta_lim': (0, 2*sp.pi),
+                    'phi_lim': (0, sp.pi),
+                }
                 
             elif region_type == "Cubo":
                 try:
-                    lado = float(self.div_param1.text().strip() or "2")
-                    x0 = float(self.div_param2.text().strip() or "0")
-                    y0 = float(self.div_param3.text().strip() or "0")
-                    z0 = float(self.div_param3_2.text().strip() or "0") if hasattr(self, 'div_param3_2') else 0.0
+                    lado = parsear_limite(self.div_param1.text(), "2")
+                    x0 = parsear_limite(self.div_param2.text(), "0")
+                    y0 = parsear_limite(self.div_param3.text(), "0")
+                    z0 = parsear_limite(self.div_param3_2.text(), "0") if hasattr(self, 'div_param3_2') else sp.Integer(0)
                 except ValueError:
                     raise ValueError("Los parámetros del cubo deben ser números válidos")
                 
@@ -1563,14 +1381,17 @@ class MainWindow(QMainWindow):
                 )
                 
                 # Límites de integración para el cubo
-                x_lim = (x0 - lado/2, x0 + lado/2)
-                y_lim = (y0 - lado/2, y0 + lado/2)
-                z_lim = (z0 - lado/2, z0 + lado/2)
+                region = {
+                    'x0': x0, 'y0': y0, 'z0': z0,
+                    'x_lim': (x0 - lado/2, x0 + lado/2),
+                    'y_lim': (y0 - lado/2, y0 + lado/2),
+                    'z_lim': (z0 - lado/2, z0 + lado/2),
+                }
                 
             elif region_type == "Cilindro":
                 try:
-                    radio = float(self.div_param1.text().strip() or "1")
-                    altura = float(self.div_param2.text().strip() or "2")
+                    radio = parsear_limite(self.div_param1.text(), "1")
+                    altura = parsear_limite(self.div_param2.text(), "2")
                     eje = self.div_param3.text().strip().lower() or "z"
                     if eje not in ['x', 'y', 'z']:
                         eje = 'z'  # Valor por defecto si no es válido
@@ -1588,18 +1409,12 @@ class MainWindow(QMainWindow):
                 )
                 
                 # Límites de integración para el cilindro (eje z por defecto)
-                if eje == 'z':
-                    r_lim = (0, radio)
-                    theta_lim = (0, 2*sp.pi)
-                    z_lim = (-altura/2, altura/2)
-                elif eje == 'x':
-                    r_lim = (0, radio)
-                    theta_lim = (0, 2*sp.pi)
-                    x_lim = (-altura/2, altura/2)
-                else:  # eje 'y'
-                    r_lim = (0, radio)
-                    theta_lim = (0, 2*sp.pi)
-                    y_lim = (-altura/2, altura/2)
+                region = {
+                    'radio': radio, 'eje': eje,
+                    'r_lim': (0, radio),
+                    'theta_lim': (0, 2*sp.pi),
+                    f'{eje}_lim': (-altura/2, altura/2),
+                }
                     
             else:
                 raise ValueError("Tipo de región no soportado")
@@ -1607,196 +1422,34 @@ class MainWindow(QMainWindow):
             # Obtener el sistema de coordenadas seleccionado
             coord_system = self.div_coords.currentText().lower()
             
+            region['info'] = region_info
+            
             # Crear símbolos para las variables
             x, y, z = sp.symbols('x y z')
-            rho, phi, theta = sp.symbols('rho phi theta')
             
             # Parsear las expresiones del campo vectorial
             F1 = sp.parsing.sympy_parser.parse_expr(F1_str, local_dict={"x": x, "y": y, "z": z})
             F2 = sp.parsing.sympy_parser.parse_expr(F2_str, local_dict={"x": x, "y": y, "z": z})
             F3 = sp.parsing.sympy_parser.parse_expr(F3_str, local_dict={"x": x, "y": y, "z": z})
             
-            # Calcular la divergencia de F = (F1, F2, F3)
-            div_F = sp.diff(F1, x) + sp.diff(F2, y) + sp.diff(F3, z)
-            
-            # Inicializar el procedimiento
-            procedimiento = [
-                "Teorema de la Divergencia",
-                "∯_S F·dS = ∭_V (∇·F) dV\n",
-                "Datos de entrada:",
-                f"F(x,y,z) = ({F1}, {F2}, {F3})",
-                region_info,
-                f"Sistema de coordenadas: {coord_system.capitalize()}\n",
-                "1. Cálculo de la divergencia (∇·F):",
-                "   ∇·F = ∂F₁/∂x + ∂F₂/∂y + ∂F₃/∂z",
-                f"   ∂F₁/∂x = {sp.diff(F1, x)}",
-                f"   ∂F₂/∂y = {sp.diff(F2, y)}",
-                f"   ∂F₃/∂z = {sp.diff(F3, z)}",
-                f"   ∇·F = {sp.diff(F1, x)} + {sp.diff(F2, y)} + {sp.diff(F3, z)}",
-                f"   ∇·F = {div_F}\n"
-            ]
-            
-            # Calcular la integral según el sistema de coordenadas
-            if coord_system == "esféricas" or region_type == "Esfera":
-                # Usar coordenadas esféricas
-                procedimiento.extend([
-                    "2. Cambio a coordenadas esféricas:",
-                    "   x = x0 + ρ·sin(φ)·cos(θ)",
-                    "   y = y0 + ρ·sin(φ)·sin(θ)",
-                    "   z = z0 + ρ·cos(φ)",
-                    "   Jacobiano: ρ²·sin(φ)\n"
-                ])
-                
-                # Expresar la divergencia en coordenadas esféricas
-                div_F_sph = div_F.subs({
-                    x: x0 + rho * sp.sin(phi) * sp.cos(theta),
-                    y: y0 + rho * sp.sin(phi) * sp.sin(theta),
-                    z: z0 + rho * sp.cos(phi)
-                }) * rho**2 * sp.sin(phi)  # Jacobiano
-                
-                procedimiento.extend([
-                    "3. Cálculo de la integral triple:",
-                    f"   ∭_V (∇·F) dV = ∫₀^π ∫₀^2π ∫₀^{radio} ({sp.pretty(div_F_sph)}) dρ dθ dφ",
-                    f"   Límites: 0 ≤ ρ ≤ {radio}, 0 ≤ θ ≤ 2π, 0 ≤ φ ≤ π"
-                ])
-                
-                # Calcular la integral
-                try:
-                    resultado = sp.integrate(
-                        sp.integrate(
-                            sp.integrate(div_F_sph, (rho, *rho_lim)),
-                            (theta, *theta_lim)
-                        ),
-                        (phi, *phi_lim)
-                    )
-                    resultado = sp.simplify(resultado)
-                    
-                except Exception as e:
-                    raise Exception(f"Error al calcular la integral: {str(e)}")
-                
-            elif coord_system == "cilíndricas" or region_type == "Cilindro":
-                # Usar coordenadas cilíndricas
-                procedimiento.extend([
-                    "2. Cambio a coordenadas cilíndricas:",
-                    f"   {'z' if eje == 'z' else 'x' if eje == 'x' else 'y'} = {eje}",
-                    f"   {'x' if eje != 'x' else 'y'} = r·cos(θ)",
-                    f"   {'y' if eje != 'y' else 'x'} = r·sin(θ)",
-                    "   Jacobiano: r\n"
-                ])
-                
-                # Expresar la divergencia en coordenadas cilíndricas
-                if eje == 'z':
-                    div_F_cyl = div_F.subs({
-                        x: 'r*cos(theta)',
-                        y: 'r*sin(theta)',
-                        z: 'z'
-                    }) * r  # Jacobiano
-                elif eje == 'x':
-                    div_F_cyl = div_F.subs({
-                        y: 'r*cos(theta)',
-                        z: 'r*sin(theta)',
-                        x: 'x'
-                    }) * r  # Jacobiano
-                else:  # eje 'y'
-                    div_F_cyl = div_F.subs({
-                        x: 'r*cos(theta)',
-                        z: 'r*sin(theta)',
-                        y: 'y'
-                    }) * r  # Jacobiano
-                
-                procedimiento.extend([
-                    "3. Cálculo de la integral triple:",
-                    f"   ∭_V (∇·F) dV = "
-                    f"∫_{z_lim[0] if eje == 'z' else x_lim[0] if eje == 'x' else y_lim[0]}^"
-                    f"{z_lim[1] if eje == 'z' else x_lim[1] if eje == 'x' else y_lim[1]} "
-                    f"∫_0^{2*sp.pi} ∫_0^{radio} ({sp.pretty(div_F_cyl)}) dr dθ "
-                    f"{'dz' if eje == 'z' else 'dx' if eje == 'x' else 'dy'}",
-                    f"   Límites: 0 ≤ r ≤ {radio}, 0 ≤ θ ≤ 2π, "
-                    f"{'z' if eje == 'z' else 'x' if eje == 'x' else 'y'} ∈ "
-                    f"[{z_lim[0] if eje == 'z' else x_lim[0] if eje == 'x' else y_lim[0]}, "
-                    f"{z_lim[1] if eje == 'z' else x_lim[1] if eje == 'x' else y_lim[1]}]"
-                ])
-                
-                # Calcular la integral
-                try:
-                    if eje == 'z':
-                        resultado = sp.integrate(
-                            sp.integrate(
-                                sp.integrate(div_F_cyl, (r, *r_lim)),
-                                (theta, *theta_lim)
-                            ),
-                            (z, *z_lim)
-                        )
-                    elif eje == 'x':
-                        resultado = sp.integrate(
-                            sp.integrate(
-                                sp.integrate(div_F_cyl, (r, *r_lim)),
-                                (theta, *theta_lim)
-                            ),
-                            (x, *x_lim)
-                        )
-                    else:  # eje 'y'
-                        resultado = sp.integrate(
-                            sp.integrate(
-                                sp.integrate(div_F_cyl, (r, *r_lim)),
-                                (theta, *theta_lim)
-                            ),
-                            (y, *y_lim)
-                        )
-                    
-                    resultado = sp.simplify(resultado)
-                    
-                except Exception as e:
-                    raise Exception(f"Error al calcular la integral: {str(e)}")
-                
-            else:  # Coordenadas cartesianas
-                procedimiento.extend([
-                    "2. Uso de coordenadas cartesianas:",
-                    "   x, y, z",
-                    "   Jacobiano: 1\n"
-                ])
-                
-                procedimiento.extend([
-                    "3. Cálculo de la integral triple:",
-                    f"   ∭_V (∇·F) dV = "
-                    f"∫_{x_lim[0]}^{x_lim[1]} "
-                    f"∫_{y_lim[0]}^{y_lim[1]} "
-                    f"∫_{z_lim[0]}^{z_lim[1]} "
-                    f"({div_F}) dz dy dx"
-                ])
-                
-                # Calcular la integral
-                try:
-                    resultado = sp.integrate(
-                        sp.integrate(
-                            sp.integrate(div_F, (z, *z_lim)),
-                            (y, *y_lim)
-                        ),
-                        (x, *x_lim)
-                    )
-                    resultado = sp.simplify(resultado)
-                    
-                except Exception as e:
-                    raise Exception(f"Error al calcular la integral: {str(e)}")
-            
-            # Mostrar el procedimiento paso a paso en LaTeX
-            self._set_math_lines(self.teorema_proceso, procedimiento)
-            self._auto_resize_textedit(self.teorema_proceso)
-            
-            # Mostrar el resultado final en LaTeX
-            self._set_math_lines(self.teorema_result, [sp.latex(sp.simplify(resultado))])
+            # Calcular en un proceso trabajador
+            futuro = self.gestor_trabajos.enviar(
+                procedimiento_divergencia, F1, F2, F3, region_type, region, coord_system
+            )
+            self._registrar_trabajo('teorema', futuro, self._mostrar_teorema,
+                                    lambda msg: self._error_teorema("Error en el Teorema de la Divergencia", msg))
+            self._set_math_lines(self.teorema_result, ["\\text{Calculando...}"])
             self._auto_resize_textedit(self.teorema_result)
             
             # Asegurarse de que estamos en la pestaña de Teoremas
             self.tabs.setCurrentIndex(1)
             
-            return resultado
+            return futuro
             
         except Exception as e:
             error_msg = f"Error en el Teorema de la Divergencia: {str(e)}"
-            self._set_math_lines(self.teorema_proceso, [f"\\text{{{error_msg}}}"])
+            self._fijar_procedimiento('teorema', [f"\\text{{{error_msg}}}"], mostrar=True)
             self._set_math_lines(self.teorema_result, [f"\\text{{{error_msg}}}"])
-            self._auto_resize_textedit(self.teorema_proceso)
             self._auto_resize_textedit(self.teorema_result)
             # Asegurarse de que estamos en la pestaña de Teoremas incluso si hay error
             self.tabs.setCurrentIndex(1)